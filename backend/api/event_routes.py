@@ -1,39 +1,94 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
-from typing import Optional, List
+import asyncio
+import json
+
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+from typing import Any, Dict, Optional, List
 
 from backend.models.events import CVZoneChangeEvent, QRScanEvent, PendingConfirmation
-from backend.api.inventory_routes import ENGINE, STORE  # reuse Phase 1 singletons
+from backend.api.inventory_routes import ENGINE, STORE, WRITER  # reuse Phase 1 singletons
 from backend.services.confirmation_manager import ConfirmationManager
 from backend.services.event_reconciler import EventReconciler
 
 router = APIRouter()
 
-CONFIRMATIONS = ConfirmationManager()
+CONFIRMATIONS = ConfirmationManager(pending=STORE.tables.get("pending"))
 RECONCILER = EventReconciler(engine=ENGINE, confirmations=CONFIRMATIONS)
 
-def _save_inventory_only():
-    STORE.save({
-        "zones": [z.model_dump() for z in ENGINE.zones.values()],
-        "spools": [s.model_dump() for s in ENGINE.spools.values()],
-        "printers": [p.model_dump() for p in ENGINE.printers.values()],
-    })
-
 class ConfirmRequest(BaseModel):
     resolved_by: str = Field(..., examples=["worker_1", "admin"])
     object_id: Optional[str] = Field(default=None, description="Required if CV had no hinted_object_id")
     note: Optional[str] = None
 
+class CVBatchItemResult(BaseModel):
+    index: int
+    ok: bool
+    pending: Optional[PendingConfirmation] = None
+    errors: Optional[List[Dict[str, Any]]] = None
+
+class CVBatchResponse(BaseModel):
+    accepted: int
+    rejected: int
+    results: List[CVBatchItemResult]
+
+_CV_EVENT_LIST = TypeAdapter(List[CVZoneChangeEvent])
+
+def _parse_cv_batch(body: bytes, content_type: str):
+    """
+    Parse a JSON array or NDJSON body into (index, event | errors) pairs.
+    Fast path: the whole batch is parsed + validated in one pydantic-core call;
+    only if that fails is each item validated on its own for per-item errors.
+    """
+    if "ndjson" in content_type:
+        lines = [ln for ln in body.splitlines() if ln.strip()]
+        raw = b"[" + b",".join(lines) + b"]"
+    else:
+        raw = body
+
+    try:
+        return list(enumerate(_CV_EVENT_LIST.validate_json(raw)))
+    except ValidationError:
+        pass
+
+    try:
+        items = [json.loads(ln) for ln in lines] if "ndjson" in content_type else json.loads(raw)
+    except ValueError as ex:
+        raise HTTPException(status_code=400, detail=f"invalid JSON body: {ex}")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="expected a JSON array or NDJSON stream of events")
+
+    out = []
+    for i, item in enumerate(items):
+        try:
+            out.append((i, CVZoneChangeEvent.model_validate(item)))
+        except ValidationError as ex:
+            out.append((i, ex.errors(include_url=False, include_context=False)))
+    return out
+
 # ---- ingest events ----
 @router.post("/events/cv", response_model=PendingConfirmation)
 def ingest_cv(ev: CVZoneChangeEvent):
-    pending = RECONCILER.ingest_cv(ev)
-    return pending
+    return WRITER.call(RECONCILER.ingest_cv, ev)
+
+@router.post("/events/cv/batch", response_model=CVBatchResponse)
+async def ingest_cv_batch(request: Request):
+    """
+    Bulk variant of /events/cv: body is a JSON array of CVZoneChangeEvent,
+    or NDJSON (Content-Type: application/x-ndjson), one event per line.
+    Valid events are ingested together; invalid ones are reported per index.
+    """
+    parsed = _parse_cv_batch(await request.body(), request.headers.get("content-type", ""))
+    valid = [(i, ev) for i, ev in parsed if isinstance(ev, CVZoneChangeEvent)]
+    pendings = await asyncio.wrap_future(WRITER.submit(RECONCILER.ingest_cv_batch, [ev for _, ev in valid]))
+
+    results = [CVBatchItemResult(index=i, ok=False, errors=errs) for i, errs in parsed if not isinstance(errs, CVZoneChangeEvent)]
+    results += [CVBatchItemResult(index=i, ok=True, pending=pc) for (i, _), pc in zip(valid, pendings)]
+    results.sort(key=lambda r: r.index)
+    return CVBatchResponse(accepted=len(valid), rejected=len(parsed) - len(valid), results=results)
 
 @router.post("/events/qr")
 def ingest_qr(ev: QRScanEvent):
-    RECONCILER.ingest_qr(ev)
-    _save_inventory_only()
+    WRITER.call(RECONCILER.ingest_qr, ev)
     return {"ok": True}
 
 # ---- confirmations ----
@@ -41,19 +96,24 @@ def ingest_qr(ev: QRScanEvent):
 def list_pending():
     return list(CONFIRMATIONS.list_pending().values())
 
+@router.get("/confirmations/{pending_id}", response_model=PendingConfirmation)
+def get_confirmation(pending_id: str):
+    # open items, or resolved ones still in the archive
+    pc = CONFIRMATIONS.get(pending_id)
+    if pc is None:
+        raise HTTPException(status_code=404, detail="pending_id not found")
+    return pc
+
 @router.post("/confirmations/{pending_id}/confirm", response_model=PendingConfirmation)
 def confirm_pending(pending_id: str, req: ConfirmRequest):
     try:
-        pc = RECONCILER.confirm_pending(pending_id, object_id=req.object_id, resolved_by=req.resolved_by)
-        _save_inventory_only()
-        return pc
+        return WRITER.call(RECONCILER.confirm_pending, pending_id, object_id=req.object_id, resolved_by=req.resolved_by)
     except KeyError:
         raise HTTPException(status_code=404, detail="pending_id not found")
 
 @router.post("/confirmations/{pending_id}/reject", response_model=PendingConfirmation)
 def reject_pending(pending_id: str, req: ConfirmRequest):
     try:
-        pc = CONFIRMATIONS.reject(pending_id, resolved_by=req.resolved_by, note=req.note)
-        return pc
+        return WRITER.call(CONFIRMATIONS.reject, pending_id, resolved_by=req.resolved_by, note=req.note)
     except KeyError:
         raise HTTPException(status_code=404, detail="pending_id not found")
\ No newline at end of file
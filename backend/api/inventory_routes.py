@@ -1,85 +1,158 @@
-from fastapi import APIRouter, HTTPException
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from backend.models.inventory import Zone, FilamentSpool, Printer
 from backend.services.inventory_state_engine import InventoryStateEngine
-from backend.services.storage import JsonStateStore
+from backend.services.response_cache import ResponseCache, if_none_match
+from backend.services.state_writer import StateWriter
+from backend.services.storage import make_state_store
 
 router = APIRouter()
 
 # Simple singleton instances for Phase 1 demo
-ENGINE = InventoryStateEngine()
-STORE = JsonStateStore()
+STORE = make_state_store()
+ENGINE = InventoryStateEngine(tables=STORE.tables)
+RESPONSES = ResponseCache()
+# all mutations go through WRITER (applied in order, persisted per batch); readers hold WRITER.lock
+WRITER = StateWriter(ENGINE, STORE)
 
 def _load_once():
     state = STORE.load()
-    if not state:
-        return
-    for z in state.get("zones", []):
-        ENGINE.upsert_zone(Zone(**z))
-    for s in state.get("spools", []):
-        ENGINE.upsert_spool(FilamentSpool(**s))
-    for p in state.get("printers", []):
-        ENGINE.upsert_printer(Printer(**p))
-
-def _save():
-    STORE.save({
-        "zones": [z.model_dump() for z in ENGINE.zones.values()],
-        "spools": [s.model_dump() for s in ENGINE.spools.values()],
-        "printers": [p.model_dump() for p in ENGINE.printers.values()],
-    })
+    if state:
+        ENGINE.load(state)  # keeps stored updated_at; nothing to persist again
 
 _load_once()
 
+def _cached(request: Request, build):
+    """
+    Serve a GET from the response cache with an ETag derived from ENGINE.version.
+    A matching If-None-Match is answered with 304 without building or serializing anything.
+    """
+    key = (request.url.path, tuple(sorted(request.query_params.multi_items())))
+    etag = RESPONSES.etag(key, ENGINE.version)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if if_none_match(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    with WRITER.lock:
+        version = ENGINE.version
+        body = RESPONSES.get_or_build(key, version, build)
+    headers["ETag"] = RESPONSES.etag(key, version)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def _check_zone(zone_id: Optional[str]) -> None:
+    if zone_id and zone_id not in ENGINE.zones:
+        raise HTTPException(status_code=400, detail="zone_id does not exist")
+
+def _list(request: Request, collection: str, filters: dict, ranges: dict, cursor: Optional[str], limit: Optional[int]):
+    """
+    Without cursor/limit: the (filtered) collection as a plain list, as before.
+    With either: one page {"items": [...], "next_cursor": str | None}.
+    """
+    filters = {k: v for k, v in filters.items() if v is not None}
+    paged = cursor is not None or limit is not None
+
+    def build():
+        try:
+            items, next_cursor = ENGINE.page(
+                collection, filters=filters, ranges=ranges, cursor=cursor,
+                limit=(limit or 100) if paged else None,
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="invalid cursor")
+        if not paged:
+            return items
+        return {"items": items, "next_cursor": next_cursor}
+
+    return _cached(request, build)
+
+_LIMIT = Query(default=None, ge=1, le=1000, description="Page size; enables cursor pagination")
+_CURSOR = Query(default=None, description="next_cursor from the previous page")
+
 # ---------- Zones ----------
 @router.get("/zones")
-def list_zones():
-    return list(ENGINE.zones.values())
+def list_zones(
+    request: Request,
+    zone_type: Optional[str] = None,
+    cursor: Optional[str] = _CURSOR,
+    limit: Optional[int] = _LIMIT,
+):
+    return _list(request, "zones", {"zone_type": zone_type}, {}, cursor, limit)
 
 @router.post("/zones")
 def upsert_zone(zone: Zone):
-    z = ENGINE.upsert_zone(zone)
-    _save()
-    return z
+    return WRITER.call(ENGINE.upsert_zone, zone)
+
+@router.get("/zones/occupancy")
+def zone_occupancy(request: Request):
+    return _cached(request, ENGINE.occupancy)
+
+@router.get("/zones/{zone_id}/contents")
+def zone_contents(zone_id: str):
+    with WRITER.lock:
+        contents = ENGINE.zone_contents(zone_id)
+        known = zone_id in ENGINE.zones
+    if not known and not (contents["spools"] or contents["printers"]):
+        raise HTTPException(status_code=404, detail="zone_id not found")
+    return {"zone_id": zone_id, **contents}
 
 @router.delete("/zones/{zone_id}")
 def delete_zone(zone_id: str):
-    ENGINE.delete_zone(zone_id)
-    _save()
+    WRITER.call(ENGINE.delete_zone, zone_id)
     return {"deleted": zone_id}
 
 # ---------- Spools ----------
 @router.get("/spools")
-def list_spools():
-    return list(ENGINE.spools.values())
+def list_spools(
+    request: Request,
+    material: Optional[str] = None,
+    color: Optional[str] = None,
+    brand: Optional[str] = None,
+    zone_id: Optional[str] = None,
+    mounted_printer_id: Optional[str] = None,
+    updated_after: Optional[datetime] = None,
+    updated_before: Optional[datetime] = None,
+    cursor: Optional[str] = _CURSOR,
+    limit: Optional[int] = _LIMIT,
+):
+    filters = {"material": material, "color": color, "brand": brand, "zone_id": zone_id, "mounted_printer_id": mounted_printer_id}
+    return _list(request, "spools", filters, {"updated_at": (updated_after, updated_before)}, cursor, limit)
 
 @router.post("/spools")
 def upsert_spool(spool: FilamentSpool):
-    if spool.zone_id and spool.zone_id not in ENGINE.zones:
-        raise HTTPException(status_code=400, detail="zone_id does not exist")
-    s = ENGINE.upsert_spool(spool)
-    _save()
-    return s
+    def command():
+        _check_zone(spool.zone_id)
+        return ENGINE.upsert_spool(spool)
+    return WRITER.call(command)
 
 @router.delete("/spools/{spool_id}")
 def delete_spool(spool_id: str):
-    ENGINE.delete_spool(spool_id)
-    _save()
+    WRITER.call(ENGINE.delete_spool, spool_id)
     return {"deleted": spool_id}
 
 # ---------- Printers ----------
 @router.get("/printers")
-def list_printers():
-    return list(ENGINE.printers.values())
+def list_printers(
+    request: Request,
+    model: Optional[str] = None,
+    zone_id: Optional[str] = None,
+    mounted_spool_id: Optional[str] = None,
+    updated_after: Optional[datetime] = None,
+    updated_before: Optional[datetime] = None,
+    cursor: Optional[str] = _CURSOR,
+    limit: Optional[int] = _LIMIT,
+):
+    filters = {"model": model, "zone_id": zone_id, "mounted_spool_id": mounted_spool_id}
+    return _list(request, "printers", filters, {"updated_at": (updated_after, updated_before)}, cursor, limit)
 
 @router.post("/printers")
 def upsert_printer(printer: Printer):
-    if printer.zone_id and printer.zone_id not in ENGINE.zones:
-        raise HTTPException(status_code=400, detail="zone_id does not exist")
-    p = ENGINE.upsert_printer(printer)
-    _save()
-    return p
+    def command():
+        _check_zone(printer.zone_id)
+        return ENGINE.upsert_printer(printer)
+    return WRITER.call(command)
 
 @router.delete("/printers/{printer_id}")
 def delete_printer(printer_id: str):
-    ENGINE.delete_printer(printer_id)
-    _save()
+    WRITER.call(ENGINE.delete_printer, printer_id)
     return {"deleted": printer_id}
\ No newline at end of file
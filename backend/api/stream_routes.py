@@ -0,0 +1,56 @@
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from backend.core.config import settings
+from backend.api.inventory_routes import ENGINE
+from backend.api.event_routes import CONFIRMATIONS
+from backend.services.change_stream import ChangeBroker, format_sse
+
+router = APIRouter()
+
+BROKER = ChangeBroker()
+ENGINE.add_listener(BROKER.publish)
+CONFIRMATIONS.add_listener(BROKER.publish)
+
+_TOPICS = {"inventory", "confirmation"}
+
+@router.get("/stream")
+async def stream(
+    request: Request,
+    topics: Optional[str] = Query(default=None, description="Comma-separated: inventory, confirmation (default: both)"),
+):
+    """
+    Server-Sent Events feed of changes, replacing list polling:
+      event: inventory.upsert | inventory.delete       data: {"kind", "id", "data", "version", ...}
+      event: confirmation.created | .confirmed | .rejected | .expired   data: {"id", "data", ...}
+      event: resync   the client fell behind and events were dropped; re-fetch the lists
+    """
+    wanted = None
+    if topics:
+        wanted = frozenset(t.strip() for t in topics.split(",") if t.strip())
+        if not wanted <= _TOPICS:
+            raise HTTPException(status_code=400, detail=f"unknown topics: {sorted(wanted - _TOPICS)}")
+
+    sub = BROKER.subscribe(wanted)
+
+    async def events():
+        try:
+            yield b": connected\n\n"
+            while not await request.is_disconnected():
+                try:
+                    item = await asyncio.wait_for(sub.queue.get(), timeout=settings.stream_heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                yield format_sse(item)
+        finally:
+            BROKER.unsubscribe(sub)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -5,6 +5,17 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="INV_", env_file=".env", extra="ignore")
 
     storage_path: str = Field(default="backend_state.json", description="JSON persistence file")
+    storage_backend: str = Field(default="wal", description="'json' (rewrite whole file), 'wal' (append-only log + snapshots) or 'sqlite'")
+    sqlite_path: str = Field(default="backend_state.db", description="SQLite database file (storage_backend='sqlite')")
+    wal_compact_every: int = Field(default=1000, description="Write a compacted snapshot after this many log entries")
+    wal_fsync: bool = Field(default=False, description="fsync the log after every append (durable, slower)")
+    writer_max_batch: int = Field(default=256, description="Max commands applied per group commit by the state writer")
+    response_cache_size: int = Field(default=256, description="Max serialized GET responses kept for ETag/304 handling")
+    stream_queue_size: int = Field(default=256, description="Events buffered per /stream subscriber before it is told to resync")
+    stream_heartbeat_seconds: float = Field(default=15.0, description="Idle interval between SSE keep-alive comments")
     pending_timeout_seconds: int = Field(default=20, description="How long to wait for QR scan after CV movement")
+    confirmation_sweep_interval_seconds: float = Field(default=1.0, description="How often the background sweeper expires pending items")
+    confirmation_archive_size: int = Field(default=1000, description="Max resolved/expired confirmations kept in memory")
+    confirmation_archive_retention_seconds: float = Field(default=3600, description="Drop archived confirmations older than this")
 
 settings = Settings()
\ No newline at end of file
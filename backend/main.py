@@ -1,16 +1,29 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from backend.api.health_routes import router as health_router
-from backend.api.inventory_routes import router as inventory_router
-from backend.api.event_routes import router as event_router
+from backend.api.inventory_routes import router as inventory_router, WRITER
+from backend.api.event_routes import router as event_router, CONFIRMATIONS
+from backend.api.stream_routes import router as stream_router
 from backend.core.logging import setup_logging
 
 setup_logging()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    WRITER.start()
+    CONFIRMATIONS.start_sweeper(run=WRITER.call)  # expiry is a writer command like any other
+    yield
+    CONFIRMATIONS.stop_sweeper()  # before the writer, so no expiry is submitted after it stopped
+    WRITER.stop()  # drains and persists queued commands
+
 app = FastAPI(
     title="Inventory Tracking Backend (Phase 1)",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.include_router(health_router)
 app.include_router(inventory_router, prefix="/api")
-app.include_router(event_router, prefix="/api")
\ No newline at end of file
+app.include_router(event_router, prefix="/api")
+app.include_router(stream_router, prefix="/api")
\ No newline at end of file
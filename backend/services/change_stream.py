@@ -0,0 +1,81 @@
+from __future__ import annotations
+import asyncio
+import itertools
+import threading
+from typing import Any, Dict, FrozenSet, List, Optional
+
+from backend.core.config import settings
+from backend.services.response_cache import dumps
+
+class Subscription:
+    """
+    One stream client: a bounded asyncio.Queue of pre-serialized events on the
+    client's event loop. If the client falls behind and the queue fills up, the
+    backlog is discarded and a single "resync" event is queued instead, telling
+    the client to re-fetch the lists it cares about.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_size: int, topics: Optional[FrozenSet[str]] = None):
+        self.loop = loop
+        self.topics = topics
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=max(2, max_size))
+        self.dropped = 0
+
+    def wants(self, topic: str) -> bool:
+        return self.topics is None or topic in self.topics
+
+    # runs on self.loop
+    def _put(self, item: Dict[str, Any]) -> None:
+        if self.queue.full():
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"id": item["id"], "event": "resync", "data": b'{"reason":"overflow"}'})
+            return
+        self.queue.put_nowait(item)
+
+class ChangeBroker:
+    """
+    Fans engine / confirmation change events out to stream subscribers.
+    publish() may be called from any thread (route handlers run in a threadpool,
+    the confirmation sweeper has its own thread); each event is serialized once
+    and handed to every subscriber's loop with call_soon_threadsafe.
+    """
+
+    def __init__(self, queue_size: Optional[int] = None):
+        self.queue_size = int(queue_size if queue_size is not None else settings.stream_queue_size)
+        self._subs: List[Subscription] = []
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def subscribe(self, topics: Optional[FrozenSet[str]] = None) -> Subscription:
+        """Call from inside the event loop that will consume the subscription."""
+        sub = Subscription(asyncio.get_running_loop(), self.queue_size, topics)
+        with self._lock:
+            self._subs.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            if sub in self._subs:
+                self._subs.remove(sub)
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subs)
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        with self._lock:
+            subs = [s for s in self._subs if s.wants(event["topic"])]
+        if not subs:
+            return
+        item = {"id": next(self._ids), "event": f"{event['topic']}.{event['op']}", "data": dumps(event)}
+        for sub in subs:
+            try:
+                sub.loop.call_soon_threadsafe(sub._put, item)
+            except RuntimeError:
+                self.unsubscribe(sub)  # loop already closed
+
+def format_sse(item: Dict[str, Any]) -> bytes:
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (item["id"], item["event"].encode("utf-8"), item["data"])
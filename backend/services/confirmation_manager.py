@@ -1,15 +1,65 @@
 from __future__ import annotations
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, List, MutableMapping, Optional, Tuple
+import heapq
+import logging
+import threading
 import uuid
 
 from backend.core.config import settings
 from backend.models.events import PendingConfirmation
 from backend.models.common import InventoryObjectType
+from backend.services.tables import MemoryTable
+
+log = logging.getLogger(__name__)
 
 class ConfirmationManager:
-    def __init__(self):
-        self.pending: Dict[str, PendingConfirmation] = {}
+    """
+    Open confirmations live in `pending`; an expiry min-heap keyed by expires_at
+    makes expiring k items O(k log n) instead of scanning everything.
+    Resolved (confirmed / rejected / expired) items move to a bounded `archive`
+    (archive_size items, archive_retention_seconds old at most).
+    Expiry runs from a background sweeper (start_sweeper, submitting through
+    the StateWriter in the app); confirm/reject only check the one item they touch.
+    """
+
+    def __init__(
+        self,
+        pending: Optional[MutableMapping[str, PendingConfirmation]] = None,
+        archive_size: Optional[int] = None,
+        archive_retention_seconds: Optional[float] = None,
+    ):
+        # pending may be a storage-backed table (e.g. SQLite); default is in-memory
+        self.pending: MutableMapping[str, PendingConfirmation] = pending if pending is not None else MemoryTable("pending_id")
+        self.archive: "OrderedDict[str, PendingConfirmation]" = OrderedDict()
+        self.archive_size = max(0, int(archive_size if archive_size is not None else settings.confirmation_archive_size))
+        self.archive_retention = timedelta(seconds=float(
+            archive_retention_seconds if archive_retention_seconds is not None
+            else settings.confirmation_archive_retention_seconds
+        ))
+
+        self._lock = threading.RLock()
+        self._heap: List[Tuple[datetime, str]] = []
+        for pc in self.pending.find(status="pending"):
+            self._heap.append((pc.expires_at, pc.pending_id))
+        heapq.heapify(self._heap)
+
+        self._sweeper: Optional[threading.Thread] = None
+        self._sweeper_stop = threading.Event()
+        # called with {"topic": "confirmation", "op": "created"|"confirmed"|"rejected"|"expired", "data": pc}
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+    def add_listener(self, fn: Callable[[Dict[str, Any]], None]) -> None:
+        self._listeners.append(fn)
+
+    def remove_listener(self, fn: Callable[[Dict[str, Any]], None]) -> None:
+        if fn in self._listeners:
+            self._listeners.remove(fn)
+
+    def _emit(self, op: str, pc: PendingConfirmation) -> None:
+        for fn in list(self._listeners):
+            fn({"topic": "confirmation", "op": op, "id": pc.pending_id, "data": pc})
 
     def create_pending(
         self,
@@ -30,48 +80,113 @@ class ConfirmationManager:
             created_at=now,
             expires_at=expires_at,
         )
-        self.pending[pending_id] = pc
+        with self._lock:
+            self.pending[pending_id] = pc
+            heapq.heappush(self._heap, (expires_at, pending_id))
+            self._emit("created", pc)
         return pc
 
     def list_pending(self) -> Dict[str, PendingConfirmation]:
-        self.expire_old()
-        return self.pending
-
-    def expire_old(self) -> None:
+        # items past their deadline that the sweeper hasn't reached yet are hidden, not mutated
         now = datetime.utcnow()
-        for pid, pc in list(self.pending.items()):
-            if pc.status == "pending" and pc.expires_at <= now:
-                pc.status = "expired"
-                pc.resolved_at = now
-                pc.resolution_note = "Auto-expired"
-                self.pending[pid] = pc
+        with self._lock:
+            return {pid: pc for pid, pc in self.pending.items() if pc.expires_at > now}
 
-    def confirm(self, pending_id: str, resolved_by: str, note: str | None = None) -> PendingConfirmation:
-        self.expire_old()
-        pc = self.pending.get(pending_id)
-        if not pc:
-            raise KeyError("pending_id not found")
-        if pc.status != "pending":
-            return pc
+    def get(self, pending_id: str) -> Optional[PendingConfirmation]:
+        with self._lock:
+            pc = self.pending.get(pending_id)
+            return pc if pc is not None else self.archive.get(pending_id)
 
-        pc.status = "confirmed"
+    # ---------- expiry ----------
+    def expire_old(self) -> int:
+        """Expire every item whose deadline passed. Returns how many expired."""
+        now = datetime.utcnow()
+        expired = 0
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                expires_at, pid = heapq.heappop(self._heap)
+                pc = self.pending.get(pid)
+                # lazy deletion: resolved items leave stale heap entries behind
+                if pc is None or pc.status != "pending" or pc.expires_at != expires_at:
+                    continue
+                self._resolve(pc, "expired", resolved_by=None, note="Auto-expired", now=now)
+                expired += 1
+            self._prune_archive(now)
+        return expired
+
+    def _resolve(self, pc: PendingConfirmation, status: str, resolved_by: Optional[str], note: Optional[str], now: datetime) -> None:
+        pc.status = status
         pc.resolved_by = resolved_by
-        pc.resolved_at = datetime.utcnow()
+        pc.resolved_at = now
         pc.resolution_note = note
-        self.pending[pending_id] = pc
-        return pc
+        self.pending.pop(pc.pending_id, None)
+        self.archive[pc.pending_id] = pc
+        self.archive.move_to_end(pc.pending_id)
+        self._prune_archive(now)
+        self._emit(status, pc)
 
-    def reject(self, pending_id: str, resolved_by: str, note: str | None = None) -> PendingConfirmation:
-        self.expire_old()
+    def _prune_archive(self, now: datetime) -> None:
+        cutoff = now - self.archive_retention
+        while self.archive:
+            pid, pc = next(iter(self.archive.items()))
+            if len(self.archive) > self.archive_size or (pc.resolved_at is not None and pc.resolved_at < cutoff):
+                self.archive.popitem(last=False)
+            else:
+                break
+
+    def start_sweeper(self, interval_seconds: Optional[float] = None, run: Optional[Callable[..., Any]] = None) -> None:
+        """
+        run: how expire_old is executed, e.g. StateWriter.call so expiry goes
+        through the single writer (in order with other commands, persisted
+        with its batch). Default: called directly on the sweeper thread.
+        """
+        if self._sweeper is not None:
+            return
+        interval = float(interval_seconds if interval_seconds is not None else settings.confirmation_sweep_interval_seconds)
+        run = run or (lambda fn: fn())
+        self._sweeper_stop.clear()
+
+        def _loop():
+            while not self._sweeper_stop.wait(interval):
+                try:
+                    run(self.expire_old)
+                except Exception:
+                    log.exception("confirmation expiry failed")
+
+        self._sweeper = threading.Thread(target=_loop, name="confirmation-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self) -> None:
+        if self._sweeper is None:
+            return
+        self._sweeper_stop.set()
+        self._sweeper.join()
+        self._sweeper = None
+
+    # ---------- resolution ----------
+    def _open_item(self, pending_id: str, now: datetime) -> PendingConfirmation:
+        """Return the item; if it is still open but past its deadline, expire it first."""
         pc = self.pending.get(pending_id)
-        if not pc:
-            raise KeyError("pending_id not found")
-        if pc.status != "pending":
+        if pc is None:
+            pc = self.archive.get(pending_id)
+            if pc is None:
+                raise KeyError("pending_id not found")
             return pc
+        if pc.status == "pending" and pc.expires_at <= now:
+            self._resolve(pc, "expired", resolved_by=None, note="Auto-expired", now=now)
+        return pc
 
-        pc.status = "rejected"
-        pc.resolved_by = resolved_by
-        pc.resolved_at = datetime.utcnow()
-        pc.resolution_note = note
-        self.pending[pending_id] = pc
-        return pc
\ No newline at end of file
+    def confirm(self, pending_id: str, resolved_by: str, note: str | None = None) -> PendingConfirmation:
+        return self._finish(pending_id, "confirmed", resolved_by, note)
+
+    def reject(self, pending_id: str, resolved_by: str, note: str | None = None) -> PendingConfirmation:
+        return self._finish(pending_id, "rejected", resolved_by, note)
+
+    def _finish(self, pending_id: str, status: str, resolved_by: str, note: Optional[str]) -> PendingConfirmation:
+        now = datetime.utcnow()
+        with self._lock:
+            pc = self._open_item(pending_id, now)
+            if pc.status != "pending":
+                return pc
+            self._resolve(pc, status, resolved_by=resolved_by, note=note, now=now)
+            return pc
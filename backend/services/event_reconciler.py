@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Optional
+from typing import List, Optional
 from backend.models.events import CVZoneChangeEvent, QRScanEvent, PendingConfirmation
 from backend.models.common import InventoryObjectType
 from backend.services.inventory_state_engine import InventoryStateEngine
@@ -27,6 +27,10 @@ class EventReconciler:
             hinted_object_id=ev.hinted_object_id,
         )
 
+    def ingest_cv_batch(self, events: List[CVZoneChangeEvent]) -> List[PendingConfirmation]:
+        # Same rule as ingest_cv, applied to a whole batch in order
+        return [self.ingest_cv(ev) for ev in events]
+
     def ingest_qr(self, ev: QRScanEvent) -> None:
         # QR scan is strong identity -> commit what we can
         if ev.scanned_type == InventoryObjectType.filament_spool:
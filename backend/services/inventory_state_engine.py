@@ -1,8 +1,13 @@
 from __future__ import annotations
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, List, MutableMapping, Optional, Tuple
 from datetime import datetime, timezone
 from backend.models.inventory import FilamentSpool, Printer, Zone
 from backend.models.common import InventoryObjectType
+from backend.services.tables import MemoryTable, Ranges, decode_cursor, encode_cursor
+
+def _table(tables: Dict[str, MutableMapping], name: str, key_field: str, indexed=(), range_indexed=()) -> MutableMapping:
+    t = tables.get(name)
+    return t if t is not None else MemoryTable(key_field, indexed=indexed, range_indexed=range_indexed)
 
 class InventoryStateEngine:
     """
@@ -12,34 +17,188 @@ class InventoryStateEngine:
     - Confirmations can commit a move from zone A -> zone B.
     """
 
-    def __init__(self):
-        self.zones: Dict[str, Zone] = {}
-        self.spools: Dict[str, FilamentSpool] = {}
-        self.printers: Dict[str, Printer] = {}
+    def __init__(self, tables: Optional[Dict[str, MutableMapping]] = None):
+        # tables may come from a storage backend (e.g. SQLite); default is in-memory
+        tables = tables or {}
+        # Inverted indexes back zone lookups, occupancy counts and filtered list pages
+        self.zones: MutableMapping[str, Zone] = _table(tables, "zones", "zone_id", indexed=("zone_type",))
+        self.spools: MutableMapping[str, FilamentSpool] = _table(
+            tables, "spools", "spool_id",
+            indexed=("zone_id", "material", "color", "brand", "mounted_printer_id"),
+            range_indexed=("updated_at",),
+        )
+        self.printers: MutableMapping[str, Printer] = _table(
+            tables, "printers", "printer_id",
+            indexed=("zone_id", "model", "mounted_spool_id"),
+            range_indexed=("updated_at",),
+        )
+
+        # (kind, object_id) touched since the last drain_changes(); used for incremental persistence
+        self._dirty: Dict[Tuple[str, str], None] = {}
+        # bumped on every mutation; lets readers cache anything derived from state
+        self.version = 0
+        # called with {"topic": "inventory", "op", "kind", "id", "data", "version"} after each mutation
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+    # ---------- Change tracking ----------
+    def add_listener(self, fn: Callable[[Dict[str, Any]], None]) -> None:
+        self._listeners.append(fn)
+
+    def remove_listener(self, fn: Callable[[Dict[str, Any]], None]) -> None:
+        if fn in self._listeners:
+            self._listeners.remove(fn)
+
+    def _touch(self, kind: str, object_id: str) -> None:
+        self._dirty[(kind, object_id)] = None
+        self.version += 1
+        if self._listeners:
+            obj = {"zone": self.zones, "spool": self.spools, "printer": self.printers}[kind].get(object_id)
+            event = {
+                "topic": "inventory",
+                "op": "delete" if obj is None else "upsert",
+                "kind": kind,
+                "id": object_id,
+                "data": obj,
+                "version": self.version,
+            }
+            for fn in list(self._listeners):
+                fn(event)
+
+    def drain_changes(self) -> List[Dict[str, Any]]:
+        """
+        Return (and forget) the mutations since the last call, one op per object:
+          {"op": "upsert", "kind": "spool", "id": ..., "data": {...}}
+          {"op": "delete", "kind": "spool", "id": ...}
+        """
+        tables = {"zone": self.zones, "spool": self.spools, "printer": self.printers}
+        ops = []
+        for kind, object_id in self._dirty:
+            obj = tables[kind].get(object_id)
+            if obj is None:
+                ops.append({"op": "delete", "kind": kind, "id": object_id})
+            else:
+                ops.append({"op": "upsert", "kind": kind, "id": object_id, "data": obj.model_dump(mode="json")})
+        self._dirty = {}
+        return ops
+
+    def requeue_changes(self, changes: List[Dict[str, Any]]) -> None:
+        """
+        Put drained changes back (e.g. after a failed persist) so the next
+        drain_changes() returns them again, ahead of newer ones, with the
+        objects' current data.
+        """
+        requeued = {(c["kind"], c["id"]): None for c in changes}
+        requeued.update(self._dirty)
+        self._dirty = requeued
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "zones": [z.model_dump() for z in self.zones.values()],
+            "spools": [s.model_dump() for s in self.spools.values()],
+            "printers": [p.model_dump() for p in self.printers.values()],
+        }
+
+    # ---------- Queries ----------
+    def find_spools(self, **filters: Any) -> List[FilamentSpool]:
+        """e.g. find_spools(zone_id="Rack_A_Slot_1", material="PLA"); indexed on SQLite."""
+        return self.spools.find(**filters)
+
+    def find_printers(self, **filters: Any) -> List[Printer]:
+        return self.printers.find(**filters)
+
+    def page(
+        self,
+        collection: str,
+        filters: Optional[Dict[str, Any]] = None,
+        ranges: Optional[Ranges] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = 100,
+    ) -> Tuple[list, Optional[str]]:
+        """
+        One page of "zones" / "spools" / "printers" in id order.
+        cursor is the opaque next_cursor of the previous page (ValueError if malformed).
+        Returns (items, next_cursor); next_cursor is None on the last page.
+        """
+        table = {"zones": self.zones, "spools": self.spools, "printers": self.printers}[collection]
+        after = decode_cursor(cursor) if cursor else None
+        items, last_key = table.page(filters=filters, ranges=ranges, after=after, limit=limit)
+        return items, (encode_cursor(last_key) if last_key is not None else None)
+
+    def zone_contents(self, zone_id: str) -> Dict[str, list]:
+        """Objects currently located in zone_id (secondary index lookup)."""
+        return {
+            "spools": self.spools.find(zone_id=zone_id),
+            "printers": self.printers.find(zone_id=zone_id),
+        }
+
+    def occupancy(self) -> Dict[str, Dict[str, int]]:
+        """
+        Per-zone counts per object type, for every known zone plus any zone
+        referenced by an object: {zone_id: {"filament_spool": n, "printer": m, "total": n + m}}
+        """
+        by_type = {
+            InventoryObjectType.filament_spool.value: self.spools.count_by("zone_id"),
+            InventoryObjectType.printer.value: self.printers.count_by("zone_id"),
+        }
+        zone_ids = list(self.zones.keys())
+        known = set(zone_ids)
+        for counts in by_type.values():
+            zone_ids += [z for z in counts if z is not None and z not in known]
+            known.update(counts)
+
+        out = {}
+        for zid in zone_ids:
+            row = {t: counts.get(zid, 0) for t, counts in by_type.items()}
+            row["total"] = sum(row.values())
+            out[zid] = row
+        return out
+
+    def load(self, state: Dict[str, Any]) -> None:
+        """
+        Restore a persisted snapshot ({"zones", "spools", "printers"} lists of dicts).
+        Objects keep their stored updated_at and nothing is recorded as a change:
+        they are already on disk.
+        """
+        for z in state.get("zones", []):
+            z = Zone(**z)
+            self.zones[z.zone_id] = z
+        for s in state.get("spools", []):
+            s = FilamentSpool(**s)
+            self.spools[s.spool_id] = s
+        for p in state.get("printers", []):
+            p = Printer(**p)
+            self.printers[p.printer_id] = p
+        self.version += 1
 
     # ---------- CRUD ----------
     def upsert_zone(self, z: Zone) -> Zone:
         self.zones[z.zone_id] = z
+        self._touch("zone", z.zone_id)
         return z
 
     def delete_zone(self, zone_id: str) -> None:
         self.zones.pop(zone_id, None)
+        self._touch("zone", zone_id)
 
     def upsert_spool(self, s: FilamentSpool) -> FilamentSpool:
         s.updated_at = datetime.now(timezone.utc)
         self.spools[s.spool_id] = s
+        self._touch("spool", s.spool_id)
         return s
 
     def delete_spool(self, spool_id: str) -> None:
         self.spools.pop(spool_id, None)
+        self._touch("spool", spool_id)
 
     def upsert_printer(self, p: Printer) -> Printer:
         p.updated_at = datetime.now(timezone.utc)
         self.printers[p.printer_id] = p
+        self._touch("printer", p.printer_id)
         return p
 
     def delete_printer(self, printer_id: str) -> None:
         self.printers.pop(printer_id, None)
+        self._touch("printer", printer_id)
 
     # ---------- Commits ----------
     def commit_location_change(
@@ -61,6 +220,8 @@ class InventoryStateEngine:
             # Optional check: if from_zone provided and differs, we still allow commit
             s.zone_id = to_zone
             s.updated_at = datetime.utcnow()
+            self.spools[object_id] = s  # write back (no-op for in-memory tables)
+            self._touch("spool", object_id)
 
         elif object_type == InventoryObjectType.printer:
             if object_id not in self.printers:
@@ -68,6 +229,8 @@ class InventoryStateEngine:
             p = self.printers[object_id]
             p.zone_id = to_zone
             p.updated_at = datetime.utcnow()
+            self.printers[object_id] = p
+            self._touch("printer", object_id)
 
     def commit_mount(
         self,
@@ -94,4 +257,8 @@ class InventoryStateEngine:
             s.zone_id = zone_id
 
         s.updated_at = datetime.now(timezone.utc)
-        p.updated_at = datetime.now(timezone.utc)
\ No newline at end of file
+        p.updated_at = datetime.now(timezone.utc)
+        self.spools[spool_id] = s
+        self.printers[printer_id] = p
+        self._touch("spool", spool_id)
+        self._touch("printer", printer_id)
\ No newline at end of file
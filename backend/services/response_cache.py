@@ -0,0 +1,59 @@
+from __future__ import annotations
+import secrets
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from pydantic import TypeAdapter
+
+from backend.core.config import settings
+
+# pydantic-core's Rust JSON serializer: handles models, dicts and datetimes directly
+_JSON = TypeAdapter(Any)
+
+def dumps(obj: Any) -> bytes:
+    return _JSON.dump_json(obj)
+
+class ResponseCache:
+    """
+    Serialized response bodies keyed by (request key, state version).
+    An entry is reused only while the engine version it was built from is
+    current, so any mutation invalidates everything at once. LRU-bounded.
+    ETags also carry a random boot id: the engine version restarts at 0 with
+    the process, so without it a client could get a 304 for pre-restart data.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max(1, int(max_entries if max_entries is not None else settings.response_cache_size))
+        self._entries: "OrderedDict[Hashable, Tuple[int, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.boot_id = secrets.token_hex(4)
+
+    def etag(self, key: Hashable, version: int) -> str:
+        return f'"{self.boot_id}-{version}-{zlib.crc32(repr(key).encode("utf-8")):08x}"'
+
+    def get_or_build(self, key: Hashable, version: int, build: Callable[[], Any]) -> bytes:
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is not None and hit[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return hit[1]
+        body = dumps(build())
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (version, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return body
+
+def if_none_match(header: Optional[str], etag: str) -> bool:
+    """True if the client's If-None-Match already covers etag."""
+    if not header:
+        return False
+    tags = [t.strip() for t in header.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
@@ -0,0 +1,234 @@
+from __future__ import annotations
+import sqlite3
+import threading
+from collections.abc import MutableMapping
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel
+
+from backend.core.config import settings
+from backend.models.events import PendingConfirmation
+from backend.models.inventory import FilamentSpool, Printer, Zone
+from backend.services.tables import Ranges, matches_filters, to_utc
+
+
+def _col_value(v: Any) -> Any:
+    if isinstance(v, Enum):
+        return v.value
+    if isinstance(v, datetime):
+        # normalize so ISO strings sort chronologically
+        return to_utc(v).isoformat()
+    return v
+
+
+class SqliteTable(MutableMapping):
+    """
+    Dict-like view over one SQLite table of pydantic models.
+    Each row stores the model as JSON plus a few extracted (indexed) columns
+    used for filtered queries; nothing is cached in memory.
+    """
+
+    def __init__(
+        self,
+        store: "SqliteStateStore",
+        table: str,
+        model: Type[BaseModel],
+        key_field: str,
+        columns: Sequence[str] = (),
+        indexed: Sequence[str] = (),
+    ):
+        self.store = store
+        self.table = table
+        self.model = model
+        self.key_field = key_field
+        self.columns = list(columns)
+
+        names = [key_field, *self.columns, "data"]
+        self._upsert_sql = f"INSERT OR REPLACE INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})"
+
+        cols = "".join(f", {c}" for c in self.columns)
+        store.execute(f"CREATE TABLE IF NOT EXISTS {table} ({key_field} TEXT PRIMARY KEY{cols}, data TEXT NOT NULL)")
+        self._add_missing_columns()
+        for c in indexed:
+            store.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_{c} ON {table} ({c})")
+
+    def _add_missing_columns(self) -> None:
+        # databases created by an older schema: add new columns, then backfill them from `data`
+        existing = {r[1] for r in self.store.query(f"PRAGMA table_info({self.table})")}
+        missing = [c for c in self.columns if c not in existing]
+        if not missing:
+            return
+        for c in missing:
+            self.store.execute(f"ALTER TABLE {self.table} ADD COLUMN {c}")
+        for key, obj in self.items():
+            self[key] = obj
+
+    def _load(self, data: str) -> BaseModel:
+        return self.model.model_validate_json(data)
+
+    # ---------- MutableMapping ----------
+    def __getitem__(self, key: str) -> BaseModel:
+        rows = self.store.query(f"SELECT data FROM {self.table} WHERE {self.key_field} = ?", (key,))
+        if not rows:
+            raise KeyError(key)
+        return self._load(rows[0][0])
+
+    def __setitem__(self, key: str, obj: BaseModel) -> None:
+        params = [key, *(_col_value(getattr(obj, c, None)) for c in self.columns), obj.model_dump_json()]
+        self.store.execute(self._upsert_sql, params)
+
+    def __delitem__(self, key: str) -> None:
+        if self.store.execute(f"DELETE FROM {self.table} WHERE {self.key_field} = ?", (key,)) == 0:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return bool(self.store.query(f"SELECT 1 FROM {self.table} WHERE {self.key_field} = ?", (key,)))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([r[0] for r in self.store.query(f"SELECT {self.key_field} FROM {self.table}")])
+
+    def __len__(self) -> int:
+        return self.store.query(f"SELECT COUNT(*) FROM {self.table}")[0][0]
+
+    # single query instead of one SELECT per key
+    def values(self) -> List[BaseModel]:  # type: ignore[override]
+        return [self._load(r[0]) for r in self.store.query(f"SELECT data FROM {self.table}")]
+
+    def items(self) -> List[tuple]:  # type: ignore[override]
+        rows = self.store.query(f"SELECT {self.key_field}, data FROM {self.table}")
+        return [(k, self._load(d)) for k, d in rows]
+
+    # ---------- queries ----------
+    def _where(self, filters: Dict[str, Any], ranges: Optional[Ranges] = None) -> Tuple[List[str], List[Any]]:
+        where, params = [], []
+        for k, v in filters.items():
+            v = _col_value(getattr(v, "value", v))
+            if v is None:
+                where.append(f"{k} IS NULL")
+            else:
+                where.append(f"{k} = ?")
+                params.append(v)
+        for k, (low, high) in (ranges or {}).items():
+            if low is not None:
+                where.append(f"{k} >= ?")
+                params.append(_col_value(low))
+            if high is not None:
+                where.append(f"{k} <= ?")
+                params.append(_col_value(high))
+        return where, params
+
+    def find(self, **filters: Any) -> List[BaseModel]:
+        """Equality filters; extracted columns are answered by SQL (indexed), others in Python."""
+        sql_filters = {k: v for k, v in filters.items() if k in self.columns or k == self.key_field}
+        rest = {k: v for k, v in filters.items() if k not in sql_filters}
+
+        where, params = self._where(sql_filters)
+        sql = f"SELECT data FROM {self.table}" + (f" WHERE {' AND '.join(where)}" if where else "")
+        objs = [self._load(r[0]) for r in self.store.query(sql, params)]
+        return [o for o in objs if matches_filters(o, rest)] if rest else objs
+
+    def page(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        ranges: Optional[Ranges] = None,
+        after: Optional[str] = None,
+        limit: Optional[int] = 100,
+    ) -> Tuple[List[BaseModel], Optional[str]]:
+        """Keyset pagination in primary-key order; same contract as MemoryTable.page."""
+        filters = filters or {}
+        unknown = [k for k in [*filters, *(ranges or {})] if k not in self.columns]
+        if unknown:
+            raise KeyError(f"not a queryable column: {unknown}")
+
+        where, params = self._where(filters, ranges)
+        if after is not None:
+            where.append(f"{self.key_field} > ?")
+            params.append(after)
+        sql = f"SELECT {self.key_field}, data FROM {self.table}"
+        if where:
+            sql += f" WHERE {' AND '.join(where)}"
+        sql += f" ORDER BY {self.key_field}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit + 1)
+
+        rows = self.store.query(sql, params)
+        more = limit is not None and len(rows) > limit
+        rows = rows[:limit] if limit is not None else rows
+        return [self._load(d) for _, d in rows], (rows[-1][0] if more else None)
+
+    def count_by(self, field: str) -> Dict[Any, int]:
+        """{value: number of rows} for an extracted column (GROUP BY on the index)."""
+        if field not in self.columns:
+            raise KeyError(field)
+        return dict(self.store.query(f"SELECT {field}, COUNT(*) FROM {self.table} GROUP BY {field}"))
+
+
+class SqliteStateStore:
+    """
+    SQLite persistence: zones, spools, printers and pending confirmations live
+    in tables (zone_id / object_type / status indexed) and are read and written
+    per object, so nothing needs to be loaded into memory at startup.
+    Writes outside a batch are committed as they happen; the StateWriter
+    calls begin() before applying a batch and persist() commits it, so each
+    batch is one transaction.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path or settings.sqlite_path
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+
+        self.tables: Dict[str, SqliteTable] = {
+            "zones": SqliteTable(self, "zones", Zone, "zone_id", columns=["zone_type"], indexed=["zone_type"]),
+            "spools": SqliteTable(
+                self, "spools", FilamentSpool, "spool_id",
+                columns=["zone_id", "material", "color", "brand", "mounted_printer_id", "updated_at"],
+                indexed=["zone_id", "material", "color", "brand", "mounted_printer_id", "updated_at"],
+            ),
+            "printers": SqliteTable(
+                self, "printers", Printer, "printer_id",
+                columns=["zone_id", "model", "mounted_spool_id", "updated_at"],
+                indexed=["zone_id", "model", "mounted_spool_id", "updated_at"],
+            ),
+            "pending": SqliteTable(
+                self, "pending_confirmations", PendingConfirmation, "pending_id",
+                columns=["status", "object_type", "expires_at"],
+                indexed=["status", "object_type", "expires_at"],
+            ),
+        }
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> int:
+        with self._lock:
+            return self.conn.execute(sql, params).rowcount
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[tuple]:
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    # ---------- same interface as JsonStateStore ----------
+    def load(self) -> Dict[str, Any]:
+        return {}  # the engine reads the tables directly
+
+    def begin(self) -> None:
+        """Open the transaction for one writer batch (committed by persist)."""
+        with self._lock:
+            if not self.conn.in_transaction:
+                self.conn.execute("BEGIN")
+
+    def persist(self, changes: List[Dict[str, Any]], full_state: Callable[[], Dict[str, Any]]) -> None:
+        with self._lock:
+            if not self.conn.in_transaction:
+                return
+            try:
+                self.conn.execute("COMMIT")
+            except sqlite3.Error:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def close(self) -> None:
+        self.conn.close()
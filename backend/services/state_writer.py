@@ -0,0 +1,123 @@
+from __future__ import annotations
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+from backend.core.config import settings
+from backend.services.inventory_state_engine import InventoryStateEngine
+
+log = logging.getLogger(__name__)
+
+_STOP = object()
+
+class StateWriter:
+    """
+    Single writer for backend state. Route handlers submit mutations as
+    commands; one thread applies them in arrival order and then persists
+    everything that changed with one STORE.persist call per batch (group
+    commit). A command's future resolves only after its batch was persisted.
+
+    `lock` is held while commands are applied, so a reader holding it sees
+    the state between two commands, never halfway through one.
+    """
+
+    def __init__(self, engine: InventoryStateEngine, store: Any, max_batch: Optional[int] = None):
+        self.engine = engine
+        self.store = store
+        self.max_batch = max(1, int(max_batch if max_batch is not None else settings.writer_max_batch))
+        self.lock = threading.RLock()
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.batches = 0
+        self.commands = 0
+
+    # ---------- lifecycle ----------
+    def start(self) -> None:
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="state-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Apply and persist everything already submitted, then stop the thread."""
+        with self._start_lock:
+            if self._thread is None:
+                return
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+    # ---------- commands ----------
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        if self._thread is None:
+            self.start()
+        fut: Future = Future()
+        self._queue.put((fn, args, kwargs, fut))
+        return fut
+
+    def call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Submit and wait; exceptions raised by fn are re-raised here."""
+        return self.submit(fn, *args, **kwargs).result()
+
+    # ---------- writer thread ----------
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch: List[Tuple[Callable[..., Any], tuple, dict, Future]] = []
+            item = self._queue.get()
+            while True:
+                if item is _STOP:
+                    stop = True
+                else:
+                    batch.append(item)
+                if stop or len(batch) >= self.max_batch:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._apply(batch)
+
+    def _apply(self, batch: List[Tuple[Callable[..., Any], tuple, dict, Future]]) -> None:
+        results = []
+        begin = getattr(self.store, "begin", None)  # transactional stores (SQLite): one transaction per batch
+        with self.lock:
+            if begin is not None:
+                begin()
+            for fn, args, kwargs, fut in batch:
+                if not fut.set_running_or_notify_cancel():
+                    continue
+                try:
+                    results.append((fut, fn(*args, **kwargs), None))
+                except BaseException as ex:
+                    results.append((fut, None, ex))
+            changes = self.engine.drain_changes()
+
+        persist_error: Optional[BaseException] = None
+        try:
+            self.store.persist(changes, self._locked_snapshot)
+        except Exception as ex:
+            log.exception("state persist failed; %d changes kept for the next batch", len(changes))
+            persist_error = ex
+            # memory already changed: retry these with the next persist so disk catches up
+            with self.lock:
+                self.engine.requeue_changes(changes)
+
+        self.batches += 1
+        self.commands += len(results)
+        for fut, value, ex in results:
+            if ex is not None:
+                fut.set_exception(ex)
+            elif persist_error is not None:
+                fut.set_exception(persist_error)
+            else:
+                fut.set_result(value)
+
+    def _locked_snapshot(self):
+        with self.lock:
+            return self.engine.snapshot()
@@ -1,14 +1,28 @@
 from __future__ import annotations
 import json
 import os
-from typing import Dict, Any
+from typing import Any, Callable, Dict, List
 from backend.core.config import settings
 
+_COLLECTIONS = {"zone": ("zones", "zone_id"), "spool": ("spools", "spool_id"), "printer": ("printers", "printer_id")}
+
+def _atomic_write_json(path: str, state: Dict[str, Any], indent: int | None) -> None:
+    # write to a temp file then rename, so a crash never leaves a half-written file
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=indent, default=str)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
 class JsonStateStore:
     """
     Simple JSON persistence so Phase 1 can demo without a DB.
     Later you can replace this with Postgres/Redis.
     """
+    # engine/confirmation tables provided by the store (None -> in-memory)
+    tables: Dict[str, Any] = {}
+
     def __init__(self, path: str | None = None):
         self.path = path or settings.storage_path
 
@@ -19,5 +33,97 @@ class JsonStateStore:
             return json.load(f)
 
     def save(self, state: Dict[str, Any]) -> None:
-        with open(self.path, "w", encoding="utf-8") as f:
-            json.dump(state, f, indent=2, default=str)
\ No newline at end of file
+        _atomic_write_json(self.path, state, indent=2)
+
+    def persist(self, changes: List[Dict[str, Any]], full_state: Callable[[], Dict[str, Any]]) -> None:
+        """Persist after a mutation. The plain JSON store always rewrites everything."""
+        self.save(full_state())
+
+class WalStateStore(JsonStateStore):
+    """
+    Log-structured persistence:
+    - every mutation is appended to <path>.wal as one JSON line
+      ({"op": "upsert"|"delete", "kind": "zone"|"spool"|"printer", "id": ..., "data": ...})
+    - every compact_every log entries a full snapshot is written atomically to <path>
+      and the log is truncated
+    - load() = snapshot + replay of the log tail (a torn last line from a crash is dropped
+      and truncated away, so later appends start on a clean line)
+    Write cost scales with the size of the change, not the size of the inventory.
+    """
+    def __init__(self, path: str | None = None, compact_every: int | None = None, fsync: bool | None = None):
+        super().__init__(path)
+        self.wal_path = f"{self.path}.wal"
+        self.compact_every = max(1, int(compact_every if compact_every is not None else settings.wal_compact_every))
+        self.fsync = bool(settings.wal_fsync if fsync is None else fsync)
+        self.log_entries = 0
+        self._wal = None
+
+    def load(self) -> Dict[str, Any]:
+        state = super().load()
+        tables = {
+            coll: {item[key]: item for item in state.get(coll, [])}
+            for coll, key in _COLLECTIONS.values()
+        }
+
+        self.log_entries = 0
+        if os.path.exists(self.wal_path):
+            good = 0  # byte offset just past the last complete entry
+            with open(self.wal_path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # torn write at the tail
+                    try:
+                        op = json.loads(line)
+                    except ValueError:
+                        break
+                    coll, _ = _COLLECTIONS[op["kind"]]
+                    if op["op"] == "delete":
+                        tables[coll].pop(op["id"], None)
+                    else:
+                        tables[coll][op["id"]] = op["data"]
+                    self.log_entries += 1
+                    good += len(line)
+            # cut the torn tail off, or the next append would be glued onto it
+            if good < os.path.getsize(self.wal_path):
+                with open(self.wal_path, "r+b") as f:
+                    f.truncate(good)
+
+        if not state and not self.log_entries:
+            return {}
+        return {coll: list(items.values()) for coll, items in tables.items()}
+
+    def append(self, changes: List[Dict[str, Any]]) -> None:
+        if not changes:
+            return
+        if self._wal is None:
+            self._wal = open(self.wal_path, "a", encoding="utf-8")
+        self._wal.write("".join(json.dumps(c, separators=(",", ":"), default=str) + "\n" for c in changes))
+        self._wal.flush()
+        if self.fsync:
+            os.fsync(self._wal.fileno())
+        self.log_entries += len(changes)
+
+    def save(self, state: Dict[str, Any]) -> None:
+        """Write a compacted snapshot and reset the log."""
+        _atomic_write_json(self.path, state, indent=None)
+        if self._wal is not None:
+            self._wal.close()
+            self._wal = None
+        with open(self.wal_path, "w", encoding="utf-8"):
+            pass
+        self.log_entries = 0
+
+    def persist(self, changes: List[Dict[str, Any]], full_state: Callable[[], Dict[str, Any]]) -> None:
+        self.append(changes)
+        if self.log_entries >= self.compact_every:
+            self.save(full_state())
+
+def make_state_store() -> JsonStateStore:
+    if settings.storage_backend == "json":
+        return JsonStateStore()
+    if settings.storage_backend == "wal":
+        return WalStateStore()
+    if settings.storage_backend == "sqlite":
+        from backend.services.sqlite_store import SqliteStateStore  # lazy import
+        return SqliteStateStore()
+    raise ValueError(f"Unknown storage_backend: {settings.storage_backend!r}")
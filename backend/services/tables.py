@@ -0,0 +1,201 @@
+from __future__ import annotations
+import base64
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timezone
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+# field -> (low, high), both inclusive, either may be None
+Ranges = Dict[str, Tuple[Any, Any]]
+
+
+def to_utc(dt: datetime) -> datetime:
+    # naive datetimes in this codebase are UTC (datetime.utcnow)
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def encode_cursor(key: str) -> str:
+    return base64.urlsafe_b64encode(key.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        return base64.b64decode(cursor.encode("ascii"), altchars=b"-_", validate=True).decode("utf-8")
+    except (ValueError, UnicodeError) as ex:
+        raise ValueError("invalid cursor") from ex
+
+
+class MemoryTable(dict):
+    """
+    In-memory table: a plain dict keyed by primary key, plus the small query
+    API shared with SqliteTable so the engine works against either backend.
+
+    Fields listed in `indexed` get an inverted index (value -> sorted keys) and
+    fields in `range_indexed` a sorted (value, key) index, kept up to date on
+    every write, so find()/count_by()/page() cost O(matches) or O(page size)
+    instead of a scan. Objects mutated in place must be written back
+    (table[key] = obj) for the indexes to see the change.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, key_field: str, indexed: Iterable[str] = (), range_indexed: Iterable[str] = ()):
+        super().__init__()
+        self.key_field = key_field
+        self._keys: List[str] = []  # all keys, sorted (pagination order)
+        self._index: Dict[str, Dict[Hashable, List[str]]] = {f: {} for f in indexed}
+        self._ranges: Dict[str, List[Tuple[Any, str]]] = {f: [] for f in range_indexed}
+        # key -> indexed values as of the last write (objects can be mutated in place)
+        self._indexed_values: Dict[str, Dict[str, Any]] = {f: {} for f in [*self._index, *self._ranges]}
+
+    # ---------- index maintenance ----------
+    def _unindex(self, key: str) -> None:
+        for field, postings in self._index.items():
+            old = self._indexed_values[field].pop(key, None)
+            keys = postings.get(old)
+            if keys is not None:
+                _remove_sorted(keys, key)
+                if not keys:
+                    del postings[old]
+        for field, entries in self._ranges.items():
+            old = self._indexed_values[field].pop(key, None)
+            if old is not None:
+                _remove_sorted(entries, (old, key))
+
+    def __setitem__(self, key: str, obj: Any) -> None:
+        if key in self:
+            self._unindex(key)
+        else:
+            insort(self._keys, key)
+        super().__setitem__(key, obj)
+        for field, postings in self._index.items():
+            value = _plain(getattr(obj, field, None))
+            self._indexed_values[field][key] = value
+            insort(postings.setdefault(value, []), key)
+        for field, entries in self._ranges.items():
+            value = _sortable(getattr(obj, field, None))
+            if value is not None:
+                self._indexed_values[field][key] = value
+                insort(entries, (value, key))
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self._unindex(key)
+        _remove_sorted(self._keys, key)
+
+    def pop(self, key: str, default: Any = _MISSING) -> Any:
+        if key in self:
+            obj = self[key]
+            del self[key]
+            return obj
+        if default is MemoryTable._MISSING:
+            raise KeyError(key)
+        return default
+
+    def clear(self) -> None:
+        super().clear()
+        self._keys.clear()
+        for postings in self._index.values():
+            postings.clear()
+        for entries in self._ranges.values():
+            entries.clear()
+        for values in self._indexed_values.values():
+            values.clear()
+
+    # ---------- queries ----------
+    def keys_where(self, field: str, value: Any) -> Sequence[str]:
+        """Sorted keys whose indexed `field` equals value."""
+        return self._index[field].get(_plain(value), [])
+
+    def find(self, **filters: Any) -> List[Any]:
+        """Objects whose attributes equal all given filters."""
+        indexed = [f for f in filters if f in self._index]
+        if not indexed:
+            return [obj for obj in self.values() if matches_filters(obj, filters)]
+
+        # start from the smallest posting list, check the rest per object
+        candidates = min((self.keys_where(f, filters[f]) for f in indexed), key=len)
+        return [self[k] for k in candidates if matches_filters(self[k], filters)]
+
+    def count_by(self, field: str) -> Dict[Hashable, int]:
+        """{value: number of objects} for an indexed field."""
+        return {value: len(keys) for value, keys in self._index[field].items()}
+
+    def page(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        ranges: Optional[Ranges] = None,
+        after: Optional[str] = None,
+        limit: Optional[int] = 100,
+    ) -> Tuple[List[Any], Optional[str]]:
+        """
+        Keyset pagination in primary-key order (limit=None returns every match).
+        Returns (items, last_key) where last_key is None when there are no more pages.
+        Iteration is driven by the most selective index available, so a page
+        costs about page size / selectivity rather than the table size.
+        """
+        filters = filters or {}
+        ranges = {f: r for f, r in (ranges or {}).items() if r != (None, None)}
+
+        eq_indexed = [f for f in filters if f in self._index]
+        if eq_indexed:
+            driver: Sequence[str] = min((self.keys_where(f, filters[f]) for f in eq_indexed), key=len)
+        elif any(f in self._ranges for f in ranges):
+            f = next(f for f in ranges if f in self._ranges)
+            driver = sorted(self._range_keys(f, *ranges[f]))
+        else:
+            driver = self._keys
+
+        start = bisect_right(driver, after) if after is not None else 0
+        items: List[Any] = []
+        for i in range(start, len(driver)):
+            obj = self[driver[i]]
+            if not matches_filters(obj, filters) or not _in_ranges(obj, ranges):
+                continue
+            items.append(obj)
+            if limit is not None and len(items) == limit:
+                more = i + 1 < len(driver)
+                return items, (driver[i] if more else None)
+        return items, None
+
+    def _range_keys(self, field: str, low: Any, high: Any) -> List[str]:
+        entries = self._ranges[field]
+        lo = bisect_left(entries, (_sortable(low),)) if low is not None else 0
+        hi = bisect_right(entries, (_sortable(high), "\U0010ffff")) if high is not None else len(entries)
+        return [k for _, k in entries[lo:hi]]
+
+
+def _remove_sorted(items: list, item: Any) -> None:
+    i = bisect_left(items, item)
+    if i < len(items) and items[i] == item:
+        del items[i]
+
+
+def _plain(v: Any) -> Any:
+    return getattr(v, "value", v)
+
+
+def _sortable(v: Any) -> Any:
+    if isinstance(v, datetime):
+        return to_utc(v)
+    return _plain(v)
+
+
+def _in_ranges(obj: Any, ranges: Ranges) -> bool:
+    for field, (low, high) in ranges.items():
+        v = _sortable(getattr(obj, field, None))
+        if v is None:
+            return False
+        if low is not None and v < _sortable(low):
+            return False
+        if high is not None and v > _sortable(high):
+            return False
+    return True
+
+
+def matches_filters(obj: Any, filters: Dict[str, Any]) -> bool:
+    for field, value in filters.items():
+        if _plain(getattr(obj, field, None)) != _plain(value):
+            return False
+    return True
@@ -0,0 +1,292 @@
+"""
+In-process load benchmark for backend.main:app.
+
+Drives the real FastAPI app through httpx.ASGITransport (no server, no network)
+with a mixed workload of CV events, QR scans, confirm/reject and list reads,
+at growing inventory sizes. Reports throughput, p50/p95/p99 per operation and
+the time spent in the state store (persist / full save).
+
+  python -m benchmarks.backend_load --sizes 100,1000,10000 --requests 2000
+  python -m benchmarks.backend_load --save-baseline benchmarks/baselines/backend_load.json
+  python -m benchmarks.backend_load --compare benchmarks/baselines/backend_load.json
+
+State is written to a temporary directory; the real backend_state.* files are not touched.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict, deque
+
+# op name -> weight in the mixed workload
+DEFAULT_MIX = {
+    "cv_event": 30,
+    "qr_scan": 15,
+    "confirm": 10,
+    "reject": 5,
+    "list_spools_page": 15,
+    "list_spools_zone": 10,
+    "list_pending": 10,
+    "occupancy": 5,
+}
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * p / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def summarize(samples_ms):
+    s = sorted(samples_ms)
+    return {
+        "count": len(s),
+        "p50_ms": round(percentile(s, 50), 3),
+        "p95_ms": round(percentile(s, 95), 3),
+        "p99_ms": round(percentile(s, 99), 3),
+        "max_ms": round(s[-1], 3) if s else 0.0,
+    }
+
+
+class StoreTimer:
+    """Wraps STORE.persist / STORE.save on the instance to accumulate their wall time."""
+
+    def __init__(self, store):
+        self.totals = defaultdict(float)
+        self.calls = defaultdict(int)
+        for name in ("persist", "save"):
+            if hasattr(store, name):
+                setattr(store, name, self._wrap(name, getattr(store, name)))
+
+    def _wrap(self, name, fn):
+        def timed(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.totals[name] += time.perf_counter() - t0
+                self.calls[name] += 1
+        return timed
+
+    def take(self):
+        out = {
+            f"{name}_ms": {"calls": self.calls[name], "total": round(self.totals[name] * 1000, 3)}
+            for name in ("persist", "save")
+        }
+        self.totals.clear()
+        self.calls.clear()
+        return out
+
+
+def seed(size, zones_per_100=5):
+    """Top the inventory up to `size` spools spread over size/100*zones_per_100 zones (min 5)."""
+    from backend.api.inventory_routes import ENGINE, WRITER
+    from backend.models.inventory import FilamentSpool, Zone
+
+    n_zones = max(5, size * zones_per_100 // 100)
+    zone_ids = [f"BZ-{i:05d}" for i in range(n_zones)]
+    materials = ["PLA", "PETG", "ABS", "TPU"]
+
+    def command():
+        for zid in zone_ids:
+            if zid not in ENGINE.zones:
+                ENGINE.upsert_zone(Zone(zone_id=zid))
+        for i in range(len(ENGINE.spools), size):
+            ENGINE.upsert_spool(FilamentSpool(
+                spool_id=f"BS-{i:06d}", material=materials[i % len(materials)], zone_id=zone_ids[i % n_zones],
+            ))
+
+    WRITER.call(command)
+    return zone_ids
+
+
+async def run_size(client, size, n_requests, concurrency, mix, rng, timer):
+    zone_ids = seed(size)
+    timer.take()  # don't count seeding
+    spool_ids = [f"BS-{i:06d}" for i in range(size)]
+    pending = deque()
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    ops, weights = zip(*mix.items())
+    plan = rng.choices(ops, weights=weights, k=n_requests)
+
+    async def do(op):
+        if op in ("confirm", "reject") and not pending:
+            op = "cv_event"
+        if op == "cv_event":
+            a, b = rng.sample(zone_ids, 2)
+            hinted = rng.choice(spool_ids) if rng.random() < 0.5 else None
+            req = client.post("/api/events/cv", json={
+                "object_type": "filament_spool", "from_zone": a, "to_zone": b, "hinted_object_id": hinted,
+            })
+        elif op == "qr_scan":
+            req = client.post("/api/events/qr", json={
+                "scanned_id": rng.choice(spool_ids), "scanned_type": "filament_spool", "context_zone": rng.choice(zone_ids),
+            })
+        elif op in ("confirm", "reject"):
+            req = client.post(f"/api/confirmations/{pending.popleft()}/{op}", json={
+                "resolved_by": "bench", "object_id": rng.choice(spool_ids),
+            })
+        elif op == "list_spools_page":
+            req = client.get("/api/spools", params={"limit": 100})
+        elif op == "list_spools_zone":
+            req = client.get("/api/spools", params={"zone_id": rng.choice(zone_ids)})
+        elif op == "list_pending":
+            req = client.get("/api/confirmations/pending")
+        else:
+            req = client.get("/api/zones/occupancy")
+
+        t0 = time.perf_counter()
+        r = await req
+        latencies[op].append((time.perf_counter() - t0) * 1000)
+        if r.status_code >= 400:
+            errors[op] += 1
+        elif op == "cv_event":
+            pending.append(r.json()["pending_id"])
+
+    queue = deque(plan)
+
+    async def worker():
+        while queue:
+            await do(queue.popleft())
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+
+    all_ms = [v for vs in latencies.values() for v in vs]
+    return {
+        "inventory_size": size,
+        "requests": n_requests,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(n_requests / elapsed, 1),
+        "overall": summarize(all_ms),
+        "ops": {op: summarize(v) for op, v in sorted(latencies.items())},
+        "errors": dict(errors),
+        "store": timer.take(),
+    }
+
+
+async def run(sizes, n_requests, concurrency, mix, seed_value):
+    import httpx
+    from backend.main import app
+    from backend.api.inventory_routes import STORE, WRITER
+
+    timer = StoreTimer(STORE)
+    rng = random.Random(seed_value)
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for size in sorted(sizes):
+            res = await run_size(client, size, n_requests, concurrency, mix, rng, timer)
+            print_result(res)
+            results.append(res)
+    WRITER.stop()
+    return results
+
+
+def print_result(res):
+    o = res["overall"]
+    print(f"\n== inventory={res['inventory_size']} requests={res['requests']} concurrency={res['concurrency']}")
+    print(f"throughput: {res['throughput_rps']} req/s   p50={o['p50_ms']}ms p95={o['p95_ms']}ms p99={o['p99_ms']}ms")
+    for op, s in res["ops"].items():
+        print(f"  {op:<18} n={s['count']:<5} p50={s['p50_ms']:>8.3f} p95={s['p95_ms']:>8.3f} p99={s['p99_ms']:>8.3f}")
+    st = res["store"]
+    print(f"  store.persist: {st['persist_ms']['calls']} calls, {st['persist_ms']['total']}ms   "
+          f"store.save (full write): {st['save_ms']['calls']} calls, {st['save_ms']['total']}ms")
+    if res["errors"]:
+        print(f"  errors: {res['errors']}")
+
+
+def compare(results, baseline, tolerance, min_op_samples=100):
+    """
+    Return a list of regressions vs baseline, by more than tolerance: throughput
+    down, overall p95 up, or per-op p50 up. Per-op tails are too noisy to gate on;
+    ops with fewer than min_op_samples samples are skipped.
+    """
+    base = {r["inventory_size"]: r for r in baseline["results"]}
+    problems = []
+    for r in results:
+        b = base.get(r["inventory_size"])
+        if b is None:
+            continue
+        if r["throughput_rps"] < b["throughput_rps"] * (1 - tolerance):
+            problems.append(f"size={r['inventory_size']}: throughput {r['throughput_rps']} < baseline {b['throughput_rps']}")
+        if r["overall"]["p95_ms"] > b["overall"]["p95_ms"] * (1 + tolerance):
+            problems.append(f"size={r['inventory_size']}: p95 {r['overall']['p95_ms']}ms > baseline {b['overall']['p95_ms']}ms")
+        for op, s in r["ops"].items():
+            bs = b["ops"].get(op)
+            if not bs or min(s["count"], bs["count"]) < min_op_samples:
+                continue
+            if s["p50_ms"] > bs["p50_ms"] * (1 + tolerance):
+                problems.append(f"size={r['inventory_size']} {op}: p50 {s['p50_ms']}ms > baseline {bs['p50_ms']}ms")
+    return problems
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", default="100,1000,10000", help="comma-separated inventory sizes (spools)")
+    ap.add_argument("--requests", type=int, default=2000, help="requests per size")
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--storage", choices=["json", "wal", "sqlite"], default="wal")
+    ap.add_argument("--mix", default=None, help='JSON op weights, e.g. \'{"cv_event": 1, "qr_scan": 1}\'')
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--save-baseline", default=None, help="write results JSON here")
+    ap.add_argument("--compare", default=None, help="baseline JSON to compare against; exit 1 on regression")
+    ap.add_argument("--tolerance", type=float, default=0.5, help="allowed relative regression for --compare")
+    args = ap.parse_args(argv)
+
+    # Settings are read at import time, so configure storage before importing the app
+    tmp = tempfile.mkdtemp(prefix="inv-bench-")
+    os.environ["INV_STORAGE_BACKEND"] = args.storage
+    os.environ["INV_STORAGE_PATH"] = os.path.join(tmp, "state.json")
+    os.environ["INV_SQLITE_PATH"] = os.path.join(tmp, "state.db")
+
+    mix = dict(DEFAULT_MIX)
+    if args.mix:
+        mix = {k: float(v) for k, v in json.loads(args.mix).items()}
+        unknown = set(mix) - set(DEFAULT_MIX)
+        if unknown:
+            ap.error(f"unknown ops in --mix: {sorted(unknown)}")
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    results = asyncio.run(run(sizes, args.requests, args.concurrency, mix, args.seed))
+
+    report = {
+        "benchmark": "backend_load",
+        "storage": args.storage,
+        "mix": mix,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.save_baseline) or ".", exist_ok=True)
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved baseline -> {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        problems = compare(results, baseline, args.tolerance)
+        if problems:
+            print("\nREGRESSIONS:")
+            for p in problems:
+                print("  " + p)
+            return 1
+        print(f"\nNo regressions vs {args.compare} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""
+Headless CVPipeline throughput benchmark (CPU only, no camera, no YOLO).
+
+A StubDetector replays a SyntheticScene of N boxes bouncing across the frame
+(and so across the zones in config/zones.json); frames are either rendered from
+the scene or read from a video file. Every frame goes through CVPipeline.step
+and the per-stage timings it reports (gate, detect, zones, track, flow, qr, draw, state,
+publish) are aggregated per scene size.
+
+  python -m benchmarks.cv_pipeline --objects 5,50,200,500 --frames 100
+  python -m benchmarks.cv_pipeline --no-qr          # QR ROI decode dominates at large scene sizes
+  python -m benchmarks.cv_pipeline --video shift.mp4 --objects 50 --out cv_bench.json
+  python -m benchmarks.cv_pipeline --objects 20 --detect-cost-ms 40 --motion-duty 0.1 --motion-gate on
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from collections import defaultdict
+
+import cv2
+
+from benchmarks.backend_load import summarize
+from cv.detectors.stub_detector import StubDetector, SyntheticScene, stub_pipeline
+from cv.events.event_sink import MemoryEventSink
+from cv.tracking.flow_propagator import FlowPropagator
+
+STAGES = ["gate", "detect", "zones", "track", "flow", "qr", "draw", "state", "publish"]
+
+
+def video_frames(path, size):
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise SystemExit(f"cannot open video: {path}")
+    try:
+        while True:
+            ok, frame = cap.read()
+            if not ok:
+                # loop short clips so every scene size sees the same frame count
+                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                ok, frame = cap.read()
+                if not ok:
+                    return
+            if (frame.shape[1], frame.shape[0]) != size:
+                frame = cv2.resize(frame, size)
+            yield frame
+    finally:
+        cap.release()
+
+
+def run_scene(n_objects, args):
+    size = (args.width, args.height)
+    scene = SyntheticScene(frame_size=size, n_objects=n_objects, seed=args.seed)
+    pipeline = stub_pipeline(scene, detector=StubDetector(scene, cost_ms=args.detect_cost_ms),
+                             publisher=MemoryEventSink(keep=False), config=args.config, zones=args.zones,
+                             process_every_n=args.every_n, qr=not args.no_qr)
+    if args.motion_gate != "config":
+        pipeline.motion_gate_enabled = args.motion_gate == "on"
+    if args.flow != "config":
+        pipeline.flow = FlowPropagator() if args.flow == "on" else None
+    # objects move during the first motion_duty share of every 100-frame period
+    moving_frames = int(round(100 * args.motion_duty))
+
+    frames = video_frames(args.video, size) if args.video else None
+    stage_ms = defaultdict(list)
+    step_ms = []
+    n_events = 0
+    n_gated = 0
+    fps = 30.0
+
+    t_start = time.perf_counter()
+    cpu_start = time.process_time()
+    for i in range(args.warmup + args.frames):
+        if i % 100 < moving_frames:
+            scene.advance()
+        frame = next(frames) if frames is not None else scene.render()
+        t0 = time.perf_counter()
+        _, debug = pipeline.step(frame, ts=i / fps)
+        dt = (time.perf_counter() - t0) * 1000
+        if i < args.warmup:
+            cpu_start = time.process_time()
+            continue
+        n_gated += bool(debug.get("gated"))
+        step_ms.append(dt)
+        for stage, ms in debug["timings"].items():
+            stage_ms[stage].append(ms)
+        n_events += len(debug["enters"]) + len(debug["exits"]) + len(debug["transfers"]) + len(debug["residual"])
+    wall = time.perf_counter() - t_start
+    cpu = time.process_time() - cpu_start
+    pipeline.close()
+
+    return {
+        "objects": n_objects,
+        "frames": args.frames,
+        "fps": round(len(step_ms) / (sum(step_ms) / 1000), 1) if step_ms else 0.0,
+        "wall_s": round(wall, 3),
+        "cpu_ms_per_frame": round(cpu * 1000 / max(1, len(step_ms)), 3),
+        "gated_frames": n_gated,
+        "step": summarize(step_ms),
+        "stages": {s: {**summarize(stage_ms[s]), "mean_ms": round(sum(stage_ms[s]) / max(1, len(stage_ms[s])), 3)}
+                   for s in STAGES if s in stage_ms},
+        "events": n_events,
+        "published": pipeline.publisher.count,
+    }
+
+
+def print_result(res):
+    st = res["step"]
+    print(f"\n== objects={res['objects']} frames={res['frames']}: {res['fps']} fps (step p50={st['p50_ms']}ms "
+          f"p95={st['p95_ms']}ms p99={st['p99_ms']}ms), cpu={res['cpu_ms_per_frame']}ms/frame, "
+          f"gated={res['gated_frames']}, events={res['events']}")
+    for stage, s in res["stages"].items():
+        print(f"  {stage:<8} mean={s['mean_ms']:>8.3f} p50={s['p50_ms']:>8.3f} p95={s['p95_ms']:>8.3f} p99={s['p99_ms']:>8.3f}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--objects", default="5,50,200,500", help="comma-separated scene sizes")
+    ap.add_argument("--frames", type=int, default=100, help="measured frames per scene size")
+    ap.add_argument("--warmup", type=int, default=20)
+    ap.add_argument("--video", default=None, help="read frames from this file instead of rendering the scene")
+    ap.add_argument("--width", type=int, default=1280)
+    ap.add_argument("--height", type=int, default=720)
+    ap.add_argument("--every-n", type=int, default=1, help="process_every_n_frames override (config default is 2)")
+    ap.add_argument("--no-qr", action="store_true", help="disable QR decode")
+    ap.add_argument("--detect-cost-ms", type=float, default=0.0, help="CPU the stub detector burns per call")
+    ap.add_argument("--motion-duty", type=float, default=1.0, help="share of frames in which objects move (0..1)")
+    ap.add_argument("--motion-gate", choices=["config", "on", "off"], default="config")
+    ap.add_argument("--flow", choices=["config", "on", "off"], default="config", help="optical-flow box propagation")
+    ap.add_argument("--config", default="config/cv.yaml")
+    ap.add_argument("--zones", default="config/zones.json")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", default=None, help="write results JSON here")
+    args = ap.parse_args(argv)
+
+    results = []
+    for n in [int(s) for s in args.objects.split(",") if s.strip()]:
+        res = run_scene(n, args)
+        print_result(res)
+        results.append(res)
+
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({
+                "benchmark": "cv_pipeline",
+                "video": args.video,
+                "frame_size": [args.width, args.height],
+                "python": platform.python_version(),
+                "opencv": cv2.__version__,
+                "results": results,
+            }, f, indent=2)
+        print(f"\nSaved -> {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+Detector latency per inference backend (torch / onnxruntime / openvino).
+
+Builds each backend from the `yolo` section of cv.yaml (model paths, int8,
+threads) and times detect() on single frames and detect_batch() on batches.
+Backends whose package or model file is missing are reported and skipped.
+
+  python -m benchmarks.detector_backends
+  python -m benchmarks.detector_backends --backends onnxruntime,openvino --int8 --batch 4
+  python -m benchmarks.detector_backends --video shift.mp4 --out detector_bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import cv2
+import yaml
+
+from benchmarks.backend_load import summarize
+from benchmarks.cv_pipeline import video_frames
+from cv.detectors.factory import BACKENDS, build_detector, model_path_for
+from cv.detectors.stub_detector import SyntheticScene
+
+
+def time_backend(backend, frames, args, yolo_cfg):
+    try:
+        t0 = time.perf_counter()
+        detector = build_detector(yolo_cfg, backend=backend)
+        load_s = time.perf_counter() - t0
+    except (ImportError, OSError) as ex:
+        return {"backend": backend, "error": f"{type(ex).__name__}: {ex}"}
+
+    for f in frames[:args.warmup]:
+        detector.detect(f)
+
+    single, n_dets = [], 0
+    for f in frames:
+        t0 = time.perf_counter()
+        n_dets += len(detector.detect(f))
+        single.append((time.perf_counter() - t0) * 1000)
+
+    batched = []
+    if args.batch > 1:
+        for i in range(0, len(frames) - args.batch + 1, args.batch):
+            t0 = time.perf_counter()
+            detector.detect_batch(frames[i:i + args.batch])
+            batched.append((time.perf_counter() - t0) * 1000 / args.batch)
+
+    return {
+        "backend": backend,
+        "model": model_path_for(yolo_cfg, backend),
+        "load_s": round(load_s, 3),
+        "detect": summarize(single),
+        "fps": round(len(single) / (sum(single) / 1000), 1) if single else 0.0,
+        f"detect_batch{args.batch}_per_frame": summarize(batched) if batched else None,
+        "detections": n_dets,
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--backends", default=",".join(BACKENDS))
+    ap.add_argument("--frames", type=int, default=50)
+    ap.add_argument("--warmup", type=int, default=5)
+    ap.add_argument("--batch", type=int, default=4, help="also time detect_batch with this many frames (1 = off)")
+    ap.add_argument("--int8", action="store_true", help="use the *_int8_model paths")
+    ap.add_argument("--video", default=None, help="frames from this file instead of a synthetic scene")
+    ap.add_argument("--width", type=int, default=1280)
+    ap.add_argument("--height", type=int, default=720)
+    ap.add_argument("--config", default="config/cv.yaml")
+    ap.add_argument("--out", default=None, help="write results JSON here")
+    args = ap.parse_args(argv)
+
+    with open(args.config, "r", encoding="utf-8") as f:
+        yolo_cfg = dict(yaml.safe_load(f)["yolo"])
+    if args.int8:
+        yolo_cfg["int8"] = True
+
+    size = (args.width, args.height)
+    if args.video:
+        gen = video_frames(args.video, size)
+        frames = [next(gen) for _ in range(args.frames)]
+    else:
+        scene = SyntheticScene(frame_size=size, n_objects=10)
+        frames = []
+        for _ in range(args.frames):
+            scene.advance()
+            frames.append(scene.render())
+
+    results = []
+    for backend in [b.strip() for b in args.backends.split(",") if b.strip()]:
+        res = time_backend(backend, frames, args, yolo_cfg)
+        results.append(res)
+        if "error" in res:
+            print(f"== {backend}: unavailable ({res['error']})")
+            continue
+        d = res["detect"]
+        line = f"== {backend} ({res['model']}): {res['fps']} fps, detect p50={d['p50_ms']}ms p95={d['p95_ms']}ms"
+        b = res.get(f"detect_batch{args.batch}_per_frame")
+        if b:
+            line += f", batch{args.batch} p50={b['p50_ms']}ms/frame"
+        print(line)
+
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({
+                "benchmark": "detector_backends",
+                "int8": bool(yolo_cfg.get("int8")),
+                "frame_size": list(size),
+                "python": platform.python_version(),
+                "opencv": cv2.__version__,
+                "results": results,
+            }, f, indent=2)
+        print(f"\nSaved -> {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
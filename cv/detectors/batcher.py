@@ -0,0 +1,85 @@
+import threading
+import time
+from concurrent.futures import Future
+from collections import deque
+
+
+class DetectionBatcher:
+    """
+    Collects frames from several producers (e.g. one thread per camera)
+    and runs them through detector.detect_batch together.
+
+    A batch is flushed when it reaches max_batch_size frames, or when the
+    oldest queued frame has waited max_wait_ms.
+
+    Usage:
+      batcher = DetectionBatcher(detector, max_batch_size=8, max_wait_ms=10)
+      # or build_batcher(detector, cfg["yolo"]) from cv.detectors.factory
+      dets = batcher.submit(frame).result()
+    """
+    def __init__(self, detector, max_batch_size: int = 8, max_wait_ms: float = 10.0):
+        self.detector = detector
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+
+        self._queue = deque()  # (enqueued_at, frame, future)
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="detection-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, frame_bgr) -> Future:
+        fut = Future()
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError("DetectionBatcher is stopped")
+            self._queue.append((time.monotonic(), frame_bgr, fut))
+            self._cond.notify()
+        return fut
+
+    def detect(self, frame_bgr):
+        """Blocking drop-in for YOLODetector.detect."""
+        return self.submit(frame_bgr).result()
+
+    def close(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._thread.join()
+
+    def _next_batch(self):
+        with self._cond:
+            while not self._queue and not self._stopped:
+                self._cond.wait()
+            if not self._queue:
+                return []
+            # wait until full, or until the oldest frame's deadline
+            deadline = self._queue[0][0] + self.max_wait
+            while len(self._queue) < self.max_batch_size and not self._stopped:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            n = min(len(self._queue), self.max_batch_size)
+            return [self._queue.popleft() for _ in range(n)]
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+            # a caller may have cancelled while queued (e.g. on a timeout): skip those frames
+            batch = [item for item in batch if item[2].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            futures = [fut for _, _, fut in batch]
+            try:
+                results = self.detector.detect_batch([frame for _, frame, _ in batch])
+                if len(results) != len(futures):
+                    raise RuntimeError(f"detect_batch returned {len(results)} results for {len(futures)} frames")
+            except Exception as ex:
+                for fut in futures:
+                    fut.set_exception(ex)
+                continue
+            for fut, dets in zip(futures, results):
+                fut.set_result(dets)
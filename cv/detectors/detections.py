@@ -0,0 +1,119 @@
+import numpy as np
+
+_NO_ZONES = np.array([None], dtype=object)
+
+
+class Detections:
+    """
+    Column-oriented detections for one frame:
+      boxes     (N, 4) xyxy, frame pixels (int from the detectors)
+      conf      (N,) float32
+      class_id  (N,) int, index into `names` (the label table)
+      zone_idx  (N,) int, index into `zone_ids` (0 = no zone / not assigned)
+    Indexing with a bool mask or index array returns a new Detections, so
+    filters are one vectorized expression: dets[dets.conf >= 0.35].
+    Dict lists ({label, conf, bbox[, zone_id]}) are only for the edges:
+    from_dicts() / to_dicts().
+    """
+    __slots__ = ("boxes", "conf", "class_id", "names", "zone_idx", "zone_ids")
+
+    def __init__(self, boxes, conf, class_id, names, zone_idx=None, zone_ids=None):
+        self.boxes = np.asarray(boxes).reshape(-1, 4)
+        self.conf = np.asarray(conf, dtype=np.float32).reshape(-1)
+        self.class_id = np.asarray(class_id, dtype=np.int64).reshape(-1)
+        self.names = names  # {class_id: label}
+        self.zone_idx = np.zeros(len(self.conf), dtype=np.int64) if zone_idx is None else np.asarray(zone_idx)
+        self.zone_ids = _NO_ZONES if zone_ids is None else zone_ids
+
+    @classmethod
+    def empty(cls, names=None):
+        return cls(np.zeros((0, 4), dtype=np.int64), [], [], names or {})
+
+    @classmethod
+    def from_dicts(cls, dets):
+        names, lookup, class_id = {}, {}, []
+        for d in dets:
+            label = d["label"]
+            if label not in lookup:
+                lookup[label] = len(lookup)
+                names[lookup[label]] = label
+            class_id.append(lookup[label])
+        boxes = np.asarray([d["bbox"] for d in dets]) if dets else np.zeros((0, 4), dtype=np.int64)
+        out = cls(boxes, [d["conf"] for d in dets], class_id, names)
+        if any("zone_id" in d for d in dets):
+            zone_ids = [None] + sorted({d["zone_id"] for d in dets if d.get("zone_id") is not None})
+            index = {z: i for i, z in enumerate(zone_ids)}
+            out.zone_ids = np.array(zone_ids, dtype=object)
+            out.zone_idx = np.asarray([index[d.get("zone_id")] for d in dets], dtype=np.int64)
+        return out
+
+    @classmethod
+    def coerce(cls, dets):
+        """Detections as-is; a dict list (older/custom detectors) is converted."""
+        return dets if isinstance(dets, cls) else cls.from_dicts(list(dets))
+
+    @classmethod
+    def concat(cls, parts):
+        """Join Detections from one detector (same label table), e.g. several crops of one frame."""
+        parts = [p for p in parts if len(p)]
+        if not parts:
+            return cls.empty()
+        if len(parts) == 1:
+            return parts[0]
+        return cls(np.concatenate([p.boxes for p in parts]), np.concatenate([p.conf for p in parts]),
+                   np.concatenate([p.class_id for p in parts]), parts[0].names)
+
+    def __len__(self):
+        return len(self.conf)
+
+    def __getitem__(self, idx):
+        return Detections(self.boxes[idx], self.conf[idx], self.class_id[idx], self.names,
+                          self.zone_idx[idx], self.zone_ids)
+
+    def __repr__(self):
+        return f"Detections(n={len(self)}, labels={sorted(set(self.label_list()))})"
+
+    # ---------- columns ----------
+    @property
+    def labels(self):
+        """(N,) object array of label strings."""
+        if not len(self):
+            return np.empty(0, dtype=object)
+        table = np.array([self.names.get(i, str(i)) for i in range(int(self.class_id.max()) + 1)], dtype=object)
+        return table[self.class_id]
+
+    def label_list(self):
+        return self.labels.tolist()
+
+    def zone_id_list(self):
+        return self.zone_ids[self.zone_idx].tolist()
+
+    def centers(self):
+        """Integer bbox centres as (N, 2), matching zone_mapper.bbox_center."""
+        b = self.boxes
+        return np.stack([(b[:, 0] + b[:, 2]) // 2, (b[:, 1] + b[:, 3]) // 2], axis=1)
+
+    # ---------- vectorized ops ----------
+    def label_mask(self, labels):
+        """Bool mask of detections whose label is in `labels`."""
+        ids = [i for i, n in self.names.items() if n in labels]
+        return np.isin(self.class_id, ids)
+
+    def with_zones(self, zone_idx, zone_ids):
+        out = self[:]
+        out.zone_idx = np.asarray(zone_idx, dtype=np.int64)
+        out.zone_ids = zone_ids
+        return out
+
+    def shifted(self, dx, dy):
+        """Boxes moved by (dx, dy), e.g. from crop to frame pixels."""
+        out = self[:]
+        out.boxes = self.boxes + np.array([dx, dy, dx, dy], dtype=self.boxes.dtype)
+        return out
+
+    def to_dicts(self):
+        """[{label, conf, bbox[, zone_id]}] as detectors used to return."""
+        rows = zip(self.label_list(), self.conf.tolist(), self.boxes.tolist())
+        if self.zone_ids is _NO_ZONES:
+            return [{"label": l, "conf": c, "bbox": b} for l, c, b in rows]
+        return [{"label": l, "conf": c, "bbox": b, "zone_id": z} for (l, c, b), z in zip(rows, self.zone_id_list())]
@@ -0,0 +1,114 @@
+import abc
+import glob
+import os
+
+import numpy as np
+import yaml
+
+from cv.detectors.yolo_ops import decode_yolov8, parse_names, to_blob
+
+
+class ExportedYOLODetector(abc.ABC):
+    """
+    YOLOv8 detector on an exported model (no ultralytics/torch at runtime).
+    Preprocessing (letterbox, NCHW float blob) and postprocessing (decode +
+    class-aware NMS) are done here in numpy/OpenCV; subclasses only run the
+    forward pass. Returns Detections, like YOLODetector.detect / detect_batch.
+    """
+    backend = None
+
+    def __init__(self, conf=0.25, iou=0.45, imgsz=640, max_batch_size=8, names=None, max_det=300):
+        self.conf = float(conf)
+        self.iou = float(iou)
+        self.imgsz = int(imgsz)
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_det = int(max_det)
+        self.names = names or {}
+        self.fixed_batch = None  # set by subclasses when the model has a static batch dim
+
+    @abc.abstractmethod
+    def _forward(self, blob):
+        """Raw head output (N, 4 + nc, anchors) for an NCHW float32 blob."""
+
+    def detect(self, frame_bgr):
+        return self.detect_batch([frame_bgr])[0]
+
+    def detect_batch(self, frames):
+        frames = list(frames)
+        chunk = self.fixed_batch or self.max_batch_size
+        out = []
+        for i in range(0, len(frames), chunk):
+            part = frames[i:i + chunk]
+            blob, meta = to_blob(part, self.imgsz)
+            if self.fixed_batch and len(part) < self.fixed_batch:
+                # static-batch export: pad the last chunk, drop the padded outputs
+                pad = np.zeros((self.fixed_batch - len(part),) + blob.shape[1:], dtype=blob.dtype)
+                blob = np.concatenate([blob, pad])
+            raw = self._forward(blob)[:len(part)]
+            out.extend(decode_yolov8(raw, meta, [f.shape[:2] for f in part], self.names,
+                                     conf=self.conf, iou=self.iou, max_det=self.max_det))
+        return out
+
+
+def _static(dim):
+    return dim if isinstance(dim, int) and dim > 0 else None
+
+
+class OnnxRuntimeDetector(ExportedYOLODetector):
+    """`yolo export format=onnx` model on onnxruntime (CPU provider by default)."""
+    backend = "onnxruntime"
+
+    def __init__(self, model_path, conf=0.25, iou=0.45, imgsz=640, max_batch_size=8, threads=0, providers=None):
+        import onnxruntime as ort  # lazy import (optional dependency)
+
+        so = ort.SessionOptions()
+        so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            so.intra_op_num_threads = int(threads)
+        self.session = ort.InferenceSession(model_path, so, providers=providers or ["CPUExecutionProvider"])
+        inp = self.session.get_inputs()[0]
+        self.input_name = inp.name
+
+        names = parse_names(self.session.get_modelmeta().custom_metadata_map.get("names"))
+        imgsz = _static(inp.shape[2]) or imgsz
+        super().__init__(conf=conf, iou=iou, imgsz=imgsz, max_batch_size=max_batch_size, names=names)
+        self.fixed_batch = _static(inp.shape[0])
+
+    def _forward(self, blob):
+        return self.session.run(None, {self.input_name: blob})[0]
+
+
+class OpenVINODetector(ExportedYOLODetector):
+    """`yolo export format=openvino` model (directory or .xml) on the OpenVINO CPU plugin."""
+    backend = "openvino"
+
+    def __init__(self, model_path, conf=0.25, iou=0.45, imgsz=640, max_batch_size=8, threads=0, device="CPU"):
+        import openvino as ov  # lazy import (optional dependency)
+
+        if os.path.isdir(model_path):
+            xmls = sorted(glob.glob(os.path.join(model_path, "*.xml")))
+            if not xmls:
+                raise FileNotFoundError(f"no .xml model in {model_path}")
+            model_path = xmls[0]
+        names = {}
+        meta_path = os.path.join(os.path.dirname(model_path), "metadata.yaml")
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                names = parse_names((yaml.safe_load(f) or {}).get("names"))
+
+        core = ov.Core()
+        model = core.read_model(model_path)
+        config = {"PERFORMANCE_HINT": "LATENCY"}
+        if threads:
+            config["INFERENCE_NUM_THREADS"] = int(threads)
+        self.compiled = core.compile_model(model, device, config)
+        self.output = self.compiled.output(0)
+
+        shape = self.compiled.input(0).get_partial_shape()
+        batch = shape[0].get_length() if shape[0].is_static else None
+        size = shape[2].get_length() if shape[2].is_static else None
+        super().__init__(conf=conf, iou=iou, imgsz=size or imgsz, max_batch_size=max_batch_size, names=names)
+        self.fixed_batch = batch
+
+    def _forward(self, blob):
+        return self.compiled(blob)[self.output]
@@ -0,0 +1,48 @@
+BACKENDS = ("torch", "onnxruntime", "openvino")
+
+
+def model_path_for(yolo_cfg, backend=None):
+    """Model file for a backend: yolo.<backend>_model (int8_model when yolo.int8), else yolo.model."""
+    backend = backend or str(yolo_cfg.get("backend", "torch"))
+    if backend != "torch" and yolo_cfg.get("int8") and yolo_cfg.get(f"{backend}_int8_model"):
+        return yolo_cfg[f"{backend}_int8_model"]
+    return yolo_cfg.get(f"{backend}_model") or yolo_cfg["model"]
+
+
+def build_detector(yolo_cfg, backend=None):
+    """
+    Detector for the `yolo` section of cv.yaml. backend (default yolo.backend):
+      torch        ultralytics YOLO (.pt)
+      onnxruntime  exported .onnx on onnxruntime
+      openvino     exported OpenVINO IR (dir or .xml)
+    Each backend's package is only imported when selected.
+    """
+    backend = backend or str(yolo_cfg.get("backend", "torch"))
+    common = dict(
+        conf=float(yolo_cfg["conf"]),
+        iou=float(yolo_cfg["iou"]),
+        imgsz=int(yolo_cfg.get("imgsz", 640)),
+        max_batch_size=int(yolo_cfg.get("max_batch_size", 8)),
+    )
+    path = model_path_for(yolo_cfg, backend)
+
+    if backend == "torch":
+        from cv.detectors.yolo_detector import YOLODetector  # lazy import (pulls in ultralytics/torch)
+        return YOLODetector(model_path=path, device=str(yolo_cfg["device"]), **common)
+    if backend == "onnxruntime":
+        from cv.detectors.exported_detector import OnnxRuntimeDetector  # lazy import
+        return OnnxRuntimeDetector(path, threads=int(yolo_cfg.get("threads", 0)), **common)
+    if backend == "openvino":
+        from cv.detectors.exported_detector import OpenVINODetector  # lazy import
+        return OpenVINODetector(path, threads=int(yolo_cfg.get("threads", 0)), **common)
+    raise ValueError(f"unknown yolo.backend {backend!r} (expected one of {', '.join(BACKENDS)})")
+
+
+def build_batcher(detector, yolo_cfg):
+    """DetectionBatcher over detector, sized by yolo.max_batch_size / yolo.max_batch_wait_ms."""
+    from cv.detectors.batcher import DetectionBatcher  # lazy import
+    return DetectionBatcher(
+        detector,
+        max_batch_size=int(yolo_cfg.get("max_batch_size", 8)),
+        max_wait_ms=float(yolo_cfg.get("max_batch_wait_ms", 10)),
+    )
@@ -0,0 +1,102 @@
+import time
+
+import numpy as np
+import cv2
+
+from cv.detectors.detections import Detections
+
+
+class SyntheticScene:
+    """
+    Scripted scene for headless benchmarks/tests: n objects moving in straight
+    lines and bouncing off the frame edges, so they keep crossing zones.
+    advance() moves everything one frame; render() draws the objects on a flat
+    background; detections() returns them in the detector schema.
+    """
+
+    def __init__(self, frame_size=(1280, 720), n_objects=10, box_size=(40, 60), speed_px=(2.0, 12.0),
+                 label="book", seed=0):
+        self.w, self.h = int(frame_size[0]), int(frame_size[1])
+        self.n = int(n_objects)
+        self.label = label
+        rng = np.random.default_rng(seed)
+
+        sizes = rng.uniform(box_size[0], box_size[1], size=(self.n, 2))
+        self.size = sizes.astype(np.float32)
+        self.pos = np.column_stack([
+            rng.uniform(0, self.w - sizes[:, 0]),
+            rng.uniform(0, self.h - sizes[:, 1]),
+        ]).astype(np.float32)
+        angle = rng.uniform(0, 2 * np.pi, size=self.n)
+        speed = rng.uniform(speed_px[0], speed_px[1], size=self.n)
+        self.vel = np.column_stack([np.cos(angle) * speed, np.sin(angle) * speed]).astype(np.float32)
+        self.conf = rng.uniform(0.5, 0.95, size=self.n).astype(np.float32)
+
+        self._background = np.full((self.h, self.w, 3), 90, dtype=np.uint8)
+        self.frame_i = 0
+
+    def advance(self):
+        self.pos += self.vel
+        limit = np.array([self.w, self.h], dtype=np.float32) - self.size
+        low, high = self.pos < 0, self.pos > limit
+        self.vel[low | high] *= -1
+        self.pos = np.clip(self.pos, 0, limit)
+        self.frame_i += 1
+
+    def boxes(self):
+        xy1 = self.pos.astype(np.int32)
+        xy2 = (self.pos + self.size).astype(np.int32)
+        return np.hstack([xy1, xy2])
+
+    def detections(self):
+        return [
+            {"label": self.label, "conf": float(c), "bbox": b}
+            for b, c in zip(self.boxes().tolist(), self.conf.tolist())
+        ]
+
+    def render(self):
+        frame = self._background.copy()
+        for x1, y1, x2, y2 in self.boxes().tolist():
+            cv2.rectangle(frame, (x1, y1), (x2, y2), (40, 160, 220), -1)
+        return frame
+
+
+class StubDetector:
+    """
+    Drop-in for YOLODetector (detect / detect_batch) that returns the current
+    detections of a SyntheticScene, ignoring the frame content. No model, no GPU.
+    cost_ms: burn this much CPU per call to stand in for real inference cost.
+    """
+
+    def __init__(self, scene, cost_ms=0.0):
+        self.scene = scene
+        self.cost_ms = float(cost_ms)
+
+    def detect(self, frame_bgr):
+        if self.cost_ms > 0:
+            end = time.perf_counter() + self.cost_ms / 1000.0
+            while time.perf_counter() < end:
+                pass
+        s = self.scene
+        return Detections(s.boxes(), s.conf, np.zeros(s.n, dtype=np.int64), {0: s.label})
+
+    def detect_batch(self, frames):
+        return [self.detect(f) for f in frames]
+
+
+def stub_pipeline(scene, detector=None, publisher=None, config="config/cv.yaml", zones="config/zones.json",
+                  process_every_n=1, qr=False):
+    """
+    CVPipeline on a SyntheticScene for headless tests and benchmarks: StubDetector
+    (unless detector is given), in-memory events (MemoryEventSink unless publisher
+    is given), detection on every process_every_n-th frame (None keeps the config
+    value), QR decode off by default.
+    """
+    from cv.events.event_sink import MemoryEventSink  # lazy import
+    from cv.pipeline import CVPipeline  # lazy import (the pipeline imports this package)
+    pipeline = CVPipeline(config, zones, detector=detector or StubDetector(scene),
+                          publisher=publisher if publisher is not None else MemoryEventSink())
+    if process_every_n is not None:
+        pipeline.process_every_n = int(process_every_n)
+    pipeline.qr_enabled = bool(qr)
+    return pipeline
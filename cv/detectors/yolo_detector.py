@@ -1,39 +1,63 @@
+import numpy as np
 from ultralytics import YOLO
 
+from cv.detectors.detections import Detections
+
 class YOLODetector:
-    def __init__(self, model_path: str, conf: float, iou: float, device: str):
+    def __init__(
+        self,
+        model_path: str,
+        conf: float,
+        iou: float,
+        device: str,
+        imgsz: int = 640,
+        max_batch_size: int = 8,
+    ):
         self.model = YOLO(model_path)
         self.conf = conf
         self.iou = iou
         self.device = device
+        self.imgsz = int(imgsz)
+        self.max_batch_size = max(1, int(max_batch_size))
 
     def detect(self, frame_bgr):
         """
-        Returns list of detections:
-          { 'label': str, 'conf': float, 'bbox': [x1,y1,x2,y2] }
+        Returns Detections (boxes [x1,y1,x2,y2], conf, class_id + label table);
+        .to_dicts() gives the old [{ 'label', 'conf', 'bbox' }] list.
         """
-        results = self.model.predict(
-            source=frame_bgr,
-            conf=self.conf,
-            iou=self.iou,
-            device=self.device,
-            # classes=self.classes, 
-            verbose=False
-        )
-        r = results[0]
-        dets = []
-        if r.boxes is None:
-            return dets
+        return self.detect_batch([frame_bgr])[0]
 
-        names = r.names
-        for b in r.boxes:
-            cls = int(b.cls.item())
-            label = names.get(cls, str(cls))
-            conf = float(b.conf.item())
-            x1, y1, x2, y2 = b.xyxy[0].tolist()
-            dets.append({
-                "label": label,
-                "conf": conf,
-                "bbox": [int(x1), int(y1), int(x2), int(y2)]
-            })
-        return dets
\ No newline at end of file
+    def detect_batch(self, frames):
+        """
+        Run one forward pass per chunk of up to max_batch_size frames.
+        Frames may have different sizes: each one is letterboxed to imgsz
+        and boxes are scaled back to that frame's own pixel space.
+        Returns one Detections per frame.
+        """
+        frames = list(frames)
+        out = []
+        for i in range(0, len(frames), self.max_batch_size):
+            results = self.model.predict(
+                source=frames[i:i + self.max_batch_size],
+                conf=self.conf,
+                iou=self.iou,
+                device=self.device,
+                imgsz=self.imgsz,
+                # classes=self.classes,
+                verbose=False
+            )
+            out.extend(self._to_dets(r) for r in results)
+        return out
+
+    @staticmethod
+    def _to_dets(r):
+        if r.boxes is None or len(r.boxes) == 0:
+            return Detections.empty(r.names)
+
+        # one device->host copy per tensor, no per-box Python objects
+        return Detections(
+            r.boxes.xyxy.cpu().numpy().astype(np.int64),
+            r.boxes.conf.cpu().numpy(),
+            r.boxes.cls.cpu().numpy().astype(np.int64),
+            r.names,
+        )
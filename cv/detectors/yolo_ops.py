@@ -0,0 +1,121 @@
+import ast
+
+import cv2
+import numpy as np
+
+from cv.detectors.detections import Detections
+
+PAD_VALUE = 114  # ultralytics letterbox grey
+
+
+def letterbox(frame_bgr, imgsz=640):
+    """
+    Resize keeping aspect ratio and pad (centred) to imgsz x imgsz, like
+    ultralytics does for fixed-shape exports.
+    Returns (image, ratio, (pad_x, pad_y)).
+    """
+    h, w = frame_bgr.shape[:2]
+    r = min(imgsz / h, imgsz / w)
+    nw, nh = int(round(w * r)), int(round(h * r))
+    img = frame_bgr if (nw, nh) == (w, h) else cv2.resize(frame_bgr, (nw, nh), interpolation=cv2.INTER_LINEAR)
+    px, py = (imgsz - nw) / 2, (imgsz - nh) / 2
+    top, left = int(round(py - 0.1)), int(round(px - 0.1))
+    out = cv2.copyMakeBorder(img, top, imgsz - nh - top, left, imgsz - nw - left,
+                             cv2.BORDER_CONSTANT, value=(PAD_VALUE,) * 3)
+    return out, r, (left, top)
+
+
+def to_blob(frames, imgsz=640):
+    """
+    Letterbox a list of BGR frames (any sizes) into one NCHW float32 RGB blob
+    in [0, 1]. Returns (blob, [(ratio, (pad_x, pad_y)), ...]).
+    """
+    batch = np.empty((len(frames), imgsz, imgsz, 3), dtype=np.uint8)
+    meta = []
+    for i, f in enumerate(frames):
+        batch[i], r, pad = letterbox(f, imgsz)
+        meta.append((r, pad))
+    blob = batch[..., ::-1].transpose(0, 3, 1, 2).astype(np.float32)
+    blob *= 1.0 / 255.0
+    return np.ascontiguousarray(blob), meta
+
+
+def box_iou(box, boxes):
+    """IoU of one xyxy box against an (N, 4) array."""
+    x1 = np.maximum(box[0], boxes[:, 0])
+    y1 = np.maximum(box[1], boxes[:, 1])
+    x2 = np.minimum(box[2], boxes[:, 2])
+    y2 = np.minimum(box[3], boxes[:, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    return inter / np.maximum(area + areas - inter, 1e-9)
+
+
+def nms(boxes, scores, iou_thres=0.45, classes=None, max_det=300):
+    """
+    Greedy NMS over (N, 4) xyxy boxes, one vectorized IoU row per kept box.
+    With classes given, boxes of different classes never suppress each other
+    (boxes are shifted apart by class, as ultralytics does).
+    Returns indices of kept boxes, highest score first.
+    """
+    if len(boxes) == 0:
+        return np.empty(0, dtype=np.int64)
+    boxes = np.asarray(boxes, dtype=np.float32)
+    if classes is not None:
+        offset = float(boxes.max()) + 1.0
+        boxes = boxes + (np.asarray(classes, dtype=np.float32) * offset)[:, None]
+    order = np.argsort(-np.asarray(scores), kind="stable")
+    keep = []
+    while order.size and len(keep) < max_det:
+        i = order[0]
+        keep.append(i)
+        if order.size == 1:
+            break
+        rest = order[1:]
+        order = rest[box_iou(boxes[i], boxes[rest]) <= iou_thres]
+    return np.asarray(keep, dtype=np.int64)
+
+
+def decode_yolov8(output, meta, frame_shapes, names, conf=0.25, iou=0.45, max_det=300):
+    """
+    Raw YOLOv8 detect head output (B, 4 + nc, N) -- cx, cy, w, h in letterboxed
+    pixels followed by per-class scores -- to one Detections per frame (like
+    YOLODetector.detect), in each frame's own pixels.
+    """
+    out = []
+    preds = np.asarray(output).transpose(0, 2, 1)  # (B, N, 4 + nc)
+    for p, (r, (px, py)), (h, w) in zip(preds, meta, frame_shapes):
+        cls_scores = p[:, 4:]
+        cls = cls_scores.argmax(axis=1)
+        scores = cls_scores[np.arange(len(cls)), cls]
+        m = scores >= conf
+        if not m.any():
+            out.append(Detections.empty(names))
+            continue
+        xywh, cls, scores = p[m, :4], cls[m], scores[m]
+
+        boxes = np.empty_like(xywh)
+        boxes[:, :2] = xywh[:, :2] - xywh[:, 2:] / 2
+        boxes[:, 2:] = xywh[:, :2] + xywh[:, 2:] / 2
+        keep = nms(boxes, scores, iou, classes=cls, max_det=max_det)
+        boxes, cls, scores = boxes[keep], cls[keep], scores[keep]
+
+        # undo the letterbox
+        boxes -= np.array([px, py, px, py], dtype=boxes.dtype)
+        boxes /= r
+        boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, w)
+        boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, h)
+
+        out.append(Detections(boxes.astype(np.int64), scores, cls, names))
+    return out
+
+
+def parse_names(raw):
+    """Class names as stored in exported model metadata ("{0: 'book', ...}") -> {int: str}."""
+    if not raw:
+        return {}
+    names = ast.literal_eval(raw) if isinstance(raw, str) else raw
+    if isinstance(names, (list, tuple)):
+        names = dict(enumerate(names))
+    return {int(k): str(v) for k, v in names.items()}
@@ -0,0 +1,104 @@
+import numpy as np
+
+from cv.detectors.detections import Detections
+
+
+def zone_bounds(zone):
+    """Axis-aligned bounding box (x1, y1, x2, y2) of a rect or polygon zone."""
+    if zone.get("shape", "rect") == "polygon":
+        pts = np.asarray(zone["points"], dtype=np.float64).reshape(-1, 2)
+        x1, y1 = pts.min(axis=0)
+        x2, y2 = pts.max(axis=0)
+    else:
+        x1, x2 = sorted((zone["x1"], zone["x2"]))
+        y1, y2 = sorted((zone["y1"], zone["y2"]))
+    return int(np.floor(x1)), int(np.floor(y1)), int(np.ceil(x2)), int(np.ceil(y2))
+
+
+def _overlap(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def crop_regions(zones, frame_size, pad_px=64, max_coverage=0.8):
+    """
+    Regions of the frame worth running detection on: zone bounds padded by
+    pad_px (objects centred in a zone may stick out of it), clipped to the
+    frame, and merged while any two overlap, so crops never share pixels
+    and an object is never detected twice.
+    Returns [(0, 0, w, h)] when the crops would cover more than max_coverage
+    of the frame (or there are no zones) - a full pass is cheaper then.
+    """
+    w, h = int(frame_size[0]), int(frame_size[1])
+    full = [(0, 0, w, h)]
+    rects = []
+    for z in zones:
+        x1, y1, x2, y2 = zone_bounds(z)
+        r = (max(0, x1 - pad_px), max(0, y1 - pad_px), min(w, x2 + pad_px), min(h, y2 + pad_px))
+        if r[0] < r[2] and r[1] < r[3]:
+            rects.append(r)
+    if not rects:
+        return full
+
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(rects)):
+            for j in range(i + 1, len(rects)):
+                if _overlap(rects[i], rects[j]):
+                    a, b = rects[i], rects.pop(j)
+                    rects[i] = (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+                    merged = True
+                    break
+            if merged:
+                break
+
+    area = sum((x2 - x1) * (y2 - y1) for x1, y1, x2, y2 in rects)
+    if area > max_coverage * w * h:
+        return full
+    return sorted(rects, key=lambda r: (r[1], r[0]))
+
+
+class ZoneCropDetector:
+    """
+    Wraps a detector (detect / detect_batch) so it only sees the zone areas.
+    Each frame is cut into crop_regions() (numpy views, no copy), all crops
+    go through one detector.detect_batch call, and boxes are shifted back to
+    full-frame pixels, giving one Detections per frame.
+    Regions are cached per frame size and recomputed by set_zones().
+    With pad_px >= the largest object, zone assignment matches a full-frame pass.
+    """
+
+    def __init__(self, detector, zones, pad_px=64, max_coverage=0.8):
+        self.detector = detector
+        self.pad_px = int(pad_px)
+        self.max_coverage = float(max_coverage)
+        self.set_zones(zones)
+
+    def set_zones(self, zones):
+        self.zones = list(zones)
+        self._regions = {}  # (w, h) -> [(x1, y1, x2, y2), ...]
+
+    def regions_for(self, frame_bgr):
+        h, w = frame_bgr.shape[:2]
+        regions = self._regions.get((w, h))
+        if regions is None:
+            regions = crop_regions(self.zones, (w, h), pad_px=self.pad_px, max_coverage=self.max_coverage)
+            self._regions[(w, h)] = regions
+        return regions
+
+    def detect(self, frame_bgr):
+        return self.detect_batch([frame_bgr])[0]
+
+    def detect_batch(self, frames):
+        crops, owners = [], []
+        for i, frame in enumerate(frames):
+            for x1, y1, x2, y2 in self.regions_for(frame):
+                crops.append(frame[y1:y2, x1:x2])
+                owners.append((i, x1, y1))
+
+        parts = [[] for _ in frames]
+        if crops:
+            for (i, ox, oy), dets in zip(owners, self.detector.detect_batch(crops)):
+                dets = Detections.coerce(dets)
+                parts[i].append(dets.shifted(ox, oy) if ox or oy else dets)
+        return [Detections.concat(p) for p in parts]
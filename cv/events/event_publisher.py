@@ -1,12 +1,66 @@
+import logging
+import queue
+import random
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+
+log = logging.getLogger(__name__)
 
 class EventPublisher:
-    def __init__(self, base_url: str, path: str, timeout_seconds: int = 2):
+    """
+    Non-blocking CV event publisher.
+
+    publish_zone_change() only enqueues the event (bounded queue) and returns
+    immediately; a background thread drains the queue in batches (flushed by
+    batch_size or flush_interval_ms) over a pooled requests.Session, retrying
+    transient failures (connection errors, 5xx, 429) with exponential backoff.
+
+    If batch_path is set (e.g. "/api/events/cv/batch"), each batch is sent
+    as a single request to the backend's bulk endpoint.
+
+    When the queue is full new events are dropped and counted; see stats().
+    """
+    def __init__(
+        self,
+        base_url: str,
+        path: str,
+        timeout_seconds: int = 2,
+        max_queue_size: int = 1000,
+        batch_size: int = 20,
+        flush_interval_ms: float = 200.0,
+        max_retries: int = 5,
+        backoff_base_s: float = 0.25,
+        backoff_max_s: float = 5.0,
+        pool_size: int = 4,
+        batch_path: Optional[str] = None,
+    ):
         self.url = base_url.rstrip("/") + path
+        self.batch_url = base_url.rstrip("/") + batch_path if batch_path else None
         self.timeout = timeout_seconds
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = max(0.0, float(flush_interval_ms)) / 1000.0
+        self.max_retries = max(0, int(max_retries))
+        self.backoff_base_s = float(backoff_base_s)
+        self.backoff_max_s = float(backoff_max_s)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, int(pool_size)))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max(1, int(max_queue_size)))
+        self._lock = threading.Lock()
+        self._counters = {"enqueued": 0, "sent": 0, "failed": 0, "dropped": 0, "retries": 0, "batches": 0}
+        self._pending = 0  # enqueued and not yet sent / given up on (queued + in flight)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="cv-event-publisher", daemon=True)
+        self._thread.start()
 
+    # ---------- producer side (called from CVPipeline.step) ----------
     def publish_zone_change(
         self,
         object_type: str,
@@ -26,6 +80,126 @@ class EventPublisher:
             "meta": meta or {},
             "timestamp": datetime.utcnow().isoformat(),
         }
-        r = requests.post(self.url, json=payload, timeout=self.timeout)
-        r.raise_for_status()
-        return r.json()
\ No newline at end of file
+        # counted as pending before it is visible to the sender, so flush() can't miss it
+        with self._lock:
+            self._pending += 1
+        try:
+            self._queue.put_nowait(payload)
+        except queue.Full:
+            with self._lock:
+                self._pending -= 1
+                self._counters["dropped"] += 1
+            return {"queued": False, "dropped": True}
+        self._count("enqueued")
+        return {"queued": True}
+
+    def stats(self) -> Dict[str, int]:
+        depth = self._queue.qsize()
+        with self._lock:
+            out = dict(self._counters)
+            out["in_flight"] = max(0, self._pending - depth)
+        out["queue_depth"] = depth
+        return out
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until everything queued so far was sent (or given up on)."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                idle = self._pending == 0
+            if idle:
+                return True
+            time.sleep(0.01)
+        return False
+
+    def close(self, timeout: float = 5.0) -> None:
+        self.flush(timeout)
+        self._stop.set()
+        self._thread.join(timeout)
+        self.session.close()
+
+    # ---------- background sender ----------
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self._counters[key] += n
+
+    def _next_batch(self) -> List[Dict[str, Any]]:
+        try:
+            first = self._queue.get(timeout=0.1)
+        except queue.Empty:
+            return []
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._next_batch()
+            if not batch:
+                continue
+            try:
+                self._send_batch(batch)
+            except Exception:
+                # never let one bad batch kill the sender thread
+                log.exception("cv event batch of %d failed", len(batch))
+                self._count("failed", len(batch))
+            finally:
+                with self._lock:
+                    self._pending -= len(batch)
+                self._count("batches")
+
+    def _send_batch(self, batch: List[Dict[str, Any]]) -> None:
+        if self.batch_url is not None:
+            r = self._post_with_retry(self.batch_url, batch)
+            if r is None:
+                self._count("failed", len(batch))
+                return
+            try:
+                accepted = int(r.json().get("accepted", len(batch)))
+            except (ValueError, TypeError, AttributeError):  # not JSON / not an object
+                accepted = len(batch)
+            self._count("sent", accepted)
+            self._count("failed", len(batch) - accepted)
+            return
+
+        for payload in batch:
+            if self._send_with_retry(payload):
+                self._count("sent")
+            else:
+                self._count("failed")
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.backoff_max_s, self.backoff_base_s * (2 ** attempt))
+        return delay * (0.5 + random.random() / 2)  # jitter
+
+    def _send_with_retry(self, payload: Dict[str, Any]) -> bool:
+        return self._post_with_retry(self.url, payload) is not None
+
+    def _post_with_retry(self, url: str, body: Any):
+        """Returns the successful response, or None if the request was given up on."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                r = self.session.post(url, json=body, timeout=self.timeout)
+                if r.status_code < 400:
+                    return r
+                if r.status_code < 500 and r.status_code != 429:
+                    return None  # client error: retrying won't help
+            except requests.RequestException:
+                pass
+            except Exception:
+                # e.g. TypeError for a meta value json can't encode: retrying won't help
+                log.exception("cv event post to %s failed", url)
+                return None
+            if attempt == self.max_retries or self._stop.is_set():
+                return None
+            self._count("retries")
+            self._stop.wait(self._backoff(attempt))
+        return None
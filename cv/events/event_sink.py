@@ -0,0 +1,71 @@
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+
+class FileEventSink:
+    """
+    Drop-in for EventPublisher that appends events to an NDJSON file instead of
+    POSTing them. Each line is a CVZoneChangeEvent, timestamped in video time
+    (start_time + current_ts_s), so the file can be replayed later into
+    POST /api/events/cv/batch (Content-Type: application/x-ndjson).
+    """
+
+    def __init__(self, path: str, start_time: Optional[datetime] = None):
+        self.path = path
+        self.start_time = start_time or datetime.now(timezone.utc)
+        self.current_ts_s = 0.0  # set by the runner before each step
+        self.count = 0
+        self._f = open(path, "w", encoding="utf-8")
+
+    def publish_zone_change(
+        self,
+        object_type: str,
+        from_zone: Optional[str],
+        to_zone: Optional[str],
+        hinted_object_id: Optional[str] = None,
+        confidence: float = 0.6,
+        meta: Optional[Dict[str, Any]] = None,
+    ):
+        payload = {
+            "event_type": "cv_zone_change",
+            "object_type": object_type,
+            "from_zone": from_zone,
+            "to_zone": to_zone,
+            "hinted_object_id": hinted_object_id,
+            "confidence": confidence,
+            "meta": {**(meta or {}), "video_ts_s": round(self.current_ts_s, 3)},
+            "timestamp": (self.start_time + timedelta(seconds=self.current_ts_s)).isoformat(),
+        }
+        self._f.write(json.dumps(payload, separators=(",", ":"), default=str) + "\n")
+        self.count += 1
+        return {"queued": True}
+
+    def flush(self):
+        self._f.flush()
+
+    def close(self):
+        if not self._f.closed:
+            self._f.close()
+
+
+class MemoryEventSink:
+    """
+    Drop-in for EventPublisher that keeps events in memory (headless tests and
+    benchmarks). events holds publish_zone_change's keyword arguments; with
+    keep=False only count is updated.
+    """
+
+    def __init__(self, keep: bool = True):
+        self.keep = keep
+        self.events = []
+        self.count = 0
+
+    def publish_zone_change(self, **kwargs):
+        if self.keep:
+            self.events.append(kwargs)
+        self.count += 1
+        return {"queued": True}
+
+    def close(self):
+        pass
@@ -1,5 +1,11 @@
+import argparse
+import json
+import logging
+
 import cv2
 from cv.pipeline import CVPipeline
+from cv.runner import PipelinedRunner, draw_overlay, run_offline
+from cv.sources import open_source
 from cv.utils.fps import FPS
 import yaml
 
@@ -7,48 +13,100 @@ def load_yaml(path):
     with open(path, "r", encoding="utf-8") as f:
         return yaml.safe_load(f)
 
-def main():
-    cfg = load_yaml("config/cv.yaml")
-    cam_cfg = cfg["camera"]
+def run_sequential(cap, pipeline, show_window=True):
+    fps = FPS()
+    try:
+        while True:
+            ok, frame = cap.read()
+            if not ok:
+                print("Failed to read from camera.")
+                break
 
-    cap = cv2.VideoCapture(int(cam_cfg["index"]))
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, int(cam_cfg["width"]))
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, int(cam_cfg["height"]))
-    cap.set(cv2.CAP_PROP_FPS, int(cam_cfg["fps"]))
+            annotated, debug = pipeline.step(frame)
+            f = fps.tick()
+            if not show_window:
+                continue
 
-    pipeline = CVPipeline("config/cv.yaml", "config/zones.json")
-    fps = FPS()
+            draw_overlay(annotated, f, debug.get("counts"))
+
+            cv2.imshow("Inventory CV (Phase 2)", annotated)
 
-    print("CV Service running. Press 'q' to quit.")
+            key = cv2.waitKey(1) & 0xFF
+            if key == ord("q"):
+                break
+    except KeyboardInterrupt:
+        pass
 
-    while True:
-        ok, frame = cap.read()
-        if not ok:
-            print("Failed to read from camera.")
-            break
+    if show_window:
+        cv2.destroyAllWindows()
 
-        annotated, debug = pipeline.step(frame)
-        f = fps.tick()
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Inventory CV service")
+    ap.add_argument("--source", default=None,
+                    help="camera index, video file or image directory (default: camera from config)")
+    ap.add_argument("--headless", action="store_true", help="no window")
+    ap.add_argument("--max-speed", action="store_true",
+                    help="file/dir sources: process as fast as possible instead of at video speed")
+    ap.add_argument("--process-fps", type=float, default=None,
+                    help="file/dir sources: detection rate in video time (default: fps / process_every_n_frames)")
+    ap.add_argument("--dir-fps", type=float, default=30.0, help="frame rate assumed for image directories")
+    ap.add_argument("--events-out", default=None,
+                    help="write events to this NDJSON file instead of the backend")
+    ap.add_argument("--config", default="config/cv.yaml")
+    ap.add_argument("--zones", default="config/zones.json")
+    return ap.parse_args(argv)
 
-        # overlay fps + counts
-        cv2.putText(annotated, f"FPS: {f:.1f}", (20, 40),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255, 255, 255), 2, cv2.LINE_AA)
+def main(argv=None):
+    args = parse_args(argv)
+    cfg = load_yaml(args.config)
+    cam_cfg = cfg["camera"]
+    rt_cfg = cfg.get("runtime") or {}
+    logging.basicConfig(
+        level=str(rt_cfg.get("log_level", "INFO")).upper(),
+        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+    )
+    show_window = bool(rt_cfg.get("show_window", True)) and not args.headless
 
-        if debug.get("counts"):
-            y = 70
-            for k, v in debug["counts"].items():
-                cv2.putText(annotated, f"{k}: {v}", (20, y),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2, cv2.LINE_AA)
-                y += 28
+    source = open_source(args.source, cam_cfg, dir_fps=args.dir_fps)
+    if not source.isOpened():
+        raise SystemExit(f"Cannot open source: {args.source if args.source is not None else cam_cfg['index']}")
 
-        cv2.imshow("Inventory CV (Phase 2)", annotated)
+    sink = None
+    if args.events_out:
+        from cv.events.event_sink import FileEventSink  # lazy import
+        sink = FileEventSink(args.events_out)
 
-        key = cv2.waitKey(1) & 0xFF
-        if key == ord("q"):
-            break
+    pipeline = CVPipeline(args.config, args.zones, publisher=sink)
 
-    cap.release()
-    cv2.destroyAllWindows()
+    try:
+        if not source.live:
+            print(f"Replaying {args.source} ({'max speed' if args.max_speed else 'video speed'}). Press 'q' to quit.")
+            summary = run_offline(
+                source,
+                pipeline,
+                show_window=show_window,
+                max_speed=args.max_speed,
+                process_fps=args.process_fps,
+                sink=sink,
+            )
+            print("[CV replay] done:", json.dumps(summary))
+        elif rt_cfg.get("threaded", False):
+            print("CV Service running. Press 'q' to quit.")
+            runner = PipelinedRunner(
+                source,
+                pipeline,
+                show_window=show_window,
+                frame_buffer_size=int(rt_cfg.get("frame_buffer_size", 1)),
+                display_buffer_size=int(rt_cfg.get("display_buffer_size", 1)),
+                stats_every_s=float(rt_cfg.get("stats_every_s", 5.0)),
+            )
+            runner.run()
+        else:
+            print("CV Service running. Press 'q' to quit.")
+            run_sequential(source, pipeline, show_window=show_window)
+    finally:
+        source.release()
+        pipeline.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,12 +1,21 @@
 import json
+import logging
+import time
+import numpy as np
 import yaml
 
-from cv.detectors.yolo_detector import YOLODetector
-from cv.tracking.zone_mapper import assign_to_zones, count_by_zone
+from cv.tracking.zone_mapper import ZoneMap, assign_to_zones, count_by_zone
 from cv.tracking.state_tracker import ZoneStateTracker, infer_transfers
-from cv.utils.draw import draw_rect_zone, draw_bbox
+from cv.utils.draw import draw_zone, draw_bbox
 from cv.tracking.simple_tracker import SimpleTracker
-from cv.qr.qr_reader import QRReader
+from cv.tracking.motion_gate import MotionGate
+from cv.tracking.flow_propagator import FlowPropagator
+from cv.detectors.zone_crop import ZoneCropDetector
+from cv.detectors.detections import Detections
+from cv.qr.qr_reader import QRReader, assign_codes_to_tracks
+from cv.utils.metrics import Metrics, MetricsServer
+
+log = logging.getLogger(__name__)
 
 
 def load_yaml(path):
@@ -21,29 +30,47 @@ def load_zones(path):
 
 
 class CVPipeline:
-    def __init__(self, cv_config_path="config/cv.yaml", zones_path="config/zones.json"):
+    def __init__(self, cv_config_path="config/cv.yaml", zones_path="config/zones.json", detector=None, publisher=None):
+        """
+        detector / publisher: optional replacements (e.g. cv.detectors.stub_detector.StubDetector
+        for headless benchmarks); by default YOLO is loaded and publishing follows the config.
+        """
         cfg = load_yaml(cv_config_path)
         self.cfg = cfg
         self.zones = load_zones(zones_path)
 
-        self.detector = YOLODetector(
-            model_path=cfg["yolo"]["model"],
-            conf=float(cfg["yolo"]["conf"]),
-            iou=float(cfg["yolo"]["iou"]),
-            device=str(cfg["yolo"]["device"]),
-        )
+        if detector is None:
+            from cv.detectors.factory import build_detector  # lazy import (backend packages are optional)
+            detector = build_detector(cfg["yolo"])
+        # Zone-cropped inference: the detector only sees the (padded) zone areas
+        self.zone_crop_cfg = cfg.get("zone_crop", {}) or {}
+        if bool(self.zone_crop_cfg.get("enabled", False)):
+            detector = ZoneCropDetector(
+                detector,
+                self.zones,
+                pad_px=int(self.zone_crop_cfg.get("pad_px", 64)),
+                max_coverage=float(self.zone_crop_cfg.get("max_coverage", 0.8)),
+            )
+        self.detector = detector
 
         self.class_filter = set(cfg.get("detect_classes") or [])
         self.process_every_n = int(cfg["logic"]["process_every_n_frames"])
         self.publish_events = bool(cfg["logic"]["publish_events"])
+        self.zone_map_max_side = int(cfg["logic"].get("zone_map_max_side", 640))
+        self.zone_map = None  # compiled lazily for the actual frame size
         self.object_type = "generic_object"  # Phase 2 testing. Later: filament_spool / printer.
 
+        trk_cfg = cfg.get("tracking", {}) or {}
         self.tracker = SimpleTracker(
             max_age_frames=60,
             match_dist_px=250.0,
             max_zone_gap_frames=20,
-            enforce_same_label=False
+            enforce_same_label=False,
+            motion_model=str(trk_cfg.get("motion_model", "none")),
+            kalman_process_noise=float(trk_cfg.get("process_noise_px", 4.0)),
+            kalman_measurement_noise=float(trk_cfg.get("measurement_noise_px", 8.0)),
         )
+        self._last_track_frame = None
         self.state_tracker = ZoneStateTracker(
             self.zones,
             min_stable_frames=int(cfg["logic"]["min_stable_frames"]),
@@ -55,73 +82,242 @@ class CVPipeline:
         self.qr_every_n = int(self.qr_cfg.get("decode_every_n_frames", 2))
         self.qr_pad = int(self.qr_cfg.get("roi_pad_px", 14))
         self.qr_draw = bool(self.qr_cfg.get("draw_overlay", True))
+        self.qr_mode = str(self.qr_cfg.get("mode", "roi")).lower()
+        if self.qr_mode not in ("roi", "multi"):
+            raise ValueError(f"unknown qr.mode {self.qr_mode!r} (expected 'roi' or 'multi')")
+        self.qr_multi_max_side = int(self.qr_cfg.get("multi_max_side", 1280))
         self.qr_reader = QRReader() if self.qr_enabled else None
 
         # cache last known QR per track so you don't need to decode every frame
         self.track_qr_cache = {}  # track_id -> {"raw": str, "payload": dict}
+        self._qr_pass_i = 0       # detection frames seen by the QR step (its cadence)
 
         # Publisher is optional, and imported only if needed
-        self.publisher = None
-        if self.publish_events:
+        self.publisher = publisher
+        if publisher is not None:
+            self.publish_events = True
+        elif self.publish_events:
             from cv.events.event_publisher import EventPublisher  # lazy import
+            be = cfg["backend"]
             self.publisher = EventPublisher(
-                base_url=cfg["backend"]["base_url"],
-                path=cfg["backend"]["cv_event_path"],
-                timeout_seconds=int(cfg["backend"]["timeout_seconds"]),
+                base_url=be["base_url"],
+                path=be["cv_event_path"],
+                timeout_seconds=int(be["timeout_seconds"]),
+                max_queue_size=int(be.get("max_queue_size", 1000)),
+                batch_size=int(be.get("batch_size", 20)),
+                flush_interval_ms=float(be.get("flush_interval_ms", 200)),
+                max_retries=int(be.get("max_retries", 5)),
+                batch_path=be.get("cv_event_batch_path"),
             )
 
+        # Motion gate: skip detection while nothing moves near a zone (compiled lazily per frame size)
+        self.gate_cfg = cfg.get("motion_gate", {}) or {}
+        self.motion_gate_enabled = bool(self.gate_cfg.get("enabled", False))
+        self.motion_keepalive_s = float(self.gate_cfg.get("keepalive_s", 2.0))
+        self.motion_gate = None
+        self._last_detect_ts = None
+        self._last_dets = Detections.empty()
+
+        # Optical-flow box propagation on frames without detection
+        self.flow_cfg = cfg.get("flow", {}) or {}
+        self.flow = None
+        if bool(self.flow_cfg.get("enabled", False)):
+            self.flow = FlowPropagator(
+                max_side=int(self.flow_cfg.get("max_side", 640)),
+                points_per_box=int(self.flow_cfg.get("points_per_box", 8)),
+                min_points=int(self.flow_cfg.get("min_points", 3)),
+            )
+
+        # Per-stage timing histograms + counters; optional log line / local HTTP endpoint
+        m_cfg = cfg.get("metrics", {}) or {}
+        self.metrics = Metrics(window=int(m_cfg.get("window", 1000)), log_every_s=float(m_cfg.get("log_every_s", 0)))
+        self.metrics_server = None
+        if int(m_cfg.get("http_port", 0)) > 0:
+            self.metrics_server = MetricsServer(self.metrics, host=str(m_cfg.get("http_host", "127.0.0.1")),
+                                                port=int(m_cfg["http_port"]))
+            log.info("metrics on http://%s:%d/metrics", m_cfg.get("http_host", "127.0.0.1"), self.metrics_server.port)
+
         self.frame_i = 0
 
+    def close(self):
+        """Flush queued events and stop the publisher thread."""
+        if self.publisher is not None:
+            self.publisher.close()
+        if self.metrics_server is not None:
+            self.metrics_server.close()
+            self.metrics_server = None
+
+    def set_zones(self, zones):
+        """
+        Swap the zone list at runtime: zone map, motion-gate masks and detector
+        crops are rebuilt for the new zones. Zones that keep their zone_id keep
+        their debounced count; new zones start at 0.
+        """
+        old = self.state_tracker
+        self.zones = list(zones)
+        self.zone_map = None
+        self.state_tracker = ZoneStateTracker(self.zones, min_stable_frames=old.min_stable_frames)
+        for zid in self.state_tracker.zones:
+            if zid in old.prev_counts:
+                self.state_tracker.prev_counts[zid] = old.prev_counts[zid]
+        if hasattr(self.detector, "set_zones"):
+            self.detector.set_zones(self.zones)
+
     def _filter_dets(self, dets):
-        if not self.class_filter:
-            return dets
-        return [d for d in dets if d["label"] in self.class_filter]
+        """Drop people, classes outside detect_classes and low-confidence boxes (one mask)."""
+        keep = ~dets.label_mask(("person",)) & (dets.conf >= 0.35)
+        if self.class_filter:
+            keep &= dets.label_mask(self.class_filter)
+        return dets[keep]
+
+    def _zone_map_for(self, frame_bgr):
+        h, w = frame_bgr.shape[:2]
+        if self.zone_map is None or not self.zone_map.matches((w, h)):
+            self.zone_map = ZoneMap(self.zones, (w, h), max_side=self.zone_map_max_side)
+        return self.zone_map
+
+    def _motion_gate_for(self, frame_bgr):
+        zone_map = self._zone_map_for(frame_bgr)
+        if self.motion_gate is None:
+            self.motion_gate = MotionGate(
+                zone_map,
+                max_side=int(self.gate_cfg.get("max_side", 320)),
+                threshold=int(self.gate_cfg.get("threshold", 15)),
+                min_area_fraction=float(self.gate_cfg.get("min_area_fraction", 0.0005)),
+                margin_px=float(self.gate_cfg.get("margin_px", 32)),
+            )
+        elif self.motion_gate.zone_map is not zone_map:
+            self.motion_gate.set_zone_map(zone_map)
+        return self.motion_gate
 
-    def step(self, frame_bgr):
+    def skip_frame(self):
+        """Account for a frame that was not decoded/stepped (keeps the every-N cadences aligned)."""
+        self.frame_i += 1
+        self.metrics.inc("frames")
+
+    def step(self, frame_bgr, process=None, ts=None):
         """
         Process one frame. Returns:
           annotated_frame, debug_info
+        debug_info["timings"] holds per-stage wall time in ms for this frame.
+        process: force (True) or skip (False) detection for this frame; None uses
+        process_every_n_frames. Offline runners decide from video timestamps.
+        ts: frame time in seconds (video time offline); drives the motion gate keep-alive.
         """
         self.frame_i += 1
+        timings = {}
+        mark = [time.perf_counter()]  # `t` is used as a loop variable below
+
+        def lap(stage):
+            now = time.perf_counter()
+            timings[stage] = timings.get(stage, 0.0) + (now - mark[0]) * 1000.0
+            mark[0] = now
+
         annotated = frame_bgr.copy()
 
         # Always draw zones
         for z in self.zones:
-            draw_rect_zone(annotated, z)
+            draw_zone(annotated, z)
+        lap("draw")
+
+        debug = {"published": [], "counts": None, "changes": [], "transfers": [], "enters": [], "exits": [], "residual": [],
+                 "timings": timings}
 
-        debug = {"published": [], "counts": None, "changes": [], "transfers": [], "enters": [], "exits": [], "residual": []}
+        self.metrics.inc("frames")
 
         # Only run detection every N frames to reduce CPU load
-        if (self.frame_i % self.process_every_n) != 0:
+        if process is None:
+            process = (self.frame_i % self.process_every_n) == 0
+        if not process:
+            if self.flow is not None and self.flow.active:
+                self._step_propagated(frame_bgr, annotated, debug, lap)
+            self._record_metrics(timings)
             return annotated, debug
-        
-        # 1) Detect
-        dets = self.detector.detect(frame_bgr)
-        dets = [d for d in dets if d["label"] != "person"]
-
-        # Debug: show what YOLO sees
-        # if dets:
-        #     print("[YOLO] detections:", [(d["label"], round(d["conf"], 2)) for d in dets])
-        # else:
-        #     print("[YOLO] detections: []")
-
-        # 2) Filter + zone-assign
-        dets = self._filter_dets(dets)
-        dets = [d for d in dets if d["conf"] >= 0.35]
-        dets = assign_to_zones(dets, self.zones)
-
-        # 3) Tracking-based transfers (best for MOVE events)
-        tracks_out, transfers, enters, exits = self.tracker.update(dets)
-        print("[DEBUG tracks]", [(t["track_id"], t["label"], t.get("prev_zone_id"), t.get("zone_id")) for t in tracks_out])
-        print("[DEBUG events]", "T=", len(transfers), "E=", len(enters), "X=", len(exits))
-
-        # --- QR decode step (ROI-based, fast) ---
-        if self.qr_enabled and self.qr_reader is not None and (self.frame_i % self.qr_every_n == 0):
-            for t in tracks_out:
-                tid = t["track_id"]
-                raw, payload = self.qr_reader.decode_roi(frame_bgr, t["bbox"], pad=self.qr_pad)
-                if raw:
-                    self.track_qr_cache[tid] = {"raw": raw, "payload": payload}
+
+        # 0) Motion gate: if nothing moved near a zone since the last detection, the
+        #    detector would return the same boxes, so reuse them. Tracker and state
+        #    tracker still run on them, so ages, gap timers and debounce advance as usual.
+        gated = False
+        now = ts if ts is not None else time.time()
+        if self.motion_gate_enabled:
+            gate = self._motion_gate_for(frame_bgr)
+            motion, moving_zones = gate.update(frame_bgr)
+            keepalive_due = self._last_detect_ts is None or now - self._last_detect_ts >= self.motion_keepalive_s
+            gated = not (motion or keepalive_due)
+            if not gated:
+                gate.mark_detected()
+            debug["gated"] = gated
+            debug["motion_zones"] = moving_zones
+            lap("gate")
+
+        if gated:
+            dets = self._last_dets
+            self.metrics.inc("gated_frames")
+        else:
+            self._last_detect_ts = now
+
+            # 1) Detect (columnar Detections; dict-list detectors are converted once)
+            dets = Detections.coerce(self.detector.detect(frame_bgr))
+            lap("detect")
+
+            # Debug: show what YOLO sees
+            # if len(dets):
+            #     print("[YOLO] detections:", list(zip(dets.label_list(), dets.conf.round(2).tolist())))
+            # else:
+            #     print("[YOLO] detections: []")
+
+            # 2) Filter + zone-assign
+            dets = self._filter_dets(dets)
+            dets = assign_to_zones(dets, self.zones, zone_map=self._zone_map_for(frame_bgr))
+            self._last_dets = dets
+            lap("zones")
+
+        # 3) Tracking-based transfers (best for MOVE events); the motion model
+        #    predicts over the frames skipped since the last update
+        dt = self.frame_i - self._last_track_frame if self._last_track_frame is not None else 1
+        self._last_track_frame = self.frame_i
+        tracks_out, transfers, enters, exits = self.tracker.update(dets, dt=dt)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("frame=%d tracks=%s", self.frame_i,
+                      [(t["track_id"], t["label"], t.get("prev_zone_id"), t.get("zone_id")) for t in tracks_out])
+            log.debug("frame=%d transfers=%d enters=%d exits=%d", self.frame_i, len(transfers), len(enters), len(exits))
+        lap("track")
+        if self.flow is not None:
+            self.flow.reset(frame_bgr, tracks_out)
+            lap("flow")
+        self.metrics.inc("detections", len(dets))
+        self.metrics.inc("tracks", len(tracks_out))
+
+        # --- QR decode step (per track ROI, or one full-frame pass); a gated frame shows nothing new to decode.
+        #     Every qr_every_n-th detection frame re-reads all tracks; in roi mode the others try only tracks
+        #     without a code yet, so a static scene (detecting on keepalive frames only) still gets its codes
+        #     read. The full-frame multi pass costs the same for one track or all, so it runs on the Nth only. ---
+        if self.qr_enabled and self.qr_reader is not None and not gated:
+            self._qr_pass_i += 1
+            full_pass = self._qr_pass_i % self.qr_every_n == 0
+            if full_pass:
+                candidates = tracks_out
+            else:
+                candidates = [t for t in tracks_out if t["track_id"] not in self.track_qr_cache]
+            hits = 0
+            if self.qr_mode == "multi":
+                candidates = tracks_out if full_pass else []
+                if candidates:
+                    codes = self.qr_reader.decode_multi(frame_bgr, max_side=self.qr_multi_max_side)
+                    # assign against every track, so a code is never handed to a neighbour of its owner
+                    for tid, (raw, payload) in assign_codes_to_tracks(codes, tracks_out, pad=self.qr_pad).items():
+                        self.track_qr_cache[tid] = {"raw": raw, "payload": payload}
+                        hits += 1
+            else:
+                for t in candidates:
+                    tid = t["track_id"]
+                    raw, payload = self.qr_reader.decode_roi(frame_bgr, t["bbox"], pad=self.qr_pad)
+                    if raw:
+                        self.track_qr_cache[tid] = {"raw": raw, "payload": payload}
+                        hits += 1
+            self.metrics.inc("qr_hits", hits)
+            self.metrics.inc("qr_misses", len(candidates) - hits)
+        lap("qr")
 
         debug["transfers"] = transfers
         debug["enters"] = enters
@@ -131,29 +327,11 @@ class CVPipeline:
         # draw detections
         # for d in dets:
         #     draw_bbox(annotated, d["bbox"], d["label"], d["conf"])
-        for t in tracks_out:
-            tid = t["track_id"]
-            label = t["label"]
-            cache = self.track_qr_cache.get(tid)
-
-            if self.qr_draw and cache:
-                # show ID if JSON payload, else show "QR"
-                qid = None
-                if isinstance(cache.get("payload"), dict):
-                    qid = cache["payload"].get("id")
-                if qid:
-                    label = f"#{tid} {t['label']} QR:{qid}"
-                else:
-                    label = f"#{tid} {t['label']} QR"
-
-            draw_bbox(annotated, t["bbox"], label, t["conf"])
+        self._draw_tracks(annotated, tracks_out)
+        lap("draw")
 
         # 5) Zone counts (use tracked objects for stability)
-        counts = {z["zone_id"]: 0 for z in self.zones}
-        for t in tracks_out:
-            zid = t.get("zone_id")
-            if zid in counts:
-                counts[zid] += 1
+        counts = self._count_tracks(tracks_out)
         debug["counts"] = counts
 
         # print("[DEBUG] [CV] ", datetime.now(timezone.utc).isoformat(), " active tracks:", [(t["track_id"], t["label"], t.get("zone_id")) for t in tracks_out])
@@ -182,6 +360,7 @@ class CVPipeline:
                     "new": c["new"],
                 })
         debug["residual"] = residual
+        lap("state")
 
         # changes = self.state_tracker.update(counts)
         # debug["changes"] = changes
@@ -193,6 +372,51 @@ class CVPipeline:
         # debug["transfers"] = transfers
 
         # 7) Publish or print events
+        self._publish_events(debug, enters, exits, transfers, residual)
+        lap("publish")
+
+        self.metrics.inc("events_enter", len(enters))
+        self.metrics.inc("events_exit", len(exits))
+        self.metrics.inc("events_transfer", len(transfers))
+        self.metrics.inc("events_residual", len(residual))
+        self._record_metrics(timings)
+        return annotated, debug
+
+    def _step_propagated(self, frame_bgr, annotated, debug, lap):
+        """
+        Frame without detection: move the last tracks with optical flow and
+        draw / count them in their propagated zones. Nothing is published: zone
+        changes are reported by the next detection frame, which confirms them
+        (and replaces the propagated boxes). The zone debounce only advances
+        on detection frames.
+        """
+        boxes = self.flow.propagate(frame_bgr)
+        lap("flow")
+        updates = {}
+        if boxes:
+            tids = list(boxes)
+            b = np.asarray([boxes[tid] for tid in tids], dtype=np.int64)
+            centers = np.stack([(b[:, 0] + b[:, 2]) // 2, (b[:, 1] + b[:, 3]) // 2], axis=1)
+            zone_ids = self._zone_map_for(frame_bgr).lookup(centers)
+            updates = {tid: (box, zid) for tid, box, zid in zip(tids, b.tolist(), zone_ids)}
+        tracks_out = self.tracker.propagate(updates)
+        lap("track")
+
+        debug["propagated"] = True
+        self._draw_tracks(annotated, tracks_out)
+        lap("draw")
+        debug["counts"] = self._count_tracks(tracks_out)
+        self.metrics.inc("propagated_frames")
+
+    def _count_tracks(self, tracks_out):
+        counts = {z["zone_id"]: 0 for z in self.zones}
+        for t in tracks_out:
+            zid = t.get("zone_id")
+            if zid in counts:
+                counts[zid] += 1
+        return counts
+
+    def _publish_events(self, debug, enters, exits, transfers, residual):
         if self.publish_events and self.publisher is not None:
             # 1) Publish TRACK-LEVEL events (best signal)
             for e in enters:
@@ -220,13 +444,13 @@ class CVPipeline:
 
             for x in exits:
                 try:
-                    hinted_id, qr_meta = self._qr_meta_for_track(e["track_id"])
+                    hinted_id, qr_meta = self._qr_meta_for_track(x["track_id"])
                     meta = {
                         "source": "phase2",
-                        "mode": "enter",
-                        "label": e["label"],
-                        "track_id": e["track_id"],
-                        "reason": e.get("reason"),
+                        "mode": "exit",
+                        "label": x["label"],
+                        "track_id": x["track_id"],
+                        "reason": x.get("reason"),
                         **qr_meta,
                     }
                     resp = self.publisher.publish_zone_change(
@@ -243,13 +467,13 @@ class CVPipeline:
 
             for t in transfers:
                 try:
-                    hinted_id, qr_meta = self._qr_meta_for_track(e["track_id"])
+                    hinted_id, qr_meta = self._qr_meta_for_track(t["track_id"])
                     meta = {
                         "source": "phase2",
-                        "mode": "enter",
-                        "label": e["label"],
-                        "track_id": e["track_id"],
-                        "reason": e.get("reason"),
+                        "mode": "transfer",
+                        "label": t["label"],
+                        "track_id": t["track_id"],
+                        "reason": t.get("reason"),
                         **qr_meta,
                     }
                     resp = self.publisher.publish_zone_change(
@@ -294,18 +518,39 @@ class CVPipeline:
                     print(f"[CV] EXIT   #{x['track_id']} {x['label']} {x['from_zone']} -> OUTSIDE ({x.get('reason')})")
                 for t in transfers:
                     print(f"[CV] TRANSFER #{t['track_id']} {t['label']} {t['from_zone']} -> {t['to_zone']} ({t.get('reason')})")
-                
+
                 hinted_id, _ = self._qr_meta_for_track(t["track_id"])
                 qr_txt = f" QR:{hinted_id}" if hinted_id else ""
                 print(f"[CV] TRANSFER #{t['track_id']} {t['label']}{qr_txt} {t['from_zone']} -> {t['to_zone']} ({t.get('reason')})")
-            
+
             for r in residual:
                 if r["mode"] == "appearance":
                     print(f"[CV] APPEAR {r['to_zone']} ({r['old']} -> {r['new']})")
                 else:
                     print(f"[CV] DISAPPEAR {r['from_zone']} ({r['old']} -> {r['new']})")
 
-        return annotated, debug
+    def _draw_tracks(self, annotated, tracks_out):
+        for t in tracks_out:
+            tid = t["track_id"]
+            label = t["label"]
+            cache = self.track_qr_cache.get(tid)
+
+            if self.qr_draw and cache:
+                # show ID if JSON payload, else show "QR"
+                qid = None
+                if isinstance(cache.get("payload"), dict):
+                    qid = cache["payload"].get("id")
+                if qid:
+                    label = f"#{tid} {t['label']} QR:{qid}"
+                else:
+                    label = f"#{tid} {t['label']} QR"
+
+            draw_bbox(annotated, t["bbox"], label, t["conf"])
+
+    def _record_metrics(self, timings):
+        self.metrics.observe_many(timings)
+        self.metrics.observe("step", sum(timings.values()))
+        self.metrics.maybe_log()
     
     def _qr_meta_for_track(self, track_id: int):
         cache = self.track_qr_cache.get(track_id)
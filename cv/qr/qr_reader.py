@@ -1,11 +1,29 @@
 import json
+from functools import lru_cache
+
 import cv2
+import numpy as np
+
+
+@lru_cache(maxsize=1024)
+def parse_payload(s: str):
+    """
+    JSON payload of a QR string, or None. Memoized per raw string: the same
+    few labels are decoded over and over. Callers must not mutate the result.
+    """
+    # Try JSON first (our recommended format)
+    try:
+        return json.loads(s)
+    except Exception:
+        return None
+
 
 class QRReader:
     """
     Uses OpenCV QRCodeDetector to decode QR codes from:
       - full frame (optional)
       - cropped ROI (recommended for speed)
+      - full frame, all codes in one pass (decode_multi)
     Returns:
       decoded_str, parsed_payload (dict or None)
     """
@@ -17,7 +35,7 @@ class QRReader:
         if data and data.strip():
             return data.strip(), self._try_parse(data.strip())
         return None, None
-    
+
     def decode_roi(self, frame_bgr, bbox, pad=12):
         """
         bbox: [x1,y1,x2,y2]
@@ -35,13 +53,56 @@ class QRReader:
 
         roi = frame_bgr[y1:y2, x1:x2]
         return self.decode_bgr(roi)
-    
+
+    def decode_multi(self, frame_bgr, max_side=1280):
+        """
+        Every code in the frame with one detectAndDecodeMulti call on a gray
+        copy, downscaled so its longest side is at most max_side (small codes
+        stop decoding when downscaled too far).
+        Returns [(raw, payload, (cx, cy)), ...] with centres in frame pixels;
+        codes that were found but not decoded are dropped.
+        """
+        h, w = frame_bgr.shape[:2]
+        scale = min(1.0, float(max_side) / max(w, h))
+        gray = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2GRAY)
+        if scale < 1.0:
+            gray = cv2.resize(gray, (int(round(w * scale)), int(round(h * scale))), interpolation=cv2.INTER_AREA)
+
+        ok, texts, points, _ = self.detector.detectAndDecodeMulti(gray)
+        if not ok or points is None:
+            return []
+        centers = np.asarray(points, dtype=np.float64).reshape(-1, 4, 2).mean(axis=1) / scale
+        out = []
+        for raw, (cx, cy) in zip(texts, centers.tolist()):
+            raw = raw.strip() if raw else ""
+            if raw:
+                out.append((raw, self._try_parse(raw), (cx, cy)))
+        return out
+
     def _try_parse(self, s: str):
-        # Try JSON first (our recommended format)
-        try:
-            return json.loads(s)
-        except Exception:
-            return None
-
-    
-    
\ No newline at end of file
+        return parse_payload(s)
+
+
+def assign_codes_to_tracks(codes, tracks, pad=0):
+    """
+    codes: [(raw, payload, (cx, cy)), ...] from QRReader.decode_multi
+    tracks: [{track_id, bbox}, ...]
+    Each code goes to the smallest track box (grown by pad) containing its
+    centre; codes outside every box are ignored.
+    Returns {track_id: (raw, payload)}.
+    """
+    if not codes or not tracks:
+        return {}
+    boxes = np.asarray([t["bbox"] for t in tracks], dtype=np.float64).reshape(-1, 4)
+    boxes += (-pad, -pad, pad, pad)
+    c = np.asarray([code[2] for code in codes], dtype=np.float64)
+    inside = ((c[:, None, 0] >= boxes[None, :, 0]) & (c[:, None, 0] <= boxes[None, :, 2]) &
+              (c[:, None, 1] >= boxes[None, :, 1]) & (c[:, None, 1] <= boxes[None, :, 3]))
+    area = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    best = np.where(inside, area[None, :], np.inf).argmin(axis=1)
+
+    out = {}
+    for (raw, payload, _), ti, hit in zip(codes, best.tolist(), inside.any(axis=1).tolist()):
+        if hit:
+            out[tracks[ti]["track_id"]] = (raw, payload)
+    return out
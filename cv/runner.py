@@ -0,0 +1,266 @@
+import threading
+import time
+from collections import deque
+
+import cv2
+
+from cv.utils.fps import FPS, RateCounter
+
+
+class LatestFrameBuffer:
+    """
+    Bounded ring buffer between two threads.
+    - put() never blocks: when full, the oldest item is dropped.
+    - get_latest() returns the newest item and discards everything older,
+      so the consumer always works on the freshest frame.
+    Dropped items are counted on purpose (stale frames are not worth processing).
+    """
+    def __init__(self, capacity: int = 1):
+        self._items = deque(maxlen=max(1, int(capacity)))
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get_latest(self, timeout: float | None = None):
+        """Returns the newest item, or None on timeout / close."""
+        with self._cond:
+            if not self._items and not self._closed:
+                self._cond.wait(timeout)
+            if not self._items:
+                return None
+            item = self._items.pop()
+            self.dropped += len(self._items)
+            self._items.clear()
+            return item
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def __len__(self):
+        return len(self._items)
+
+
+def draw_overlay(annotated, fps_value, counts):
+    # overlay fps + counts
+    cv2.putText(annotated, f"FPS: {fps_value:.1f}", (20, 40),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255, 255, 255), 2, cv2.LINE_AA)
+
+    if counts:
+        y = 70
+        for k, v in counts.items():
+            cv2.putText(annotated, f"{k}: {v}", (20, y),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2, cv2.LINE_AA)
+            y += 28
+
+
+class PipelinedRunner:
+    """
+    Runs capture, inference/tracking and display concurrently:
+
+      capture thread --(LatestFrameBuffer)--> worker thread --(LatestFrameBuffer)--> display
+
+    - capture keeps reading so the camera's internal buffer never backs up;
+      only the newest frame(s) are kept.
+    - the worker always picks the newest frame, so detections are never stale
+      by more than one inference.
+    - display is optional; it runs on the thread that calls run() because
+      cv2.imshow must stay on the main thread on some platforms.
+    Per-stage throughput and drop counts are printed every stats_every_s.
+    """
+    def __init__(
+        self,
+        cap,
+        pipeline,
+        show_window: bool = True,
+        frame_buffer_size: int = 1,
+        display_buffer_size: int = 1,
+        stats_every_s: float = 5.0,
+        window_name: str = "Inventory CV (Phase 2)",
+    ):
+        self.cap = cap
+        self.pipeline = pipeline
+        self.show_window = bool(show_window)
+        self.stats_every_s = float(stats_every_s)
+        self.window_name = window_name
+
+        self.frames = LatestFrameBuffer(frame_buffer_size)
+        self.results = LatestFrameBuffer(display_buffer_size)
+        self.stop_event = threading.Event()
+
+        self.rates = {
+            "capture": RateCounter(),
+            "infer": RateCounter(),
+            "display": RateCounter(),
+        }
+        self.infer_fps = FPS()
+        self.error = None
+
+    # ---------- stages ----------
+    def _capture_loop(self):
+        seq = 0
+        while not self.stop_event.is_set():
+            ok, frame = self.cap.read()
+            if not ok:
+                print("Failed to read from camera.")
+                self.stop_event.set()
+                break
+            seq += 1
+            self.frames.put((seq, time.time(), frame))
+            self.rates["capture"].tick()
+        self.frames.close()
+
+    def _worker_loop(self):
+        try:
+            while not self.stop_event.is_set():
+                item = self.frames.get_latest(timeout=0.5)
+                if item is None:
+                    if self.frames.closed:
+                        break
+                    continue
+                seq, captured_at, frame = item
+                annotated, debug = self.pipeline.step(frame)
+                f = self.infer_fps.tick()
+                self.rates["infer"].tick()
+                if self.show_window:
+                    draw_overlay(annotated, f, debug.get("counts"))
+                    self.results.put((seq, captured_at, annotated))
+        except Exception as ex:
+            self.error = ex
+            self.stop_event.set()
+        finally:
+            self.results.close()
+
+    def _report_stats(self):
+        parts = [f"{name} {rc.rate():.1f}/s" for name, rc in self.rates.items()]
+        parts.append(f"dropped capture={self.frames.dropped} display={self.results.dropped}")
+        print("[CV stats]", " | ".join(parts))
+
+    # ---------- driver ----------
+    def run(self):
+        threads = [
+            threading.Thread(target=self._capture_loop, name="cv-capture", daemon=True),
+            threading.Thread(target=self._worker_loop, name="cv-worker", daemon=True),
+        ]
+        for t in threads:
+            t.start()
+
+        last_report = time.time()
+        try:
+            while not self.stop_event.is_set():
+                if self.show_window:
+                    item = self.results.get_latest(timeout=0.05)
+                    if item is not None:
+                        cv2.imshow(self.window_name, item[2])
+                        self.rates["display"].tick()
+                    key = cv2.waitKey(1) & 0xFF
+                    if key == ord("q"):
+                        break
+                else:
+                    self.stop_event.wait(0.2)
+
+                if self.stats_every_s > 0 and time.time() - last_report >= self.stats_every_s:
+                    self._report_stats()
+                    last_report = time.time()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop_event.set()
+            self.frames.close()
+            for t in threads:
+                t.join(timeout=2.0)
+            if self.show_window:
+                cv2.destroyAllWindows()
+
+        if self.error is not None:
+            raise self.error
+
+
+def run_offline(source, pipeline, show_window=False, max_speed=False, process_fps=None, sink=None,
+                window_name="Inventory CV (replay)", progress_every_s=10.0):
+    """
+    Replay a recorded source (VideoFileSource / ImageDirSource) through the pipeline.
+
+    - which frames get detection is decided from source timestamps (process_fps,
+      default source.fps / process_every_n_frames), never from wall-clock time,
+      so results are the same at any replay speed and no frame is dropped
+    - max_speed: no pacing; otherwise frames are released at video speed
+    - headless (show_window=False): frames that are not processed are only
+      grabbed, never decoded
+    - sink: FileEventSink (or anything with current_ts_s) gets the video time
+    Returns a summary dict.
+    """
+    if process_fps is None:
+        process_fps = source.fps / max(1, pipeline.process_every_n)
+    period = 1.0 / process_fps if process_fps > 0 else 0.0
+
+    next_due = 0.0
+    read = processed = 0
+    t_start = time.time()
+    last_progress = t_start
+    fps = FPS()
+    try:
+        while True:
+            if not source.grab():
+                break
+            read += 1
+            ts = source.timestamp_s
+            process = ts + 1e-6 >= next_due
+            if process:
+                next_due = max(next_due + period, ts + period * 0.5) if period else ts
+
+            if not process and not show_window:
+                pipeline.skip_frame()
+                continue
+
+            if not max_speed:
+                # pace on video time: sleep until wall clock catches up
+                delay = ts - (time.time() - t_start)
+                if delay > 0:
+                    time.sleep(delay)
+
+            ok, frame = source.retrieve()
+            if not ok:
+                break
+            if sink is not None:
+                sink.current_ts_s = ts
+            annotated, debug = pipeline.step(frame, process=process, ts=ts)
+            if process:
+                processed += 1
+
+            if show_window:
+                draw_overlay(annotated, fps.tick(), debug.get("counts"))
+                cv2.imshow(window_name, annotated)
+                if cv2.waitKey(1) & 0xFF == ord("q"):
+                    break
+
+            if progress_every_s > 0 and time.time() - last_progress >= progress_every_s:
+                last_progress = time.time()
+                elapsed = last_progress - t_start
+                print(f"[CV replay] t={ts:.1f}s frames={read} processed={processed} speed={ts / elapsed:.1f}x")
+    finally:
+        if show_window:
+            cv2.destroyAllWindows()
+
+    wall = time.time() - t_start
+    video_s = source.timestamp_s
+    return {
+        "frames_read": read,
+        "frames_processed": processed,
+        "video_s": round(video_s, 3),
+        "wall_s": round(wall, 3),
+        "speedup": round(video_s / wall, 2) if wall > 0 else 0.0,
+        "events": getattr(sink, "count", None),
+    }
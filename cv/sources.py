@@ -0,0 +1,129 @@
+import os
+import time
+
+import cv2
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff", ".webp")
+
+
+class CameraSource:
+    """Live camera by index. Timestamps are wall-clock seconds since open."""
+    live = True
+
+    def __init__(self, index, width=None, height=None, fps=None):
+        self.cap = cv2.VideoCapture(int(index))
+        if width:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, int(width))
+        if height:
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, int(height))
+        if fps:
+            self.cap.set(cv2.CAP_PROP_FPS, int(fps))
+        self.fps = float(self.cap.get(cv2.CAP_PROP_FPS) or fps or 30.0)
+        self._t0 = time.time()
+        self.timestamp_s = 0.0
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def read(self):
+        ok, frame = self.cap.read()
+        self.timestamp_s = time.time() - self._t0
+        return ok, frame
+
+    def grab(self):
+        ok = self.cap.grab()
+        self.timestamp_s = time.time() - self._t0
+        return ok
+
+    def retrieve(self):
+        return self.cap.retrieve()
+
+    def release(self):
+        self.cap.release()
+
+
+class VideoFileSource(CameraSource):
+    """
+    Recorded video. Timestamps come from the container (CAP_PROP_POS_MSEC), so
+    frame skipping is tied to video time. grab() advances without decoding.
+    """
+    live = False
+
+    def __init__(self, path):
+        self.path = path
+        self.cap = cv2.VideoCapture(path)
+        self.fps = float(self.cap.get(cv2.CAP_PROP_FPS) or 30.0)
+        self.frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        self._frame_i = -1
+        self.timestamp_s = 0.0
+
+    def _update_ts(self):
+        self._frame_i += 1
+        msec = self.cap.get(cv2.CAP_PROP_POS_MSEC)
+        # some backends report 0 for every frame; fall back to index / fps
+        self.timestamp_s = msec / 1000.0 if msec > 0 or self._frame_i == 0 else self._frame_i / self.fps
+
+    def read(self):
+        ok, frame = self.cap.read()
+        if ok:
+            self._update_ts()
+        return ok, frame
+
+    def grab(self):
+        ok = self.cap.grab()
+        if ok:
+            self._update_ts()
+        return ok
+
+
+class ImageDirSource:
+    """Sorted image files in a directory, played back at `fps` (timestamp = index / fps)."""
+    live = False
+
+    def __init__(self, path, fps=30.0):
+        self.path = path
+        self.files = sorted(
+            os.path.join(path, f) for f in os.listdir(path) if f.lower().endswith(IMAGE_EXTS)
+        )
+        self.fps = float(fps)
+        self.frame_count = len(self.files)
+        self._i = -1
+        self.timestamp_s = 0.0
+
+    def isOpened(self):
+        return bool(self.files)
+
+    def grab(self):
+        if self._i + 1 >= len(self.files):
+            return False
+        self._i += 1
+        self.timestamp_s = self._i / self.fps
+        return True
+
+    def retrieve(self):
+        frame = cv2.imread(self.files[self._i])
+        return frame is not None, frame
+
+    def read(self):
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def release(self):
+        pass
+
+
+def open_source(spec, cam_cfg=None, dir_fps=30.0):
+    """
+    spec: camera index ("0"), a video file path, or a directory of images.
+    None -> the camera from config (cam_cfg).
+    """
+    cam_cfg = cam_cfg or {}
+    if spec is None or str(spec).isdigit():
+        index = int(spec) if spec is not None else int(cam_cfg.get("index", 0))
+        return CameraSource(index, cam_cfg.get("width"), cam_cfg.get("height"), cam_cfg.get("fps"))
+    if os.path.isdir(spec):
+        return ImageDirSource(spec, fps=dir_fps)
+    if not os.path.exists(spec):
+        raise FileNotFoundError(spec)
+    return VideoFileSource(spec)
@@ -0,0 +1,124 @@
+import numpy as np
+
+try:
+    from scipy.optimize import linear_sum_assignment as _scipy_lsa
+except Exception:  # scipy is optional
+    _scipy_lsa = None
+
+
+def _empty():
+    return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+
+def _hungarian(cost):
+    """
+    Shortest augmenting path Hungarian algorithm (rows <= cols).
+    Inner loops over columns are vectorized with NumPy.
+    """
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=np.int64)    # p[j] = row (1-based) assigned to column j
+    way = np.zeros(m + 1, dtype=np.int64)
+
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+            cur = cost[i0 - 1] - u[i0] - v[1:]
+
+            better = free & (cur < minv[1:])
+            minv[1:][better] = cur[better]
+            way[1:][better] = j0
+
+            masked = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(masked)) + 1
+            delta = masked[j1 - 1]
+
+            used_cols = np.nonzero(used)[0]
+            u[p[used_cols]] += delta
+            v[used_cols] -= delta
+            minv[1:][free] -= delta
+
+            j0 = j1
+            if p[j0] == 0:
+                break
+
+        while True:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+            if j0 == 0:
+                break
+
+    cols = np.nonzero(p[1:])[0]
+    rows = p[1:][cols] - 1
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+
+def linear_assignment(cost):
+    """
+    Optimal min-cost assignment for a (finite) cost matrix.
+    Uses scipy if installed, else a NumPy Hungarian implementation.
+    Returns (row_idx, col_idx).
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    if cost.size == 0:
+        return _empty()
+    if _scipy_lsa is not None:
+        rows, cols = _scipy_lsa(cost)
+        return rows.astype(np.int64), cols.astype(np.int64)
+
+    if cost.shape[0] > cost.shape[1]:
+        cols, rows = _hungarian(cost.T)
+        order = np.argsort(rows)
+        return rows[order], cols[order]
+    return _hungarian(cost)
+
+
+def greedy_assignment(cost, valid):
+    """
+    Global greedy assignment: accept valid pairs in order of increasing cost.
+    Cheaper than the optimal solver for very large scenes.
+    Returns (row_idx, col_idx).
+    """
+    ri, ci = np.nonzero(valid)
+    if ri.size == 0:
+        return _empty()
+    order = np.argsort(cost[ri, ci], kind="stable")
+
+    used_r = np.zeros(cost.shape[0], dtype=bool)
+    used_c = np.zeros(cost.shape[1], dtype=bool)
+    rows, cols = [], []
+    for k in order:
+        r, c = ri[k], ci[k]
+        if used_r[r] or used_c[c]:
+            continue
+        used_r[r] = True
+        used_c[c] = True
+        rows.append(r)
+        cols.append(c)
+    return np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)
+
+
+def iou_matrix(a, b):
+    """
+    Pairwise IoU between boxes a (N,4) and b (M,4), xyxy format.
+    """
+    a = np.asarray(a, dtype=np.float64).reshape(-1, 4)
+    b = np.asarray(b, dtype=np.float64).reshape(-1, 4)
+    ix1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    iy1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    ix2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    iy2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(ix2 - ix1, 0, None) * np.clip(iy2 - iy1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]).clip(0) * (a[:, 3] - a[:, 1]).clip(0)
+    area_b = (b[:, 2] - b[:, 0]).clip(0) * (b[:, 3] - b[:, 1]).clip(0)
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
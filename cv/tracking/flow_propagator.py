@@ -0,0 +1,97 @@
+import cv2
+import numpy as np
+
+
+class FlowPropagator:
+    """
+    Moves track boxes on frames without detection using sparse Lucas-Kanade
+    optical flow. reset() is called on detection frames: a few corner points
+    are picked inside every track box. propagate() tracks all points to the
+    new frame in one pyramidal LK call and shifts each box by the median
+    motion of its surviving points (at least min_points, else the box stays).
+    Works on a gray copy downscaled so its longest side is at most max_side.
+    """
+    def __init__(self, max_side=640, points_per_box=8, min_points=3, win_size=15, levels=2, max_error=30.0):
+        self.max_side = int(max_side)
+        self.points_per_box = int(points_per_box)
+        self.min_points = max(1, int(min_points))
+        self.lk_params = dict(
+            winSize=(int(win_size), int(win_size)),
+            maxLevel=int(levels),
+            criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03),
+        )
+        self.max_error = float(max_error)
+        self.scale = 1.0
+        self.prev = None
+        self.points = np.zeros((0, 1, 2), dtype=np.float32)  # LK layout, in scaled pixels
+        self.owner = np.zeros(0, dtype=np.int64)             # point -> track id
+        self.boxes = {}                                       # track id -> float box, frame pixels
+
+    @property
+    def active(self):
+        return self.prev is not None and len(self.points) > 0
+
+    def _gray(self, frame_bgr):
+        h, w = frame_bgr.shape[:2]
+        self.scale = min(1.0, float(self.max_side) / max(w, h))
+        if self.scale < 1.0:
+            frame_bgr = cv2.resize(frame_bgr, (int(round(w * self.scale)), int(round(h * self.scale))),
+                                   interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2GRAY)
+
+    def reset(self, frame_bgr, tracks):
+        """tracks: [{track_id, bbox}, ...] as placed by the detector on this frame."""
+        gray = self._gray(frame_bgr)
+        gh, gw = gray.shape
+        s = self.scale
+        points, owner = [], []
+        self.boxes = {}
+        for t in tracks:
+            x1, y1, x2, y2 = t["bbox"]
+            self.boxes[t["track_id"]] = np.array([x1, y1, x2, y2], dtype=np.float64)
+            # one pixel of margin so the object's outline corners are inside the ROI
+            rx1, ry1 = max(0, int(x1 * s) - 1), max(0, int(y1 * s) - 1)
+            rx2, ry2 = min(gw, int(x2 * s) + 2), min(gh, int(y2 * s) + 2)
+            if rx2 - rx1 < 4 or ry2 - ry1 < 4:
+                continue
+            c = cv2.goodFeaturesToTrack(gray[ry1:ry2, rx1:rx2], maxCorners=self.points_per_box,
+                                        qualityLevel=0.01, minDistance=3)
+            if c is None or len(c) < self.min_points:
+                continue
+            points.append(c.reshape(-1, 2) + (rx1, ry1))
+            owner.extend([t["track_id"]] * len(c))
+
+        self.prev = gray
+        self.points = np.concatenate(points).astype(np.float32).reshape(-1, 1, 2) if points \
+            else np.zeros((0, 1, 2), dtype=np.float32)
+        self.owner = np.asarray(owner, dtype=np.int64)
+
+    def propagate(self, frame_bgr):
+        """Returns {track_id: [x1, y1, x2, y2]} for the boxes that moved with enough points."""
+        gray = self._gray(frame_bgr)
+        if not self.active or gray.shape != self.prev.shape:
+            self.prev = gray
+            return {}
+
+        nxt, status, err = cv2.calcOpticalFlowPyrLK(self.prev, gray, self.points, None, **self.lk_params)
+        self.prev = gray
+        ok = (status.ravel() == 1) & (err.ravel() < self.max_error)
+        disp = (nxt - self.points).reshape(-1, 2)[ok] / self.scale
+        owner = self.owner[ok]
+        self.points, self.owner = nxt[ok], owner
+
+        out = {}
+        if not len(owner):
+            return out
+        # median displacement per track: sort by owner, split into groups
+        order = np.argsort(owner, kind="stable")
+        owner, disp = owner[order], disp[order]
+        tids, starts, counts = np.unique(owner, return_index=True, return_counts=True)
+        for tid, a, n in zip(tids.tolist(), starts.tolist(), counts.tolist()):
+            if n < self.min_points:
+                continue
+            dx, dy = np.median(disp[a:a + n], axis=0)
+            box = self.boxes[tid]
+            box += (dx, dy, dx, dy)
+            out[tid] = np.round(box).astype(int).tolist()
+        return out
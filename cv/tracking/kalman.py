@@ -0,0 +1,92 @@
+import numpy as np
+
+
+class KalmanBank:
+    """
+    Constant-velocity Kalman filters for all tracks at once.
+    State per track: [cx, cy, vx, vy] (pixels, pixels per step); rows are
+    packed into (T, 4) / (T, 4, 4) arrays, so predict() and update() are a
+    few batched NumPy ops regardless of the number of tracks.
+      process_noise:        acceleration noise (px / step^2)
+      measurement_noise:    centroid noise (px)
+      initial_velocity_std: velocity spread of a new track (px / step)
+    """
+
+    def __init__(self, process_noise=4.0, measurement_noise=8.0, initial_velocity_std=20.0):
+        self.q = float(process_noise) ** 2
+        self.r = float(measurement_noise) ** 2
+        self.v0 = float(initial_velocity_std) ** 2
+        self.x = np.zeros((0, 4))
+        self.P = np.zeros((0, 4, 4))
+        self.ids = []    # row -> track id
+        self.row = {}    # track id -> row
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, tid):
+        return tid in self.row
+
+    def add(self, tid, center):
+        self.row[tid] = len(self.ids)
+        self.ids.append(tid)
+        self.x = np.vstack([self.x, [[center[0], center[1], 0.0, 0.0]]])
+        self.P = np.concatenate([self.P, np.diag([self.r, self.r, self.v0, self.v0])[None]])
+
+    def remove(self, tid):
+        """Swap the last row into the removed one (O(1) per track)."""
+        i = self.row.pop(tid)
+        last = len(self.ids) - 1
+        if i != last:
+            moved = self.ids[last]
+            self.ids[i] = moved
+            self.row[moved] = i
+            self.x[i] = self.x[last]
+            self.P[i] = self.P[last]
+        self.ids.pop()
+        self.x = self.x[:last]
+        self.P = self.P[:last]
+
+    def predict(self, dt=1.0):
+        """Advance every track by dt steps."""
+        if not len(self):
+            return
+        F = np.eye(4)
+        F[0, 2] = F[1, 3] = dt
+        # white-acceleration process noise
+        g = np.array([dt * dt / 2, dt * dt / 2, dt, dt])
+        Q = self.q * np.outer(g, g) * np.array([[1, 0, 1, 0], [0, 1, 0, 1], [1, 0, 1, 0], [0, 1, 0, 1]])
+        self.x = self.x @ F.T
+        self.P = F @ self.P @ F.T + Q
+
+    def update(self, tids, centers):
+        """Correct the listed tracks with measured centres (N, 2)."""
+        if not len(tids):
+            return
+        rows = np.fromiter((self.row[t] for t in tids), dtype=np.int64, count=len(tids))
+        x, P = self.x[rows], self.P[rows]
+        y = np.asarray(centers, dtype=np.float64) - x[:, :2]
+        S = P[:, :2, :2] + self.r * np.eye(2)
+        K = P[:, :, :2] @ np.linalg.inv(S)                  # (N, 4, 2)
+        self.x[rows] = x + (K @ y[:, :, None])[:, :, 0]
+        self.P[rows] = P - K @ P[:, :2, :]                   # (I - K H) P
+
+    def mahalanobis2(self, tids, centers):
+        """
+        Squared Mahalanobis distance (D, T) of measured centres (D, 2) to the
+        predicted centres of the listed tracks, using each track's innovation
+        covariance, so the gate is wide for new / coasting tracks and tight
+        for settled ones.
+        """
+        rows = np.fromiter((self.row[t] for t in tids), dtype=np.int64, count=len(tids))
+        S_inv = np.linalg.inv(self.P[rows, :2, :2] + self.r * np.eye(2))
+        c = np.asarray(centers, dtype=np.float64)
+        dx = c[:, 0:1] - self.x[rows, 0][None, :]
+        dy = c[:, 1:2] - self.x[rows, 1][None, :]
+        # 2x2 quadratic form written out: cheaper than an einsum over (D, T, 2, 2)
+        return S_inv[:, 0, 0] * dx * dx + 2.0 * S_inv[:, 0, 1] * dx * dy + S_inv[:, 1, 1] * dy * dy
+
+    def positions(self, tids):
+        """Predicted centres (N, 2) for the listed tracks."""
+        rows = np.fromiter((self.row[t] for t in tids), dtype=np.int64, count=len(tids))
+        return self.x[rows, :2]
@@ -0,0 +1,70 @@
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """
+    Cheap per-zone motion check used to decide whether a frame needs full detection.
+
+    The frame is downscaled (longest side = max_side), converted to gray and
+    blurred, then diffed against the reference taken at the last detection.
+    Pixels that changed by more than `threshold` and lie inside a zone, or
+    within `margin_px` of one, count as motion. Comparing against the last
+    detection frame instead of the previous frame means slow drifts still
+    add up and trigger eventually.
+
+    update() returns (motion, per_zone): motion is True when the changed area
+    near any zone exceeds min_area_fraction of that area, and per_zone maps
+    zone_id -> changed pixel count (only zones with motion are listed).
+    """
+    def __init__(self, zone_map, max_side=320, threshold=15, min_area_fraction=0.0005, margin_px=32, blur=5):
+        self.max_side = int(max_side)
+        self.threshold = int(threshold)
+        self.min_area_fraction = float(min_area_fraction)
+        self.margin_px = float(margin_px)
+        self.blur = int(blur) | 1
+        self.reference = None
+        self._last = None
+        self.set_zone_map(zone_map)
+
+    def set_zone_map(self, zone_map):
+        """(Re)compile the zone masks, e.g. after the frame size or zones change."""
+        self.zone_map = zone_map
+        w, h = zone_map.width, zone_map.height
+        self.scale = min(1.0, float(self.max_side) / max(w, h))
+        self.size = (max(1, int(round(w * self.scale))), max(1, int(round(h * self.scale))))
+
+        self.labels = cv2.resize(zone_map.labels, self.size, interpolation=cv2.INTER_NEAREST)
+        near = (self.labels > 0).astype(np.uint8)
+        r = int(round(self.margin_px * self.scale))
+        if r > 0:
+            near = cv2.dilate(near, cv2.getStructuringElement(cv2.MORPH_RECT, (2 * r + 1, 2 * r + 1)))
+        self.near = near.astype(bool)
+        self.min_changed_px = max(1, int(self.near.sum() * self.min_area_fraction))
+        self.reference = None
+
+    def _small_gray(self, frame_bgr):
+        small = cv2.resize(frame_bgr, self.size, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        if self.blur > 1:
+            gray = cv2.GaussianBlur(gray, (self.blur, self.blur), 0)
+        return gray
+
+    def update(self, frame_bgr):
+        gray = self._small_gray(frame_bgr)
+        self._last = gray
+        if self.reference is None:
+            return True, {}
+
+        changed = (cv2.absdiff(gray, self.reference) > self.threshold) & self.near
+        n_changed = int(np.count_nonzero(changed))
+        if n_changed < self.min_changed_px:
+            return False, {}
+
+        counts = np.bincount(self.labels[changed].ravel(), minlength=len(self.zone_map.zone_ids))
+        per_zone = {self.zone_map.zone_ids[i]: int(c) for i, c in enumerate(counts) if i > 0 and c > 0}
+        return True, per_zone
+
+    def mark_detected(self):
+        """Detection ran on the last frame passed to update(): it becomes the new reference."""
+        self.reference = self._last
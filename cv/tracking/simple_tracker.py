@@ -2,6 +2,14 @@ from typing import Dict, List, Optional, Tuple
 import math
 import time
 
+import numpy as np
+
+from cv.detectors.detections import Detections
+from cv.tracking.assignment import greedy_assignment, iou_matrix, linear_assignment
+from cv.tracking.kalman import KalmanBank
+
+CHI2_2D_99 = 9.21  # 99% quantile of chi-square with 2 dof
+
 def bbox_center(b):
     x1, y1, x2, y2 = b
     return (x1 + x2) / 2.0, (y1 + y2) / 2.0
@@ -11,7 +19,10 @@ def dist(a, b):
 
 class SimpleTracker:
     """
-    Lightweight multi-object tracker using centroid matching (greedy).
+    Lightweight multi-object tracker using centroid + IoU matching.
+    Detections and tracks are matched globally with an optimal assignment
+    (Hungarian) over a NumPy cost matrix; very large scenes fall back to a
+    global greedy pass over the same matrix.
     Emits per-object events:
       - transfers: Zone_A -> Zone_B (direct) OR Zone_A -> None -> Zone_B (gap)
       - enters:    Outside(None) -> Zone_X
@@ -22,6 +33,12 @@ class SimpleTracker:
       - "Outside" is represented by zone_id == None.
       - We do NOT emit exit immediately when it becomes None because it might be a gap transfer.
         We emit exit only after the gap exceeds max_zone_gap_frames, or on track expiration.
+      - motion_model="kalman" matches against constant-velocity predictions (one
+        KalmanBank for all tracks) instead of last-seen centroids, so objects that move
+        far between sparse detections (process_every_n_frames > 1) keep their IDs.
+        A pair beyond match_dist_px is still allowed when it lies inside the track's
+        predicted uncertainty (99% Mahalanobis gate), e.g. a young track whose
+        velocity is not known yet.
     """
     def __init__(
         self,
@@ -29,6 +46,11 @@ class SimpleTracker:
         match_dist_px: float = 140.0,
         max_zone_gap_frames: int = 10,
         enforce_same_label: bool = True,
+        iou_weight: float = 0.5,
+        max_optimal_size: int = 300,
+        motion_model: str = "none",
+        kalman_process_noise: float = 4.0,
+        kalman_measurement_noise: float = 8.0,
     ):
         self.next_id = 1
         self.tracks: Dict[int, dict] = {}
@@ -36,6 +58,12 @@ class SimpleTracker:
         self.match_dist_px = float(match_dist_px)
         self.max_zone_gap_frames = int(max_zone_gap_frames)
         self.enforce_same_label = bool(enforce_same_label)
+        self.iou_weight = float(iou_weight)
+        # above this many detections or tracks, use the greedy fallback
+        self.max_optimal_size = int(max_optimal_size)
+        if motion_model not in ("none", "kalman"):
+            raise ValueError(f"unknown motion_model {motion_model!r} (expected 'none' or 'kalman')")
+        self.kf = KalmanBank(kalman_process_noise, kalman_measurement_noise) if motion_model == "kalman" else None
         self.frame_i = 0
 
     def _start_gap(self, t: dict, from_zone: str):
@@ -49,9 +77,142 @@ class SimpleTracker:
         t["zone_gap_start_frame"] = None
         t["exit_emitted"] = False
 
-    def update(self, detections: List[dict]) -> Tuple[List[dict], List[dict], List[dict], List[dict]]:
+    def _zone_events(self, tid: int, t: dict, label: str, prev_zone, new_zone, transfers: list, enters: list):
+        """Zone transition of a live track: appends transfer/enter events and updates its zone."""
+        # A) direct transfer: Zone -> Zone
+        if prev_zone is not None and new_zone is not None and prev_zone != new_zone:
+            transfers.append({
+                "track_id": tid,
+                "label": label,
+                "from_zone": prev_zone,
+                "to_zone": new_zone,
+                "reason": "direct_zone_change",
+            })
+            self._clear_gap(t)
+
+        # B) leaving zone into outside: start gap (but don't exit yet)
+        if prev_zone is not None and new_zone is None:
+            self._start_gap(t, from_zone=prev_zone)
+
+        # C) entering a zone from outside:
+        #    could be (i) a gap transfer completion OR (ii) a true enter from outside
+        if prev_zone is None and new_zone is not None:
+            gap_from = t.get("zone_gap_from")
+            gap_start = t.get("zone_gap_start_frame")
+
+            if gap_from is not None and gap_start is not None:
+                gap_len = self.frame_i - gap_start
+                if gap_len <= self.max_zone_gap_frames and gap_from != new_zone:
+                    # complete a gap transfer
+                    transfers.append({
+                        "track_id": tid,
+                        "label": label,
+                        "from_zone": gap_from,
+                        "to_zone": new_zone,
+                        "reason": "no_zone_gap",
+                    })
+                else:
+                    # gap too long => treat as enter (it disappeared then reappeared)
+                    enters.append({
+                        "track_id": tid,
+                        "label": label,
+                        "to_zone": new_zone,
+                        "reason": "enter_after_long_gap",
+                    })
+                self._clear_gap(t)
+            else:
+                # no gap recorded => true enter
+                enters.append({
+                    "track_id": tid,
+                    "label": label,
+                    "to_zone": new_zone,
+                    "reason": "enter_from_outside",
+                })
+        # Update current zone at end
+        t["zone_id"] = new_zone
+
+    def propagate(self, updates: Dict[int, tuple]) -> List[dict]:
+        """
+        Move tracks between detections (e.g. boxes from optical flow).
+        updates: {track_id: (bbox, zone_id)}
+        The propagated zone is only reported in tracks_out (for drawing and
+        counts): no event is emitted and the track's confirmed zone is kept, so
+        a zone change is published once a detection confirms it and flow drift
+        across a boundary never produces a transfer. Doesn't count as a
+        sighting either (ages, gaps and the motion model are untouched).
+        Returns tracks_out covering the tracks seen at the last update.
+        """
+        tracks_out = []
+        for tid, t in self.tracks.items():
+            if t["last_seen_frame"] != self.frame_i:
+                continue
+            zone_id, prev_zone_id = t.get("zone_id"), t.get("prev_zone_id")
+            if tid in updates:
+                bbox, new_zone = updates[tid]
+                t["bbox"] = bbox
+                t["center"] = bbox_center(bbox)
+                if new_zone != zone_id:
+                    zone_id, prev_zone_id = new_zone, t.get("zone_id")
+            tracks_out.append({
+                "track_id": tid,
+                "label": t["label"],
+                "conf": t["conf"],
+                "bbox": t["bbox"],
+                "zone_id": zone_id,
+                "prev_zone_id": prev_zone_id,
+            })
+        return tracks_out
+
+    def _match(self, det_labels, det_boxes, det_centers, track_ids):
+        """
+        Build a (detections x tracks) cost matrix and solve it.
+        cost = normalized centroid distance + iou_weight * (1 - IoU)
+        Pairs beyond match_dist_px (or with different labels, if enforced) are gated out.
+        Returns (det_idx, track_idx).
+        """
+        tracks = [self.tracks[tid] for tid in track_ids]
+        trk_centers = np.asarray([t["center"] for t in tracks], dtype=np.float64)
+        trk_boxes = np.asarray([t["bbox"] for t in tracks], dtype=np.float64)
+        if self.kf is not None:
+            # match against predicted positions; boxes move with their predicted centre
+            predicted = self.kf.positions(track_ids)
+            shift = predicted - trk_centers
+            trk_boxes = trk_boxes + np.hstack([shift, shift])
+            trk_centers = predicted
+
+        diff = det_centers[:, None, :] - trk_centers[None, :, :]
+        d = np.hypot(diff[..., 0], diff[..., 1])
+        valid = d <= self.match_dist_px
+        if self.kf is not None:
+            valid |= self.kf.mahalanobis2(track_ids, det_centers) <= CHI2_2D_99
+
+        if self.enforce_same_label:
+            labels = {}
+            det_lab = np.asarray([labels.setdefault(x, len(labels)) for x in det_labels])
+            trk_lab = np.asarray([labels.setdefault(t["label"], len(labels)) for t in tracks])
+            valid &= det_lab[:, None] == trk_lab[None, :]
+
+        if not valid.any():
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        cost = d / max(self.match_dist_px, 1e-6)
+        if self.iou_weight > 0:
+            cost = cost + self.iou_weight * (1.0 - iou_matrix(det_boxes, trk_boxes))
+
+        if max(cost.shape) > self.max_optimal_size:
+            return greedy_assignment(cost, valid)
+
+        # gated pairs get a cost no valid pair can reach, then are dropped
+        big = float(cost[valid].max()) * 2.0 + 1e3
+        rows, cols = linear_assignment(np.where(valid, cost, big))
+        keep = valid[rows, cols]
+        return rows[keep], cols[keep]
+
+    def update(self, detections, dt: float = 1.0) -> Tuple[List[dict], List[dict], List[dict], List[dict]]:
         """
-        detections: list of dicts with keys: bbox, label, conf, zone_id
+        detections: Detections (zone-assigned), or a list of dicts with keys: bbox, label, conf, zone_id
+        dt: time since the previous update, in the unit velocities are kept in (kalman only;
+            default one step per update)
         Returns:
           tracks_out: list[{track_id,label,conf,bbox,zone_id,prev_zone_id}]
           transfers:  list[{track_id,label,from_zone,to_zone,reason}]
@@ -61,42 +222,37 @@ class SimpleTracker:
         self.frame_i += 1
         now = time.time()
 
+        # Columns, converted to Python lists once (not per detection)
+        dets = Detections.coerce(detections)
+        n_dets = len(dets)
+        det_bbox = dets.boxes.tolist()
+        det_conf = dets.conf.tolist()
+        det_labels = dets.label_list()
+        det_zones = dets.zone_id_list()
+
         # Prepare detection centers
-        det_centers = []
-        for d in detections:
-            cx, cy = bbox_center(d["bbox"])
-            det_centers.append((cx, cy))
+        det_boxes = dets.boxes.astype(np.float64)
+        det_centers_np = np.stack(
+            [(det_boxes[:, 0] + det_boxes[:, 2]) / 2.0, (det_boxes[:, 1] + det_boxes[:, 3]) / 2.0], axis=1
+        )
+        det_centers = [tuple(c) for c in det_centers_np.tolist()]
+
+        if self.kf is not None:
+            self.kf.predict(dt)
 
         # Mark tracks as unmatched initially
         for tid in self.tracks:
             self.tracks[tid]["matched"] = False
 
-        # Match detections to existing tracks (greedy nearest)
-        assigned_track = [-1] * len(detections)
-        used_tracks = set()
-
-        # Greedy nearest-centroid matching
-        for di, d in enumerate(detections):
-            best_tid = None
-            best_dist = 1e9
-            cx, cy = det_centers[di]
-
-            for tid, t in self.tracks.items():
-                if tid in used_tracks:
-                    continue
-                # Option: enforce same label to reduce ID swaps
-                if self.enforce_same_label and t["label"] != d["label"]:
-                    continue
-                tcx, tcy = t["center"]
-                dd = dist((cx, cy), (tcx, tcy))
-                if dd < best_dist and dd <= self.match_dist_px:
-                    best_dist = dd
-                    best_tid = tid
-
-            if best_tid is not None:
-                assigned_track[di] = best_tid
-                used_tracks.add(best_tid)
-                self.tracks[best_tid]["matched"] = True
+        # Match detections to existing tracks (global min-cost assignment)
+        assigned_track = [-1] * n_dets
+        track_ids = list(self.tracks.keys())
+        if n_dets and track_ids:
+            rows, cols = self._match(det_labels, det_boxes, det_centers_np, track_ids)
+            for di, ti in zip(rows.tolist(), cols.tolist()):
+                tid = track_ids[ti]
+                assigned_track[di] = tid
+                self.tracks[tid]["matched"] = True
 
         transfers = []
         enters = []
@@ -104,11 +260,11 @@ class SimpleTracker:
         tracks_out = []
 
         # Update matched tracks / create new tracks
-        for di, d in enumerate(detections):
+        for di in range(n_dets):
             cx, cy = det_centers[di]
             tid = assigned_track[di]
-            new_zone = d.get("zone_id")
-            label = d["label"]
+            new_zone = det_zones[di]
+            label = det_labels[di]
 
             if tid == -1:
                 tid = self.next_id
@@ -116,8 +272,8 @@ class SimpleTracker:
                 self.tracks[tid] = {
                     "label": label,
                     "center": (cx, cy),
-                    "bbox": d["bbox"],
-                    "conf": d["conf"],
+                    "bbox": det_bbox[di],
+                    "conf": det_conf[di],
                     "zone_id": new_zone,
                     "prev_zone_id": None,
                     "last_seen_frame": self.frame_i,
@@ -129,6 +285,8 @@ class SimpleTracker:
                     "zone_gap_start_frame": None,
                     "exit_emitted": False,
                 }
+                if self.kf is not None:
+                    self.kf.add(tid, (cx, cy))
                 
                 if new_zone is not None:
                     enters.append({
@@ -148,64 +306,12 @@ class SimpleTracker:
 
                 # Update geometry/conf
                 t["center"] = (cx, cy)
-                t["bbox"] = d["bbox"]
-                t["conf"] = d["conf"]
+                t["bbox"] = det_bbox[di]
+                t["conf"] = det_conf[di]
                 t["last_seen_frame"] = self.frame_i
                 t["last_seen_time"] = now
 
-                # ---- Events ----
-
-                # A) direct transfer: Zone -> Zone
-                if prev_zone is not None and new_zone is not None and prev_zone != new_zone:
-                    transfers.append({
-                        "track_id": tid,
-                        "label": label,
-                        "from_zone": prev_zone,
-                        "to_zone": new_zone,
-                        "reason": "direct_zone_change",
-                    })
-                    self._clear_gap(t)
-
-                # B) leaving zone into outside: start gap (but don't exit yet)
-                if prev_zone is not None and new_zone is None:
-                    self._start_gap(t, from_zone=prev_zone)
-
-                # C) entering a zone from outside:
-                #    could be (i) a gap transfer completion OR (ii) a true enter from outside
-                if prev_zone is None and new_zone is not None:
-                    gap_from = t.get("zone_gap_from")
-                    gap_start = t.get("zone_gap_start_frame")
-
-                    if gap_from is not None and gap_start is not None:
-                        gap_len = self.frame_i - gap_start
-                        if gap_len <= self.max_zone_gap_frames and gap_from != new_zone:
-                            # complete a gap transfer
-                            transfers.append({
-                                "track_id": tid,
-                                "label": label,
-                                "from_zone": gap_from,
-                                "to_zone": new_zone,
-                                "reason": "no_zone_gap",
-                            })
-                        else:
-                            # gap too long => treat as enter (it disappeared then reappeared)
-                            enters.append({
-                                "track_id": tid,
-                                "label": label,
-                                "to_zone": new_zone,
-                                "reason": "enter_after_long_gap",
-                            })
-                        self._clear_gap(t)
-                    else:
-                        # no gap recorded => true enter
-                        enters.append({
-                            "track_id": tid,
-                            "label": label,
-                            "to_zone": new_zone,
-                            "reason": "enter_from_outside",
-                        })
-                # Update current zone at end
-                t["zone_id"] = new_zone
+                self._zone_events(tid, t, label, prev_zone, new_zone, transfers, enters)
 
             # Add to output list
             t2 = self.tracks[tid]
@@ -218,6 +324,11 @@ class SimpleTracker:
                 "prev_zone_id": t2.get("prev_zone_id"),
             })
 
+        if self.kf is not None:
+            # correct all matched tracks in one batch
+            matched = [di for di, tid in enumerate(assigned_track) if tid != -1]
+            self.kf.update([assigned_track[di] for di in matched], det_centers_np[matched])
+
         # Handle unmatched tracks: confirm exits if gap is too long
         for tid, t in list(self.tracks.items()):
             if t.get("matched"):
@@ -237,6 +348,8 @@ class SimpleTracker:
                         "reason": "exit_on_expire",
                     })
                 self.tracks.pop(tid, None)
+                if self.kf is not None:
+                    self.kf.remove(tid)
                 continue
             
             # If it has an active gap and it has lasted too long => confirm exit
@@ -1,3 +1,9 @@
+import cv2
+import numpy as np
+
+from cv.detectors.detections import Detections
+
+
 def bbox_center(b):
     x1, y1, x2, y2 = b
     return (x1 + x2) // 2, (y1 + y2) // 2
@@ -5,17 +11,124 @@ def bbox_center(b):
 def point_in_rect(px, py, rect):
     return rect["x1"] <= px <= rect["x2"] and rect["y1"] <= py <= rect["y2"]
 
-def assign_to_zones(detections, zones):
+def point_in_zone(px, py, zone):
+    shape = zone.get("shape", "rect")
+    if shape == "rect":
+        return point_in_rect(px, py, zone)
+    if shape == "polygon":
+        pts = np.asarray(zone["points"], dtype=np.float32).reshape(-1, 1, 2)
+        return cv2.pointPolygonTest(pts, (float(px), float(py)), False) >= 0
+    return False
+
+def zones_by_priority(zones):
+    """
+    Zones in match order: higher "priority" first, then file order
+    (so without priorities the first matching zone wins, as before).
+    """
+    order = sorted(range(len(zones)), key=lambda i: (-int(zones[i].get("priority", 0)), i))
+    return [zones[i] for i in order]
+
+
+class ZoneMap:
+    """
+    Zone list compiled once into an integer label image.
+      label 0      -> outside every zone
+      label i + 1  -> zones[i]
+    The raster is downscaled so its longest side is at most max_side px;
+    point lookups are a single array gather.
+    Supports "rect" (x1,y1,x2,y2) and "polygon" (points: [[x,y], ...]) zones,
+    with optional integer "priority" (higher wins where zones overlap).
+    """
+    def __init__(self, zones, frame_size, max_side=640):
+        self.zones = list(zones)
+        self.width, self.height = int(frame_size[0]), int(frame_size[1])
+        self.scale = min(1.0, float(max_side) / max(self.width, self.height))
+
+        mw = max(1, int(round(self.width * self.scale)))
+        mh = max(1, int(round(self.height * self.scale)))
+        dtype = np.uint8 if len(self.zones) < 255 else np.int32
+        self.labels = np.zeros((mh, mw), dtype=dtype)
+
+        # index -> zone_id lookup table (index 0 = no zone)
+        self.zone_ids = np.array([None] + [z["zone_id"] for z in self.zones], dtype=object)
+
+        # paint lowest priority first so the winner of an overlap is painted last
+        index = {id(z): i for i, z in enumerate(self.zones)}
+        for z in reversed(zones_by_priority(self.zones)):
+            self._paint(z, index[id(z)] + 1)
+
+    def _paint(self, z, label):
+        s = self.scale
+        shape = z.get("shape", "rect")
+        if shape == "rect":
+            x1, x2 = sorted((int(z["x1"] * s), int(z["x2"] * s)))
+            y1, y2 = sorted((int(z["y1"] * s), int(z["y2"] * s)))
+            self.labels[max(0, y1):y2 + 1, max(0, x1):x2 + 1] = label
+        elif shape == "polygon":
+            pts = np.round(np.asarray(z["points"], dtype=np.float64) * s).astype(np.int32)
+            cv2.fillPoly(self.labels, [pts.reshape(-1, 1, 2)], int(label))
+
+    def matches(self, frame_size):
+        return (int(frame_size[0]), int(frame_size[1])) == (self.width, self.height)
+
+    def lookup_indices(self, points):
+        """
+        points: (N,2) array of x,y in frame pixels.
+        Returns (N,) label array (0 = no zone, i + 1 = zones[i]).
+        """
+        pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        mh, mw = self.labels.shape
+        xs = (pts[:, 0] * self.scale).astype(np.int64)
+        ys = (pts[:, 1] * self.scale).astype(np.int64)
+        inside = (xs >= 0) & (xs < mw) & (ys >= 0) & (ys < mh)
+        out = np.zeros(len(pts), dtype=np.int64)
+        out[inside] = self.labels[ys[inside], xs[inside]]
+        return out
+
+    def lookup(self, points):
+        """
+        Returns a list of zone_id (or None) for each point.
+        """
+        return self.zone_ids[self.lookup_indices(points)].tolist()
+
+
+def assign_to_zones(detections, zones, zone_map=None):
     """
     For each detection, assign to at most one zone using bbox center point.
-    Returns list of detections with 'zone_id' (or None).
+    Detections in -> Detections out with zone_idx / zone_ids set.
+    Dict list in -> list of detections with 'zone_id' (or None).
+    With a compiled ZoneMap all detections are looked up in one gather.
     """
+    if isinstance(detections, Detections):
+        if zone_map is not None:
+            return detections.with_zones(zone_map.lookup_indices(detections.centers()), zone_map.zone_ids)
+        zone_ids = np.array([None] + [z["zone_id"] for z in zones], dtype=object)
+        index = {id(z): i + 1 for i, z in enumerate(zones)}
+        ordered = zones_by_priority(zones)
+        idx = [next((index[id(z)] for z in ordered if point_in_zone(cx, cy, z)), 0)
+               for cx, cy in detections.centers().tolist()]
+        return detections.with_zones(idx, zone_ids)
+
+    if zone_map is not None:
+        if not detections:
+            return []
+        boxes = np.asarray([d["bbox"] for d in detections], dtype=np.int64).reshape(-1, 4)
+        centers = np.stack([(boxes[:, 0] + boxes[:, 2]) // 2, (boxes[:, 1] + boxes[:, 3]) // 2], axis=1)
+        zone_ids = zone_map.lookup(centers)
+        out = []
+        for d, zid in zip(detections, zone_ids):
+            d2 = dict(d)
+            d2["zone_id"] = zid
+            out.append(d2)
+        return out
+
+    ordered = zones_by_priority(zones)
     out = []
     for d in detections:
         cx, cy = bbox_center(d["bbox"])
         zone_id = None
-        for z in zones:
-            if z.get("shape") == "rect" and point_in_rect(cx, cy, z):
+        for z in ordered:
+            if point_in_zone(cx, cy, z):
                 zone_id = z["zone_id"]
                 break
         d2 = dict(d)
@@ -29,4 +142,4 @@ def count_by_zone(detections, zones):
         zid = d.get("zone_id")
         if zid in counts:
             counts[zid] += 1
-    return counts
\ No newline at end of file
+    return counts
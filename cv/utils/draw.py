@@ -1,4 +1,5 @@
 import cv2
+import numpy as np
 
 def draw_rect_zone(frame, zone, color=(255, 255, 255), thickness=2):
     x1, y1, x2, y2 = zone["x1"], zone["y1"], zone["x2"], zone["y2"]
@@ -6,6 +7,16 @@ def draw_rect_zone(frame, zone, color=(255, 255, 255), thickness=2):
     cv2.putText(frame, zone["zone_id"], (x1 + 6, y1 + 24),
                 cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2, cv2.LINE_AA)
 
+def draw_zone(frame, zone, color=(255, 255, 255), thickness=2):
+    if zone.get("shape", "rect") == "polygon":
+        pts = np.asarray(zone["points"], dtype=np.int32).reshape(-1, 1, 2)
+        cv2.polylines(frame, [pts], True, color, thickness)
+        x1, y1 = pts[:, 0, 0].min(), pts[:, 0, 1].min()
+        cv2.putText(frame, zone["zone_id"], (int(x1) + 6, int(y1) + 24),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2, cv2.LINE_AA)
+        return
+    draw_rect_zone(frame, zone, color, thickness)
+
 def draw_bbox(frame, bbox, label, conf, color=(255, 255, 255)):
     x1, y1, x2, y2 = bbox
     cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
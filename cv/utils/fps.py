@@ -1,3 +1,4 @@
+import threading
 import time
 
 class FPS:
@@ -11,4 +12,29 @@ class FPS:
         self.last = now
         if dt > 0:
             self.value = 1.0 / dt
-        return self.value
\ No newline at end of file
+        return self.value
+
+class RateCounter:
+    """
+    Thread-safe event counter reporting average rate over the last report window.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.total = 0
+        self._window_count = 0
+        self._window_start = time.time()
+
+    def tick(self, n: int = 1):
+        with self._lock:
+            self.total += n
+            self._window_count += n
+
+    def rate(self, reset: bool = True) -> float:
+        with self._lock:
+            now = time.time()
+            dt = now - self._window_start
+            r = self._window_count / dt if dt > 0 else 0.0
+            if reset:
+                self._window_count = 0
+                self._window_start = now
+            return r
@@ -0,0 +1,150 @@
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+
+class RollingHistogram:
+    """
+    Last `window` samples in a fixed ring buffer: O(1) record, percentiles are
+    only computed when somebody asks (log line / metrics scrape).
+    """
+    def __init__(self, window=1000):
+        self.window = max(1, int(window))
+        self._buf = [0.0] * self.window
+        self._n = 0
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, value):
+        self._buf[self._n % self.window] = value
+        self._n += 1
+        self.count += 1
+        self.total += value
+
+    def summary(self):
+        n = min(self._n, self.window)
+        if n == 0:
+            return {"count": self.count, "mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+        samples = np.asarray(self._buf[:n])
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+        return {
+            "count": self.count,
+            "mean": round(float(samples.mean()), 3),
+            "p50": round(float(p50), 3),
+            "p95": round(float(p95), 3),
+            "p99": round(float(p99), 3),
+            "max": round(float(samples.max()), 3),
+        }
+
+
+class Metrics:
+    """
+    Per-stage timing histograms (ms) + monotonically increasing counters.
+    Thread-safe; cheap enough to call on every frame.
+    """
+    def __init__(self, window=1000, log_every_s=0.0):
+        self.window = int(window)
+        self.log_every_s = float(log_every_s)
+        self._lock = threading.Lock()
+        self._hist = {}
+        self._counters = {}
+        self._last_log = time.time()
+
+    def observe(self, name, value_ms):
+        with self._lock:
+            h = self._hist.get(name)
+            if h is None:
+                h = self._hist[name] = RollingHistogram(self.window)
+            h.record(value_ms)
+
+    def observe_many(self, timings):
+        with self._lock:
+            for name, value_ms in timings.items():
+                h = self._hist.get(name)
+                if h is None:
+                    h = self._hist[name] = RollingHistogram(self.window)
+                h.record(value_ms)
+
+    def inc(self, name, n=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "stages_ms": {name: h.summary() for name, h in self._hist.items()},
+                "counters": dict(self._counters),
+            }
+
+    def maybe_log(self):
+        """Emit one INFO line every log_every_s seconds (0 = never)."""
+        if self.log_every_s <= 0:
+            return
+        now = time.time()
+        if now - self._last_log < self.log_every_s:
+            return
+        self._last_log = now
+        log.info("cv metrics %s", format_log_line(self.snapshot()))
+
+
+def format_log_line(snap):
+    stages = " ".join(f"{k}={v['p50']}/{v['p95']}ms" for k, v in snap["stages_ms"].items())
+    counters = " ".join(f"{k}={v}" for k, v in sorted(snap["counters"].items()))
+    return f"{stages} | {counters}"
+
+
+def to_prometheus(snap, prefix="cv"):
+    lines = [f"# TYPE {prefix}_stage_ms summary"]
+    for stage, s in snap["stages_ms"].items():
+        for q in ("p50", "p95", "p99"):
+            lines.append(f'{prefix}_stage_ms{{stage="{stage}",quantile="0.{q[1:]}"}} {s[q]}')
+        lines.append(f'{prefix}_stage_ms_count{{stage="{stage}"}} {s["count"]}')
+    for name, value in sorted(snap["counters"].items()):
+        lines.append(f"# TYPE {prefix}_{name}_total counter")
+        lines.append(f"{prefix}_{name}_total {value}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """
+    Tiny local HTTP endpoint on a daemon thread:
+      GET /metrics       Prometheus text format
+      GET /metrics.json  Metrics.snapshot() as JSON
+    """
+    def __init__(self, metrics, host="127.0.0.1", port=9108):
+        metrics_ref = metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                snap = metrics_ref.snapshot()
+                if self.path == "/metrics":
+                    body, ctype = to_prometheus(snap).encode("utf-8"), "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body, ctype = json.dumps(snap).encode("utf-8"), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, fmt, *args):
+                log.debug("metrics http: " + fmt, *args)
+
+        self.httpd = ThreadingHTTPServer((host, int(port)), Handler)
+        self.port = self.httpd.server_address[1]
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="cv-metrics-http", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self._thread.join()
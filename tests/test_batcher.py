@@ -0,0 +1,134 @@
+import threading
+import time
+import unittest
+from concurrent.futures import wait
+
+import numpy as np
+
+from cv.detectors.batcher import DetectionBatcher
+from cv.detectors.detections import Detections
+from cv.detectors.factory import build_batcher
+
+
+def frame(i):
+    """Tiny frame tagged with its index in the top-left pixel."""
+    f = np.zeros((8, 8, 3), dtype=np.uint8)
+    f[0, 0, 0] = i
+    return f
+
+
+class TaggingDetector:
+    """detect_batch returns each frame's tag; records batch sizes."""
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.batches = []
+
+    def detect_batch(self, frames):
+        self.batches.append(len(frames))
+        if self.fail:
+            raise RuntimeError("model exploded")
+        return [int(f[0, 0, 0]) for f in frames]
+
+
+class FakeChunkModel:
+    def __init__(self):
+        self.sources = []
+
+    def predict(self, source, **kwargs):
+        self.sources.append(len(source))
+        return [type("R", (), {"boxes": None, "names": {0: "book"}})() for _ in source]
+
+
+class TestDetectionBatcher(unittest.TestCase):
+    def test_full_batch_flushes_without_waiting(self):
+        det = TaggingDetector()
+        batcher = DetectionBatcher(det, max_batch_size=4, max_wait_ms=5000)
+        t0 = time.monotonic()
+        futures = [batcher.submit(frame(i)) for i in range(4)]
+        self.assertEqual([f.result(timeout=2) for f in futures], [0, 1, 2, 3])
+        self.assertLess(time.monotonic() - t0, 1.0)
+        self.assertEqual(det.batches, [4])
+        batcher.close()
+
+    def test_partial_batch_flushes_after_max_wait(self):
+        det = TaggingDetector()
+        batcher = DetectionBatcher(det, max_batch_size=8, max_wait_ms=30)
+        t0 = time.monotonic()
+        futures = [batcher.submit(frame(i)) for i in range(3)]
+        self.assertEqual([f.result(timeout=2) for f in futures], [0, 1, 2])
+        self.assertGreaterEqual(time.monotonic() - t0, 0.025)
+        self.assertEqual(det.batches, [3])
+        batcher.close()
+
+    def test_concurrent_producers_get_their_own_results(self):
+        det = TaggingDetector()
+        batcher = DetectionBatcher(det, max_batch_size=5, max_wait_ms=5)
+        results = {}
+
+        def camera(cam):
+            for k in range(10):
+                i = cam * 10 + k
+                results[i] = batcher.detect(frame(i))
+
+        threads = [threading.Thread(target=camera, args=(c,)) for c in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(5)
+        batcher.close()
+        self.assertEqual(results, {i: i for i in range(60)})
+        self.assertLessEqual(max(det.batches), 5)
+        self.assertEqual(sum(det.batches), 60)
+
+    def test_detector_errors_reach_every_future(self):
+        batcher = DetectionBatcher(TaggingDetector(fail=True), max_batch_size=2, max_wait_ms=5)
+        futures = [batcher.submit(frame(i)) for i in range(3)]
+        wait(futures, timeout=2)
+        for f in futures:
+            self.assertIsInstance(f.exception(), RuntimeError)
+        # the worker survives a failing batch
+        batcher.detector = TaggingDetector()
+        self.assertEqual(batcher.detect(frame(7)), 7)
+        batcher.close()
+
+    def test_cancelled_frames_are_skipped(self):
+        det = TaggingDetector()
+        batcher = DetectionBatcher(det, max_batch_size=8, max_wait_ms=50)
+        futures = [batcher.submit(frame(i)) for i in range(3)]
+        self.assertTrue(futures[1].cancel())  # still queued: the caller gave up
+        self.assertEqual([futures[0].result(timeout=2), futures[2].result(timeout=2)], [0, 2])
+        self.assertEqual(det.batches, [2])
+        # the worker is still alive
+        self.assertEqual(batcher.detect(frame(5)), 5)
+        batcher.close()
+
+    def test_close_drains_queue_and_rejects_new_frames(self):
+        batcher = DetectionBatcher(TaggingDetector(), max_batch_size=8, max_wait_ms=5000)
+        futures = [batcher.submit(frame(i)) for i in range(3)]
+        batcher.close()
+        self.assertEqual([f.result(timeout=0) for f in futures], [0, 1, 2])
+        with self.assertRaises(RuntimeError):
+            batcher.submit(frame(0))
+
+    def test_built_from_yolo_config(self):
+        batcher = build_batcher(TaggingDetector(), {"max_batch_size": 3, "max_batch_wait_ms": 25})
+        self.assertEqual((batcher.max_batch_size, batcher.max_wait), (3, 0.025))
+        batcher.close()
+
+
+class TestYOLODetectorChunking(unittest.TestCase):
+    def test_detect_batch_chunks_by_max_batch_size(self):
+        try:
+            from cv.detectors.yolo_detector import YOLODetector
+        except ImportError:
+            self.skipTest("ultralytics not installed")
+        det = YOLODetector.__new__(YOLODetector)
+        det.model, det.conf, det.iou, det.device, det.imgsz, det.max_batch_size = FakeChunkModel(), 0.2, 0.45, "cpu", 640, 3
+        out = det.detect_batch([frame(i) for i in range(7)])
+        self.assertEqual(det.model.sources, [3, 3, 1])
+        self.assertEqual(len(out), 7)
+        self.assertTrue(all(isinstance(d, Detections) and len(d) == 0 for d in out))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import asyncio
+import threading
+import unittest
+
+from backend.models.common import InventoryObjectType
+from backend.models.inventory import FilamentSpool
+from backend.services.change_stream import ChangeBroker, format_sse
+from backend.services.confirmation_manager import ConfirmationManager
+from backend.services.inventory_state_engine import InventoryStateEngine
+
+
+class TestChangeStream(unittest.TestCase):
+    def test_engine_and_confirmation_hooks_reach_subscriber(self):
+        async def run():
+            broker = ChangeBroker(queue_size=16)
+            engine, cm = InventoryStateEngine(), ConfirmationManager()
+            engine.add_listener(broker.publish)
+            cm.add_listener(broker.publish)
+            sub = broker.subscribe()
+
+            # mutations happen on worker threads in the real app
+            def mutate():
+                engine.upsert_spool(FilamentSpool(spool_id="S1", zone_id="A"))
+                pc = cm.create_pending(InventoryObjectType.filament_spool, "A", "B", "S1")
+                cm.confirm(pc.pending_id, resolved_by="worker")
+            t = threading.Thread(target=mutate)
+            t.start()
+            t.join()
+
+            got = [await asyncio.wait_for(sub.queue.get(), 1) for _ in range(3)]
+            return got
+
+        got = asyncio.run(run())
+        self.assertEqual([g["event"] for g in got], ["inventory.upsert", "confirmation.created", "confirmation.confirmed"])
+        self.assertIn(b'"spool_id":"S1"', got[0]["data"])
+        self.assertTrue(format_sse(got[0]).startswith(b"id: 1\nevent: inventory.upsert\ndata: {"))
+
+    def test_slow_subscriber_gets_resync_and_topic_filter(self):
+        async def run():
+            broker = ChangeBroker(queue_size=4)
+            engine = InventoryStateEngine()
+            engine.add_listener(broker.publish)
+            slow = broker.subscribe()
+            other = broker.subscribe(frozenset({"confirmation"}))
+            for i in range(10):
+                engine.upsert_spool(FilamentSpool(spool_id=f"S{i}"))
+            await asyncio.sleep(0)  # let call_soon_threadsafe callbacks run
+            items = []
+            while not slow.queue.empty():
+                items.append(slow.queue.get_nowait())
+            return items, other.queue.qsize(), slow.dropped
+
+        items, other_size, dropped = asyncio.run(run())
+        self.assertEqual(items[0]["event"], "resync")
+        self.assertLessEqual(len(items), 4)
+        self.assertGreater(dropped, 0)
+        self.assertEqual(items[-1]["event"], "inventory.upsert")
+        self.assertEqual(other_size, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import time
+import unittest
+from unittest import mock
+
+from backend.core.config import settings
+from backend.models.common import InventoryObjectType
+from backend.services.confirmation_manager import ConfirmationManager
+from backend.services.inventory_state_engine import InventoryStateEngine
+from backend.services.state_writer import StateWriter
+
+
+class CountingStore:
+    def __init__(self):
+        self.persists = 0
+
+    def persist(self, changes, full_state):
+        self.persists += 1
+
+
+class TestConfirmationManager(unittest.TestCase):
+    def setUp(self):
+        self.cm = ConfirmationManager(archive_size=3, archive_retention_seconds=60)
+
+    def _create(self, expires_in_s=20):
+        with mock.patch.object(settings, "pending_timeout_seconds", expires_in_s):
+            return self.cm.create_pending(InventoryObjectType.filament_spool, "A", "B", None)
+
+    def test_expire_only_due_items(self):
+        due = self._create(expires_in_s=-1)
+        fresh = self._create()
+        self.assertEqual(self.cm.expire_old(), 1)
+        self.assertEqual(self.cm.get(due.pending_id).status, "expired")
+        self.assertNotIn(due.pending_id, self.cm.pending)
+        self.assertIn(fresh.pending_id, self.cm.pending)
+        self.assertEqual(self.cm.expire_old(), 0)
+
+    def test_resolved_items_move_to_bounded_archive(self):
+        ids = [self._create().pending_id for _ in range(5)]
+        for pid in ids:
+            self.cm.confirm(pid, resolved_by="worker")
+        self.assertEqual(len(self.cm.pending), 0)
+        self.assertEqual(list(self.cm.archive), ids[-3:])
+        # confirming an archived item again is idempotent
+        self.assertEqual(self.cm.confirm(ids[-1], resolved_by="other").resolved_by, "worker")
+        with self.assertRaises(KeyError):
+            self.cm.reject(ids[0], resolved_by="worker")
+
+    def test_confirm_after_deadline_expires_instead(self):
+        pc = self._create(expires_in_s=-1)
+        self.assertEqual(self.cm.confirm(pc.pending_id, resolved_by="worker").status, "expired")
+        self.assertEqual(self.cm.list_pending(), {})
+
+    def test_sweeper_expires_through_the_writer(self):
+        store = CountingStore()
+        writer = StateWriter(InventoryStateEngine(), store)
+        due = self._create(expires_in_s=-1)
+        self.cm.start_sweeper(interval_seconds=0.01, run=writer.call)
+        try:
+            deadline = time.monotonic() + 2
+            while self.cm.get(due.pending_id).status == "pending" and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            self.cm.stop_sweeper()
+            writer.stop()
+        self.assertEqual(self.cm.get(due.pending_id).status, "expired")
+        self.assertGreaterEqual(writer.commands, 1)  # ran as writer commands, persisted per batch
+        self.assertEqual(store.persists, writer.batches)
+
+
+if __name__ == "__main__":
+    unittest.main()
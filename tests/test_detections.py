@@ -0,0 +1,56 @@
+import unittest
+
+import numpy as np
+
+from cv.detectors.detections import Detections
+from cv.tracking.simple_tracker import SimpleTracker
+from cv.tracking.zone_mapper import ZoneMap, assign_to_zones
+
+ZONES = [
+    {"zone_id": "Zone_Left", "shape": "rect", "x1": 40, "y1": 80, "x2": 620, "y2": 680},
+    {"zone_id": "Zone_Right", "shape": "rect", "x1": 660, "y1": 80, "x2": 1240, "y2": 680},
+]
+
+# confidences are stored as float32: use values it represents exactly
+DICTS = [
+    {"label": "book", "conf": 0.5, "bbox": [100, 100, 140, 160]},
+    {"label": "person", "conf": 0.875, "bbox": [700, 200, 760, 400]},
+    {"label": "cell phone", "conf": 0.25, "bbox": [10, 10, 30, 30]},
+    {"label": "book", "conf": 0.75, "bbox": [900, 300, 950, 350]},
+]
+
+
+class TestDetections(unittest.TestCase):
+    def test_round_trip_masks_and_labels(self):
+        dets = Detections.from_dicts(DICTS)
+        self.assertEqual(len(dets), 4)
+        self.assertEqual(dets.to_dicts(), DICTS)
+
+        keep = ~dets.label_mask({"person"}) & (dets.conf >= 0.35)
+        self.assertEqual(dets[keep].label_list(), ["book", "book"])
+        self.assertEqual(dets[keep].boxes.tolist(), [[100, 100, 140, 160], [900, 300, 950, 350]])
+        self.assertEqual(len(dets[dets.conf > 1]), 0)
+        self.assertEqual(dets[dets.conf > 1].to_dicts(), [])
+        self.assertEqual(dets.shifted(5, 10).boxes[0].tolist(), [105, 110, 145, 170])
+
+    def test_zone_assignment_matches_dict_path(self):
+        dets = Detections.from_dicts(DICTS)
+        expected = assign_to_zones(DICTS, ZONES)
+        zone_map = ZoneMap(ZONES, (1280, 720))
+        self.assertEqual(assign_to_zones(dets, ZONES, zone_map).to_dicts(), expected)
+        self.assertEqual(assign_to_zones(dets, ZONES).to_dicts(), expected)
+        # zone ids survive masking
+        self.assertEqual(assign_to_zones(dets, ZONES, zone_map)[np.array([3, 0])].zone_id_list(),
+                         ["Zone_Right", "Zone_Left"])
+
+    def test_tracker_accepts_detections_and_dicts_alike(self):
+        a, b = SimpleTracker(), SimpleTracker()
+        for step in range(5):
+            dicts = [{**d, "bbox": [d["bbox"][0] + 20 * step, d["bbox"][1], d["bbox"][2] + 20 * step, d["bbox"][3]]}
+                     for d in DICTS]
+            dicts = assign_to_zones(dicts, ZONES)
+            self.assertEqual(a.update(Detections.from_dicts(dicts)), b.update(dicts))
+
+
+if __name__ == "__main__":
+    unittest.main()
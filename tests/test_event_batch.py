@@ -0,0 +1,49 @@
+import json
+import unittest
+
+from fastapi.testclient import TestClient
+
+from backend.api.event_routes import CONFIRMATIONS
+from backend.main import app
+
+
+class TestCVBatchEndpoint(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(app)
+
+    def test_json_array_all_valid(self):
+        events = [
+            {"object_type": "filament_spool", "from_zone": "A", "to_zone": "B"},
+            {"object_type": "printer", "to_zone": "C", "confidence": 0.9},
+        ]
+        r = self.client.post("/api/events/cv/batch", json=events)
+        self.assertEqual(r.status_code, 200)
+        body = r.json()
+        self.assertEqual((body["accepted"], body["rejected"]), (2, 0))
+        for item in body["results"]:
+            self.assertIn(item["pending"]["pending_id"], CONFIRMATIONS.pending)
+
+    def test_ndjson_with_invalid_item(self):
+        lines = [
+            {"object_type": "filament_spool", "to_zone": "B"},
+            {"object_type": "not_a_type"},
+            {"object_type": "printer", "from_zone": "C", "confidence": 0.5},
+        ]
+        r = self.client.post(
+            "/api/events/cv/batch",
+            content="\n".join(json.dumps(x) for x in lines) + "\n",
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        self.assertEqual(r.status_code, 200)
+        body = r.json()
+        self.assertEqual((body["accepted"], body["rejected"]), (2, 1))
+        self.assertEqual([x["ok"] for x in body["results"]], [True, False, True])
+        self.assertTrue(body["results"][1]["errors"])
+
+    def test_malformed_body(self):
+        r = self.client.post("/api/events/cv/batch", content=b"{not json", headers={"Content-Type": "application/json"})
+        self.assertEqual(r.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import json as jsonlib
+import threading
+import time
+import unittest
+
+from cv.events.event_publisher import EventPublisher
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, body=None):
+        self.status_code = status_code
+        self._body = body if body is not None else {}
+
+    def json(self):
+        return self._body
+
+
+class FakeSession:
+    """Records posts; answers with the queued status codes, then 200."""
+    def __init__(self, statuses=(), delay_s=0.0, gate=None):
+        self.statuses = list(statuses)
+        self.delay_s = delay_s
+        self.gate = gate
+        self.posts = []
+
+    def post(self, url, json=None, timeout=None):
+        body = jsonlib.dumps(json)  # like requests: unserializable -> TypeError
+        if self.gate is not None:
+            self.gate.wait(5)
+        time.sleep(self.delay_s)
+        self.posts.append((url, jsonlib.loads(body)))
+        status = self.statuses.pop(0) if self.statuses else 200
+        return FakeResponse(status, {"accepted": len(json)} if isinstance(json, list) else {})
+
+    def close(self):
+        pass
+
+
+def make(session, **kwargs):
+    kwargs.setdefault("backoff_base_s", 0.001)
+    kwargs.setdefault("flush_interval_ms", 20)
+    pub = EventPublisher("http://backend", "/api/events/cv", **kwargs)
+    pub.session = session
+    return pub
+
+
+def publish(pub, n):
+    return [pub.publish_zone_change("filament_spool", None, "Z1", meta={"i": i}) for i in range(n)]
+
+
+class TestEventPublisher(unittest.TestCase):
+    def test_batches_go_to_the_bulk_endpoint(self):
+        session = FakeSession()
+        pub = make(session, batch_size=3, batch_path="/api/events/cv/batch")
+        publish(pub, 7)
+        self.assertTrue(pub.flush(2))
+        pub.close()
+
+        self.assertEqual({url for url, _ in session.posts}, {"http://backend/api/events/cv/batch"})
+        sizes = [len(body) for _, body in session.posts]
+        self.assertEqual(sum(sizes), 7)
+        self.assertLessEqual(max(sizes), 3)
+        self.assertEqual([e["meta"]["i"] for _, body in session.posts for e in body], list(range(7)))
+        stats = pub.stats()
+        self.assertEqual((stats["sent"], stats["failed"], stats["in_flight"]), (7, 0, 0))
+
+    def test_retries_5xx_and_429_but_not_4xx(self):
+        session = FakeSession(statuses=[503, 429, 200])
+        pub = make(session)
+        publish(pub, 1)
+        self.assertTrue(pub.flush(2))
+        self.assertEqual(len(session.posts), 3)
+        self.assertEqual((pub.stats()["sent"], pub.stats()["retries"]), (1, 2))
+
+        session.statuses = [400]
+        publish(pub, 1)
+        self.assertTrue(pub.flush(2))
+        pub.close()
+        self.assertEqual(len(session.posts), 4)
+        self.assertEqual((pub.stats()["failed"], pub.stats()["retries"]), (1, 2))
+
+    def test_full_queue_drops_new_events(self):
+        gate = threading.Event()
+        session = FakeSession(gate=gate)
+        pub = make(session, max_queue_size=2, batch_size=1)
+        publish(pub, 1)
+        deadline = time.monotonic() + 2
+        while pub.stats()["queue_depth"] and time.monotonic() < deadline:  # sender holds the first one
+            time.sleep(0.005)
+        results = publish(pub, 3)
+        self.assertEqual([r["queued"] for r in results], [True, True, False])
+        self.assertFalse(pub.flush(0.05))  # blocked in the sender: not done yet
+
+        gate.set()
+        self.assertTrue(pub.flush(2))
+        pub.close()
+        stats = pub.stats()
+        self.assertEqual((stats["enqueued"], stats["dropped"], stats["sent"]), (3, 1, 3))
+
+    def test_bad_event_is_counted_and_sender_keeps_running(self):
+        session = FakeSession()
+        pub = make(session, batch_size=1)
+        pub.publish_zone_change("filament_spool", None, "Z1", meta={"raw": object()})  # not JSON-serializable
+        publish(pub, 1)
+        self.assertTrue(pub.flush(2))
+        self.assertEqual((pub.stats()["failed"], pub.stats()["sent"]), (1, 1))
+
+        # a non-object body from the bulk endpoint counts the batch as accepted
+        pub.batch_url = "http://backend/api/events/cv/batch"
+        session.post = lambda url, json=None, timeout=None: FakeResponse(200, ["ok"])
+        publish(pub, 2)
+        self.assertTrue(pub.flush(2))
+        self.assertEqual(pub.stats()["sent"], 3)
+        self.assertTrue(pub._thread.is_alive())
+
+    def test_flush_waits_for_in_flight_events_and_close_stops_the_thread(self):
+        session = FakeSession(delay_s=0.05)
+        pub = make(session, batch_size=2)
+        publish(pub, 4)
+        self.assertTrue(pub.flush(2))
+        self.assertEqual(pub.stats()["sent"], 4)  # flush returned only after the last post
+        pub.close(1)
+        self.assertFalse(pub._thread.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()
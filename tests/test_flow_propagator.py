@@ -0,0 +1,69 @@
+import unittest
+
+import numpy as np
+
+from cv.detectors.stub_detector import SyntheticScene, stub_pipeline
+from cv.tracking.flow_propagator import FlowPropagator
+from cv.tracking.simple_tracker import SimpleTracker
+
+
+class TestFlowPropagator(unittest.TestCase):
+    def test_boxes_follow_moving_objects(self):
+        scene = SyntheticScene(frame_size=(1280, 720), n_objects=6, speed_px=(4, 10), seed=5)
+        flow = FlowPropagator()
+        tracks = [{"track_id": i + 1, "bbox": b} for i, b in enumerate(scene.boxes().tolist())]
+        flow.reset(scene.render(), tracks)
+        self.assertTrue(flow.active)
+
+        for _ in range(3):
+            scene.advance()
+            boxes = flow.propagate(scene.render())
+        truth = scene.boxes()
+        self.assertGreaterEqual(len(boxes), 4)
+        err = [np.abs(np.asarray(b) - truth[tid - 1]).max() for tid, b in boxes.items()]
+        self.assertLessEqual(float(np.median(err)), 3.0)
+
+    def test_pipeline_draws_propagated_tracks_between_detections(self):
+        scene = SyntheticScene(frame_size=(1280, 720), n_objects=6, speed_px=(4, 10), seed=5)
+        pipeline = stub_pipeline(scene, process_every_n=4)
+        pipeline.motion_gate_enabled = False
+        pipeline.flow = FlowPropagator()  # off in the shipped config
+
+        propagated = 0
+        for _ in range(24):
+            scene.advance()
+            published = len(pipeline.publisher.events)
+            _, debug = pipeline.step(scene.render())
+            if debug.get("propagated"):
+                propagated += 1
+                self.assertEqual(len(pipeline.publisher.events), published)  # flow never publishes
+                self.assertIsNotNone(debug["counts"])
+                self.assertIn("flow", debug["timings"])
+        # detection on every 4th frame; nothing to propagate before the first one
+        self.assertEqual(propagated, 24 - 6 - 3)
+        self.assertEqual(pipeline.metrics.snapshot()["counters"]["propagated_frames"], 15)
+
+
+class TestTrackerPropagate(unittest.TestCase):
+    def test_flow_drift_across_a_boundary_emits_nothing(self):
+        tracker = SimpleTracker()
+        det = {"label": "book", "conf": 0.9, "bbox": [580, 100, 620, 140], "zone_id": "Zone_Left"}
+        tracker.update([det])
+
+        # flow drags the box into the other zone: shown there, but not reported
+        tracks_out = tracker.propagate({1: ([660, 100, 700, 140], "Zone_Right")})
+        self.assertEqual((tracks_out[0]["zone_id"], tracks_out[0]["prev_zone_id"]), ("Zone_Right", "Zone_Left"))
+        self.assertEqual(tracker.tracks[1]["zone_id"], "Zone_Left")
+
+        # the next detection puts it back: no transfer either way
+        _, transfers, enters, exits = tracker.update([det])
+        self.assertEqual((transfers, enters, exits), ([], [], []))
+
+        # a move the detector confirms is reported once, by update()
+        tracker.propagate({1: ([660, 100, 700, 140], "Zone_Right")})
+        _, transfers, _, _ = tracker.update([{**det, "bbox": [660, 100, 700, 140], "zone_id": "Zone_Right"}])
+        self.assertEqual([(t["from_zone"], t["to_zone"]) for t in transfers], [("Zone_Left", "Zone_Right")])
+
+
+if __name__ == "__main__":
+    unittest.main()
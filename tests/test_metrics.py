@@ -0,0 +1,39 @@
+import json
+import unittest
+import urllib.request
+
+from cv.utils.metrics import Metrics, MetricsServer, RollingHistogram, to_prometheus
+
+
+class TestMetrics(unittest.TestCase):
+    def test_rolling_histogram_keeps_last_window(self):
+        h = RollingHistogram(window=100)
+        for v in range(1000):
+            h.record(float(v))
+        s = h.summary()
+        self.assertEqual(s["count"], 1000)
+        self.assertEqual(s["max"], 999.0)
+        self.assertAlmostEqual(s["p50"], 949.5)
+
+    def test_snapshot_prometheus_and_http(self):
+        m = Metrics(window=10)
+        m.observe_many({"detect": 2.0, "track": 1.0})
+        m.inc("qr_hits")
+        m.inc("qr_misses", 3)
+        snap = m.snapshot()
+        self.assertEqual(snap["counters"], {"qr_hits": 1, "qr_misses": 3})
+        self.assertEqual(snap["stages_ms"]["detect"]["p95"], 2.0)
+        self.assertIn('cv_stage_ms{stage="track",quantile="0.99"} 1.0', to_prometheus(snap))
+
+        server = MetricsServer(m, port=0)
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics.json", timeout=2) as r:
+                self.assertEqual(json.loads(r.read())["counters"]["qr_misses"], 3)
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=2) as r:
+                self.assertIn(b"cv_qr_hits_total 1", r.read())
+        finally:
+            server.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
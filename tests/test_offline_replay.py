@@ -0,0 +1,78 @@
+import json
+import os
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+
+from backend.models.events import CVZoneChangeEvent
+from cv.detectors.stub_detector import SyntheticScene
+from cv.events.event_sink import FileEventSink
+from cv.pipeline import CVPipeline
+from cv.runner import run_offline
+from cv.sources import ImageDirSource, VideoFileSource, open_source
+
+
+class BlobDetector:
+    """Finds the scene's filled boxes in the decoded frame itself."""
+
+    def detect(self, frame_bgr):
+        mask = cv2.inRange(frame_bgr, (30, 150, 210), (50, 170, 230))
+        n, _, stats, _ = cv2.connectedComponentsWithStats(mask)
+        return [{"label": "book", "conf": 0.9, "bbox": [int(x), int(y), int(x + w), int(y + h)]}
+                for x, y, w, h, _ in stats[1:n]]
+
+
+class TestOfflineReplay(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.video = os.path.join(cls.tmp.name, "clip.avi")
+        scene = SyntheticScene(frame_size=(1280, 720), n_objects=6, speed_px=(20, 40), seed=3)
+        w = cv2.VideoWriter(cls.video, cv2.VideoWriter_fourcc(*"MJPG"), 10, (1280, 720))
+        for _ in range(80):
+            scene.advance()
+            w.write(scene.render())
+        w.release()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_video_replay_skips_by_timestamp_and_writes_events(self):
+        out = os.path.join(self.tmp.name, "events.ndjson")
+        sink = FileEventSink(out)
+        pipeline = CVPipeline("config/cv.yaml", "config/zones.json", detector=BlobDetector(), publisher=sink)
+        pipeline.qr_enabled = False
+        source = open_source(self.video)
+        self.assertIsInstance(source, VideoFileSource)
+
+        summary = run_offline(source, pipeline, max_speed=True, process_fps=5, sink=sink, progress_every_s=0)
+        pipeline.close()
+
+        self.assertEqual(summary["frames_read"], 80)
+        self.assertEqual(summary["frames_processed"], 40)  # 10 fps video, 5 fps detection
+        self.assertAlmostEqual(summary["video_s"], 7.9, places=2)
+        with open(out, encoding="utf-8") as f:
+            events = [CVZoneChangeEvent.model_validate(json.loads(line)) for line in f]
+        self.assertTrue(events)
+        video_ts = [e.meta["video_ts_s"] for e in events]
+        self.assertEqual(video_ts, sorted(video_ts))
+        self.assertLessEqual(max(video_ts), 7.9)
+
+    def test_image_dir_timestamps(self):
+        d = os.path.join(self.tmp.name, "frames")
+        os.makedirs(d)
+        for i in range(5):
+            cv2.imwrite(os.path.join(d, f"{i:03d}.png"), np.zeros((8, 8, 3), np.uint8))
+        src = ImageDirSource(d, fps=2)
+        ts = []
+        while src.grab():
+            ts.append(src.timestamp_s)
+        self.assertEqual(ts, [0.0, 0.5, 1.0, 1.5, 2.0])
+        self.assertTrue(src.retrieve()[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import random
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from backend.models.inventory import FilamentSpool
+from backend.services.inventory_state_engine import InventoryStateEngine
+from backend.services.sqlite_store import SqliteStateStore
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def seed(engine):
+    rng = random.Random(7)
+    for i in range(60):
+        s = FilamentSpool(
+            spool_id=f"S{i:03d}",
+            material=rng.choice(["PLA", "PETG", "ABS"]),
+            color=rng.choice(["Black", "White"]),
+            zone_id=rng.choice(["Rack_A", "Rack_B", None]),
+        )
+        engine.spools[s.spool_id] = s
+        s.updated_at = T0 + timedelta(minutes=i)
+        engine.spools[s.spool_id] = s  # write back the fixed timestamp
+
+
+def all_pages(engine, **kw):
+    ids, cursor = [], None
+    while True:
+        items, cursor = engine.page("spools", cursor=cursor, limit=7, **kw)
+        ids += [s.spool_id for s in items]
+        if cursor is None:
+            return ids
+
+
+class TestPagination(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = SqliteStateStore(os.path.join(self.tmp.name, "state.db"))
+        self.engines = {"memory": InventoryStateEngine(), "sqlite": InventoryStateEngine(tables=self.store.tables)}
+        for engine in self.engines.values():
+            seed(engine)
+        self.spools = list(self.engines["memory"].spools.values())
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_filtered_pages_match_scan(self):
+        expected = sorted(s.spool_id for s in self.spools if s.material == "PLA" and s.zone_id == "Rack_A")
+        for name, engine in self.engines.items():
+            with self.subTest(backend=name):
+                self.assertEqual(all_pages(engine, filters={"material": "PLA", "zone_id": "Rack_A"}), expected)
+
+    def test_updated_at_range(self):
+        lo, hi = T0 + timedelta(minutes=10), T0 + timedelta(minutes=25)
+        expected = sorted(s.spool_id for s in self.spools if lo <= s.updated_at <= hi and s.color == "Black")
+        for name, engine in self.engines.items():
+            with self.subTest(backend=name):
+                got = all_pages(engine, filters={"color": "Black"}, ranges={"updated_at": (lo, hi)})
+                self.assertEqual(got, expected)
+                # naive bounds are treated as UTC
+                got = all_pages(engine, ranges={"updated_at": (lo.replace(tzinfo=None), None)})
+                self.assertEqual(got, sorted(s.spool_id for s in self.spools if s.updated_at >= lo))
+
+    def test_unfiltered_pages_cover_everything_once(self):
+        for name, engine in self.engines.items():
+            with self.subTest(backend=name):
+                self.assertEqual(all_pages(engine), sorted(s.spool_id for s in self.spools))
+
+    def test_bad_cursor(self):
+        with self.assertRaises(ValueError):
+            self.engines["memory"].page("spools", cursor="%%%")
+
+
+if __name__ == "__main__":
+    unittest.main()
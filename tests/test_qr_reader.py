@@ -0,0 +1,71 @@
+import os
+import unittest
+
+import cv2
+import numpy as np
+
+from cv.qr.qr_reader import QRReader, assign_codes_to_tracks, parse_payload
+
+QR_DIR = os.path.join(os.path.dirname(__file__), "..", "qr_codes")
+
+
+def canvas_with_codes(placements, size=(720, 1280), side=220):
+    frame = np.full(size + (3,), 255, dtype=np.uint8)
+    for name, (x, y) in placements:
+        code = cv2.imread(os.path.join(QR_DIR, name))
+        frame[y:y + side, x:x + side] = cv2.resize(code, (side, side), interpolation=cv2.INTER_NEAREST)
+    return frame
+
+
+class TestQRAssignment(unittest.TestCase):
+    def test_smallest_containing_box_wins(self):
+        codes = [("a", None, (120.0, 120.0)), ("b", {"k": 1}, (505.0, 300.0)), ("c", None, (1000.0, 50.0))]
+        tracks = [
+            {"track_id": 1, "bbox": [0, 0, 400, 400]},
+            {"track_id": 2, "bbox": [100, 100, 140, 140]},
+            {"track_id": 3, "bbox": [300, 200, 500, 400]},
+        ]
+        # "b" is only inside track 3 once its box is padded; "c" is in no box
+        self.assertEqual(assign_codes_to_tracks(codes, tracks), {2: ("a", None)})
+        self.assertEqual(assign_codes_to_tracks(codes, tracks, pad=10), {2: ("a", None), 3: ("b", {"k": 1})})
+        self.assertEqual(assign_codes_to_tracks([], tracks), {})
+        self.assertEqual(assign_codes_to_tracks(codes, []), {})
+
+    def test_code_of_a_tagged_track_is_not_handed_to_its_neighbour(self):
+        codes = [("spool-A", None, (150.0, 150.0))]
+        owner = {"track_id": 1, "bbox": [120, 120, 180, 180]}
+        neighbour = {"track_id": 2, "bbox": [185, 100, 300, 200]}  # padded box reaches the code centre
+        self.assertEqual(assign_codes_to_tracks(codes, [neighbour], pad=40), {2: ("spool-A", None)})
+        self.assertEqual(assign_codes_to_tracks(codes, [owner, neighbour], pad=40), {1: ("spool-A", None)})
+
+    def test_parse_is_memoized(self):
+        parse_payload.cache_clear()
+        raw = '{"type": "filament", "id": "PLA"}'
+        self.assertEqual(parse_payload(raw), {"type": "filament", "id": "PLA"})
+        self.assertIs(parse_payload(raw), parse_payload(raw))
+        self.assertIsNone(parse_payload("not json"))
+        self.assertEqual(parse_payload.cache_info().hits, 2)
+
+
+class TestDecodeMulti(unittest.TestCase):
+    def test_one_pass_decodes_and_assigns(self):
+        frame = canvas_with_codes([("filament_PLA.png", (100, 100)), ("printer_Bambu-01.png", (800, 400))])
+        reader = QRReader()
+        codes = reader.decode_multi(frame)
+        self.assertEqual(len(codes), 2)
+
+        tracks = [
+            {"track_id": 7, "bbox": [80, 80, 340, 340]},
+            {"track_id": 8, "bbox": [780, 380, 1040, 640]},
+            {"track_id": 9, "bbox": [500, 50, 600, 150]},
+        ]
+        found = assign_codes_to_tracks(codes, tracks)
+        self.assertEqual(sorted(found), [7, 8])
+        # same strings as decoding each track box on its own
+        for tid, (raw, _) in found.items():
+            bbox = next(t["bbox"] for t in tracks if t["track_id"] == tid)
+            self.assertEqual(reader.decode_roi(frame, bbox)[0], raw)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from backend.api.inventory_routes import RESPONSES, WRITER
+from backend.main import app
+from backend.services.response_cache import ResponseCache, if_none_match
+from backend.services.storage import WalStateStore
+
+
+class TestListETags(unittest.TestCase):
+    def setUp(self):
+        # mutations go through the routes (and WRITER); keep what they persist out of the working dir
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = mock.patch.object(WRITER, "store", WalStateStore(os.path.join(tmp.name, "state.json")))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = TestClient(app)
+        self.client.post("/api/spools", json={"spool_id": "ETAG-1", "material": "PLA"}).raise_for_status()
+
+    def test_conditional_get_returns_304_until_mutation(self):
+        r1 = self.client.get("/api/spools", params={"material": "PLA"})
+        self.assertEqual(r1.status_code, 200)
+        etag = r1.headers["etag"]
+        self.assertIn("ETAG-1", [s["spool_id"] for s in r1.json()])
+
+        hits = RESPONSES.hits
+        r2 = self.client.get("/api/spools", params={"material": "PLA"})
+        self.assertEqual(r2.headers["etag"], etag)
+        self.assertEqual(RESPONSES.hits, hits + 1)
+
+        r3 = self.client.get("/api/spools", params={"material": "PLA"}, headers={"If-None-Match": etag})
+        self.assertEqual(r3.status_code, 304)
+        self.assertEqual(r3.content, b"")
+
+        self.client.post("/api/spools", json={"spool_id": "ETAG-2", "material": "PLA"}).raise_for_status()
+        r4 = self.client.get("/api/spools", params={"material": "PLA"}, headers={"If-None-Match": etag})
+        self.assertEqual(r4.status_code, 200)
+        self.assertNotEqual(r4.headers["etag"], etag)
+        self.assertIn("ETAG-2", [s["spool_id"] for s in r4.json()])
+
+    def test_different_queries_get_different_etags(self):
+        a = self.client.get("/api/spools", params={"material": "PLA"}).headers["etag"]
+        b = self.client.get("/api/spools", params={"material": "PETG"}).headers["etag"]
+        self.assertNotEqual(a, b)
+
+    def test_etag_from_a_previous_process_never_matches(self):
+        key = ("/api/spools", ())
+        old = ResponseCache().etag(key, 3)
+        # a restarted process starts counting versions again
+        self.assertFalse(if_none_match(old, ResponseCache().etag(key, 3)))
+        r = self.client.get("/api/spools", headers={"If-None-Match": old})
+        self.assertEqual(r.status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import threading
+import time
+import unittest
+
+from cv.detectors.stub_detector import SyntheticScene, stub_pipeline
+from cv.runner import LatestFrameBuffer, PipelinedRunner
+
+
+class FakeCapture:
+    """cv2.VideoCapture stand-in: n frames of a moving scene at about fps, then read() fails."""
+    def __init__(self, scene, n_frames, fps=200.0):
+        self.scene = scene
+        self.n_frames = n_frames
+        self.period = 1.0 / fps
+        self.reads = 0
+
+    def read(self):
+        if self.reads >= self.n_frames:
+            return False, None
+        time.sleep(self.period)
+        self.reads += 1
+        self.scene.advance()
+        return True, self.scene.render()
+
+
+class TestLatestFrameBuffer(unittest.TestCase):
+    def test_overwrites_oldest_and_counts_drops(self):
+        buf = LatestFrameBuffer(1)
+        for i in range(3):
+            buf.put(i)
+        self.assertEqual(buf.dropped, 2)
+        self.assertEqual(buf.get_latest(timeout=0), 2)
+        self.assertEqual(len(buf), 0)
+
+        buf = LatestFrameBuffer(3)
+        for i in range(5):
+            buf.put(i)
+        self.assertEqual(buf.dropped, 2)      # 0 and 1 pushed out on put
+        self.assertEqual(buf.get_latest(timeout=0), 4)
+        self.assertEqual(buf.dropped, 4)      # 2 and 3 skipped by the consumer
+
+    def test_timeout_and_close_wake_the_consumer(self):
+        buf = LatestFrameBuffer()
+        t0 = time.monotonic()
+        self.assertIsNone(buf.get_latest(timeout=0.02))
+        self.assertGreaterEqual(time.monotonic() - t0, 0.015)
+
+        got = []
+        consumer = threading.Thread(target=lambda: got.append(buf.get_latest(timeout=5)))
+        consumer.start()
+        time.sleep(0.02)
+        buf.close()
+        consumer.join(1)
+        self.assertFalse(consumer.is_alive())
+        self.assertEqual(got, [None])
+        self.assertTrue(buf.closed)
+
+
+class TestPipelinedRunner(unittest.TestCase):
+    def test_headless_run_ends_when_the_source_runs_out(self):
+        scene = SyntheticScene(frame_size=(640, 360), n_objects=4, seed=7)
+        pipeline = stub_pipeline(scene, process_every_n=None)
+        cap = FakeCapture(scene, n_frames=40)
+        runner = PipelinedRunner(cap, pipeline, show_window=False, stats_every_s=0)
+
+        done = threading.Thread(target=runner.run, daemon=True)
+        done.start()
+        done.join(10)
+        self.assertFalse(done.is_alive())
+        self.assertIsNone(runner.error)
+        self.assertEqual(cap.reads, 40)
+        self.assertTrue(runner.frames.closed and runner.results.closed)
+
+        processed = pipeline.metrics.snapshot()["counters"]["frames"]
+        self.assertGreater(processed, 0)
+        # every captured frame was either processed or counted as dropped
+        self.assertEqual(processed + runner.frames.dropped + len(runner.frames), 40)
+
+    def test_worker_error_stops_the_run_and_is_raised(self):
+        scene = SyntheticScene(frame_size=(640, 360), n_objects=2, seed=1)
+
+        class Broken:
+            def step(self, frame_bgr):
+                raise ValueError("bad frame")
+
+        runner = PipelinedRunner(FakeCapture(scene, n_frames=1000), Broken(), show_window=False, stats_every_s=0)
+        with self.assertRaises(ValueError):
+            runner.run()
+        self.assertTrue(runner.stop_event.is_set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import itertools
+import unittest
+
+import numpy as np
+
+from cv.tracking.assignment import greedy_assignment, linear_assignment
+from cv.tracking.simple_tracker import SimpleTracker
+
+
+def det(x, y, zone_id=None, label="book", size=40):
+    return {"label": label, "conf": 0.9, "bbox": [x, y, x + size, y + size], "zone_id": zone_id}
+
+
+class TestAssignment(unittest.TestCase):
+    def test_hungarian_matches_brute_force(self):
+        rng = np.random.default_rng(0)
+        for shape in [(3, 3), (4, 6), (6, 4)]:
+            cost = rng.random(shape)
+            rows, cols = linear_assignment(cost)
+            n = min(shape)
+            brute = min(
+                sum(cost[r, c] for r, c in zip(rows_p, cols_p))
+                for rows_p in itertools.combinations(range(shape[0]), n)
+                for cols_p in itertools.permutations(range(shape[1]), n)
+            )
+            self.assertEqual(len(rows), n)
+            self.assertAlmostEqual(cost[rows, cols].sum(), brute)
+
+    def test_greedy_respects_validity(self):
+        cost = np.array([[0.1, 0.2], [0.3, 0.9]])
+        valid = np.array([[True, True], [False, False]])
+        rows, cols = greedy_assignment(cost, valid)
+        self.assertEqual(rows.tolist(), [0])
+        self.assertEqual(cols.tolist(), [0])
+
+
+class TestSimpleTracker(unittest.TestCase):
+    def test_close_objects_keep_ids(self):
+        tr = SimpleTracker(match_dist_px=100, enforce_same_label=False)
+        out, *_ = tr.update([det(80, 100), det(160, 100)])
+        ids = {o["bbox"][0]: o["track_id"] for o in out}
+
+        # both move right; greedy-by-index hands track B to the first detection
+        # and the second one (only reachable by B) would spawn a new track
+        out, *_ = tr.update([det(150, 100), det(240, 100)])
+        ids2 = {o["bbox"][0]: o["track_id"] for o in out}
+        self.assertEqual(ids2[150], ids[80])
+        self.assertEqual(ids2[240], ids[160])
+
+    def test_enter_and_transfer_events(self):
+        tr = SimpleTracker(match_dist_px=200)
+        _, transfers, enters, exits = tr.update([det(100, 100, "Zone_Left")])
+        self.assertEqual([e["reason"] for e in enters], ["new_track_in_zone"])
+
+        _, transfers, enters, exits = tr.update([det(150, 100, "Zone_Right")])
+        self.assertEqual(len(transfers), 1)
+        self.assertEqual(transfers[0]["from_zone"], "Zone_Left")
+        self.assertEqual(transfers[0]["to_zone"], "Zone_Right")
+
+    def test_gated_detection_starts_new_track(self):
+        tr = SimpleTracker(match_dist_px=50)
+        out1, *_ = tr.update([det(0, 0)])
+        out2, *_ = tr.update([det(500, 500)])
+        self.assertNotEqual(out1[0]["track_id"], out2[0]["track_id"])
+
+
+class TestKalmanTracking(unittest.TestCase):
+    def test_crossing_objects_keep_ids(self):
+        ids = {}
+        for model in ("none", "kalman"):
+            tr = SimpleTracker(match_dist_px=250, max_age_frames=60, enforce_same_label=False, motion_model=model)
+            ids[model] = set()
+            for k in range(12):
+                out, *_ = tr.update([det(40 + 100 * k, 300), det(1200 - 100 * k, 330)])
+                ids[model].add(tuple(o["track_id"] for o in out))
+        # last-seen matching swaps the two IDs where the paths cross; predictions don't
+        self.assertEqual(ids["none"], {(1, 2), (2, 1)})
+        self.assertEqual(ids["kalman"], {(1, 2)})
+
+    def test_sparse_detections_give_one_track_and_a_transfer(self):
+        # carried at 60 px/frame, detected every 5th frame: 300 px between updates
+        for model in ("none", "kalman"):
+            tr = SimpleTracker(match_dist_px=250, max_age_frames=60, max_zone_gap_frames=20,
+                               enforce_same_label=False, motion_model=model)
+            track_ids, transfers, enters = set(), [], []
+            for x in range(40, 1240, 300):
+                zone = "Zone_Left" if x < 620 else ("Zone_Right" if x >= 660 else None)
+                out, tf, en, _ = tr.update([det(x, 300, zone)], dt=5)
+                track_ids.update(o["track_id"] for o in out)
+                transfers += [(t["from_zone"], t["to_zone"]) for t in tf]
+                enters += [e["to_zone"] for e in en]
+            if model == "none":
+                self.assertEqual(len(track_ids), 4)  # a new track for every detection
+                self.assertEqual(transfers, [])
+            else:
+                self.assertEqual(len(track_ids), 1)
+                self.assertEqual(transfers, [("Zone_Left", "Zone_Right")])
+                self.assertEqual(enters, ["Zone_Left"])
+
+    def test_expired_tracks_leave_the_filter_bank(self):
+        tr = SimpleTracker(max_age_frames=2, motion_model="kalman")
+        tr.update([det(0, 0), det(300, 0), det(600, 0)])
+        for _ in range(3):
+            tr.update([det(600, 0)])
+        self.assertEqual(sorted(tr.kf.row), sorted(tr.tracks))
+        self.assertEqual(len(tr.kf), 1)
+        self.assertAlmostEqual(float(tr.kf.positions(list(tr.tracks))[0, 0]), 620.0, places=3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from backend.models.common import InventoryObjectType
+from backend.models.events import CVZoneChangeEvent
+from backend.models.inventory import FilamentSpool, Zone
+from backend.services.confirmation_manager import ConfirmationManager
+from backend.services.event_reconciler import EventReconciler
+from backend.services.inventory_state_engine import InventoryStateEngine
+from backend.services.sqlite_store import SqliteStateStore
+from backend.services.state_writer import StateWriter
+
+
+class TestSqliteBackend(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "state.db")
+        self.store = SqliteStateStore(self.path)
+        self.engine = InventoryStateEngine(tables=self.store.tables)
+        self.confirm = ConfirmationManager(pending=self.store.tables["pending"])
+        self.recon = EventReconciler(self.engine, self.confirm)
+
+        self.engine.upsert_zone(Zone(zone_id="Rack_A_Slot_1"))
+        self.engine.upsert_zone(Zone(zone_id="Printer_P3_Mount"))
+        self.engine.upsert_spool(FilamentSpool(spool_id="SPOOL-1", zone_id="Rack_A_Slot_1", material="PLA"))
+        self.engine.upsert_spool(FilamentSpool(spool_id="SPOOL-2", zone_id="Rack_A_Slot_1", material="PETG"))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_confirm_commits_and_survives_reopen(self):
+        ev = CVZoneChangeEvent(
+            object_type=InventoryObjectType.filament_spool,
+            from_zone="Rack_A_Slot_1",
+            to_zone="Printer_P3_Mount",
+            hinted_object_id="SPOOL-1",
+        )
+        pending = self.recon.ingest_cv(ev)
+        self.recon.confirm_pending(pending.pending_id, object_id=None, resolved_by="worker")
+
+        reopened = SqliteStateStore(self.path)
+        engine = InventoryStateEngine(tables=reopened.tables)
+        self.assertEqual(engine.spools["SPOOL-1"].zone_id, "Printer_P3_Mount")
+        # resolved items leave the pending table for the (in-memory) archive
+        self.assertNotIn(pending.pending_id, reopened.tables["pending"])
+        self.assertEqual(self.confirm.get(pending.pending_id).status, "confirmed")
+        reopened.close()
+
+    def test_writer_batch_is_one_transaction(self):
+        writer = StateWriter(self.engine, self.store)
+        other = SqliteStateStore(self.path)  # second connection: sees only committed rows
+
+        def command():
+            self.engine.upsert_spool(FilamentSpool(spool_id="SPOOL-3", zone_id="Rack_A_Slot_1"))
+            self.engine.upsert_spool(FilamentSpool(spool_id="SPOOL-4", zone_id="Rack_A_Slot_1"))
+            return self.store.conn.in_transaction, "SPOOL-3" in other.tables["spools"]
+
+        try:
+            in_tx, visible_early = writer.call(command)
+        finally:
+            writer.stop()
+        self.assertEqual((in_tx, visible_early), (True, False))
+        self.assertFalse(self.store.conn.in_transaction)  # committed by persist
+        self.assertIn("SPOOL-4", other.tables["spools"])
+        other.close()
+
+    def test_filtered_queries(self):
+        in_rack = self.engine.find_spools(zone_id="Rack_A_Slot_1")
+        self.assertEqual(sorted(s.spool_id for s in in_rack), ["SPOOL-1", "SPOOL-2"])
+        pla = self.engine.find_spools(zone_id="Rack_A_Slot_1", material="PLA")
+        self.assertEqual([s.spool_id for s in pla], ["SPOOL-1"])
+        self.assertEqual(self.engine.find_spools(zone_id=None), [])
+
+    def test_open_items_reload_into_expiry_heap(self):
+        pc = self.confirm.create_pending(InventoryObjectType.printer, None, "Z", None)
+        pc.expires_at = datetime.utcnow() - timedelta(seconds=1)
+        self.confirm.pending[pc.pending_id] = pc
+
+        reloaded = ConfirmationManager(pending=self.store.tables["pending"])
+        self.assertEqual(reloaded.expire_old(), 1)
+        self.assertEqual(reloaded.get(pc.pending_id).status, "expired")
+
+
+if __name__ == "__main__":
+    unittest.main()
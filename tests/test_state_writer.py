@@ -0,0 +1,77 @@
+import threading
+import unittest
+
+from backend.models.inventory import FilamentSpool
+from backend.services.inventory_state_engine import InventoryStateEngine
+from backend.services.state_writer import StateWriter
+
+
+class RecordingStore:
+    def __init__(self):
+        self.batches = []
+
+    def persist(self, changes, full_state):
+        self.batches.append([c["id"] for c in changes])
+
+
+class FailingOnceStore(RecordingStore):
+    def __init__(self):
+        super().__init__()
+        self.fail_next = True
+
+    def persist(self, changes, full_state):
+        if self.fail_next:
+            self.fail_next = False
+            raise OSError("disk full")
+        super().persist(changes, full_state)
+
+
+class TestStateWriter(unittest.TestCase):
+    def setUp(self):
+        self.engine = InventoryStateEngine()
+        self.store = RecordingStore()
+        self.writer = StateWriter(self.engine, self.store, max_batch=1000)
+
+    def tearDown(self):
+        self.writer.stop()
+
+    def test_concurrent_submitters_are_group_committed(self):
+        def worker(n):
+            for i in range(50):
+                self.writer.call(self.engine.upsert_spool, FilamentSpool(spool_id=f"T{n}-{i}"))
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(self.engine.spools), 400)
+        persisted = [sid for b in self.store.batches for sid in b]
+        self.assertEqual(sorted(persisted), sorted(self.engine.spools))
+        self.assertEqual(self.writer.commands, 400)
+        self.assertEqual(self.writer.batches, len(self.store.batches))
+
+    def test_command_errors_reach_caller_and_stop_flushes(self):
+        with self.assertRaises(KeyError):
+            self.writer.call(lambda: {}["missing"])
+        futs = [self.writer.submit(self.engine.upsert_spool, FilamentSpool(spool_id=f"S{i}")) for i in range(5)]
+        self.writer.stop()
+        self.assertTrue(all(f.done() for f in futs))
+        self.assertEqual(sorted(sid for b in self.store.batches for sid in b), [f"S{i}" for i in range(5)])
+
+    def test_failed_persist_is_retried_with_the_next_batch(self):
+        store = FailingOnceStore()
+        writer = StateWriter(self.engine, store)
+        try:
+            with self.assertRaises(OSError):
+                writer.call(self.engine.upsert_spool, FilamentSpool(spool_id="LOST?"))
+            self.assertIn("LOST?", self.engine.spools)  # memory already has it
+            writer.call(self.engine.upsert_spool, FilamentSpool(spool_id="NEXT"))
+        finally:
+            writer.stop()
+        self.assertEqual(store.batches, [["LOST?", "NEXT"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
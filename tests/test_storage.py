@@ -0,0 +1,99 @@
+import os
+import tempfile
+import time
+import unittest
+
+from backend.models.common import InventoryObjectType
+from backend.models.inventory import FilamentSpool, Zone
+from backend.services.inventory_state_engine import InventoryStateEngine
+from backend.services.storage import WalStateStore
+
+
+class TestWalStateStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "state.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _persist(self, store, engine):
+        store.persist(engine.drain_changes(), engine.snapshot)
+
+    def test_replay_snapshot_plus_log(self):
+        store = WalStateStore(self.path, compact_every=3)
+        engine = InventoryStateEngine()
+        engine.upsert_zone(Zone(zone_id="Z1"))
+        engine.upsert_zone(Zone(zone_id="Z2"))
+        engine.upsert_spool(FilamentSpool(spool_id="S1", zone_id="Z1"))
+        self._persist(store, engine)  # 3 entries -> compacted snapshot
+        self.assertEqual(store.log_entries, 0)
+
+        engine.commit_location_change(InventoryObjectType.filament_spool, "S1", to_zone="Z2")
+        engine.delete_zone("Z1")
+        self._persist(store, engine)
+        self.assertEqual(store.log_entries, 2)
+
+        state = WalStateStore(self.path).load()
+        self.assertEqual(sorted(z["zone_id"] for z in state["zones"]), ["Z2"])
+        self.assertEqual(state["spools"][0]["zone_id"], "Z2")
+
+    def test_torn_tail_is_ignored(self):
+        store = WalStateStore(self.path)
+        engine = InventoryStateEngine()
+        engine.upsert_zone(Zone(zone_id="Z1"))
+        self._persist(store, engine)
+        with open(store.wal_path, "a", encoding="utf-8") as f:
+            f.write('{"op": "upsert", "kind": "zo')
+
+        state = WalStateStore(self.path).load()
+        self.assertEqual([z["zone_id"] for z in state["zones"]], ["Z1"])
+
+    def test_append_after_torn_tail_survives_reload(self):
+        store = WalStateStore(self.path, compact_every=100)
+        engine = InventoryStateEngine()
+        engine.upsert_zone(Zone(zone_id="Z1"))
+        self._persist(store, engine)
+        with open(store.wal_path, "a", encoding="utf-8") as f:
+            f.write('{"op": "upsert", "kind": "zo')
+
+        store = WalStateStore(self.path, compact_every=100)  # restart
+        self.assertEqual([z["zone_id"] for z in store.load()["zones"]], ["Z1"])
+        engine = InventoryStateEngine()
+        engine.upsert_zone(Zone(zone_id="Z2"))
+        self._persist(store, engine)
+        engine.upsert_zone(Zone(zone_id="Z3"))
+        self._persist(store, engine)
+
+        state = WalStateStore(self.path).load()
+        self.assertEqual(sorted(z["zone_id"] for z in state["zones"]), ["Z1", "Z2", "Z3"])
+
+    def test_restart_keeps_updated_at(self):
+        store = WalStateStore(self.path, compact_every=2)
+        engine = InventoryStateEngine()
+        engine.upsert_spool(FilamentSpool(spool_id="S1"))
+        engine.upsert_spool(FilamentSpool(spool_id="S2"))
+        self._persist(store, engine)  # snapshot
+        time.sleep(0.002)
+        engine.upsert_spool(FilamentSpool(spool_id="S3"))
+        self._persist(store, engine)  # log entry
+        saved = {sid: s.updated_at for sid, s in engine.spools.items()}
+
+        restarted = InventoryStateEngine()
+        restarted.load(WalStateStore(self.path).load())
+        self.assertEqual({sid: s.updated_at for sid, s in restarted.spools.items()}, saved)
+        self.assertEqual(restarted.drain_changes(), [])
+        items, _ = restarted.page("spools", ranges={"updated_at": (saved["S3"], None)})
+        self.assertEqual([s.spool_id for s in items], ["S3"])
+
+    def test_change_only_written_once(self):
+        engine = InventoryStateEngine()
+        engine.upsert_spool(FilamentSpool(spool_id="S1"))
+        engine.commit_mount("S1", "P1")
+        ops = engine.drain_changes()
+        self.assertEqual(sorted((o["kind"], o["id"]) for o in ops), [("printer", "P1"), ("spool", "S1")])
+        self.assertEqual(engine.drain_changes(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
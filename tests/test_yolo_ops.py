@@ -0,0 +1,104 @@
+import unittest
+
+import numpy as np
+
+from cv.detectors.exported_detector import ExportedYOLODetector
+from cv.detectors.factory import build_detector, model_path_for
+from cv.detectors.yolo_ops import decode_yolov8, letterbox, nms, parse_names, to_blob
+
+
+def head_output(boxes_xyxy, classes, scores, nc=3, n=50):
+    """Fake YOLOv8 head output (1, 4 + nc, n) with the given boxes in letterboxed pixels."""
+    out = np.zeros((1, 4 + nc, n), dtype=np.float32)
+    for i, ((x1, y1, x2, y2), c, s) in enumerate(zip(boxes_xyxy, classes, scores)):
+        out[0, :4, i] = [(x1 + x2) / 2, (y1 + y2) / 2, x2 - x1, y2 - y1]
+        out[0, 4 + c, i] = s
+    return out
+
+
+class TestYoloOps(unittest.TestCase):
+    def test_letterbox_and_blob(self):
+        frame = np.full((720, 1280, 3), (10, 20, 30), dtype=np.uint8)
+        img, r, (px, py) = letterbox(frame, 640)
+        self.assertEqual(img.shape, (640, 640, 3))
+        self.assertAlmostEqual(r, 0.5)
+        self.assertEqual((px, py), (0, 140))
+        self.assertEqual(img[0, 0].tolist(), [114, 114, 114])
+        self.assertEqual(img[320, 320].tolist(), [10, 20, 30])
+
+        blob, meta = to_blob([frame, frame[:100, :200]], 320)
+        self.assertEqual(blob.shape, (2, 3, 320, 320))
+        self.assertEqual(blob.dtype, np.float32)
+        self.assertAlmostEqual(float(blob[0, 0, 160, 160]), 30 / 255, places=5)  # RGB order
+        self.assertEqual(meta[1][0], 1.6)
+
+    def test_nms_is_class_aware(self):
+        boxes = np.array([[0, 0, 10, 10], [1, 1, 11, 11], [0, 0, 10, 10], [50, 50, 60, 60]], dtype=np.float32)
+        scores = np.array([0.9, 0.8, 0.7, 0.6])
+        self.assertEqual(nms(boxes, scores, 0.5).tolist(), [0, 3])
+        self.assertEqual(nms(boxes, scores, 0.5, classes=[0, 0, 1, 0]).tolist(), [0, 2, 3])
+        self.assertEqual(nms(boxes, scores, 0.5, max_det=1).tolist(), [0])
+        self.assertEqual(nms(np.zeros((0, 4)), np.zeros(0)).tolist(), [])
+
+    def test_decode_maps_back_to_frame_pixels(self):
+        frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+        _, meta = to_blob([frame], 640)
+        # letterboxed: scale 0.5, pad_y 140
+        out = head_output([[50, 190, 100, 240], [52, 192, 102, 242], [300, 300, 400, 400], [0, 0, 5, 5]],
+                          classes=[1, 1, 2, 0], scores=[0.9, 0.8, 0.7, 0.1])
+        dets = decode_yolov8(out, meta, [(720, 1280)], {0: "a", 1: "book", 2: "cell phone"}, conf=0.25, iou=0.45)
+        dets = dets[0].to_dicts()
+        self.assertEqual(dets, [
+            {"label": "book", "conf": dets[0]["conf"], "bbox": [100, 100, 200, 200]},
+            {"label": "cell phone", "conf": dets[1]["conf"], "bbox": [600, 320, 800, 520]},
+        ])
+        self.assertAlmostEqual(dets[0]["conf"], 0.9, places=5)
+
+    def test_parse_names(self):
+        self.assertEqual(parse_names("{0: 'book', 1: 'cell phone'}"), {0: "book", 1: "cell phone"})
+        self.assertEqual(parse_names(["a", "b"]), {0: "a", 1: "b"})
+        self.assertEqual(parse_names(None), {})
+
+
+class FakeStaticBatchDetector(ExportedYOLODetector):
+    def __init__(self):
+        super().__init__(conf=0.25, iou=0.45, imgsz=320, names={0: "book"})
+        self.fixed_batch = 2
+        self.blob_shapes = []
+
+    def _forward(self, blob):
+        self.blob_shapes.append(blob.shape)
+        out = head_output([[10, 10, 50, 50]], [0], [0.9], nc=1)
+        return np.repeat(out, len(blob), axis=0)
+
+
+class TestExportedDetector(unittest.TestCase):
+    def test_static_batch_is_padded_and_trimmed(self):
+        det = FakeStaticBatchDetector()
+        frames = [np.zeros((320, 320, 3), dtype=np.uint8)] * 3
+        out = det.detect_batch(frames)
+        self.assertEqual(len(out), 3)
+        self.assertEqual(det.blob_shapes, [(2, 3, 320, 320), (2, 3, 320, 320)])
+        self.assertEqual([(d["label"], d["bbox"]) for d in out[2].to_dicts()], [("book", [10, 10, 50, 50])])
+        self.assertEqual(det.detect(frames[0]).to_dicts(), out[0].to_dicts())
+
+    def test_backend_without_forward_fails_at_construction(self):
+        class Incomplete(ExportedYOLODetector):
+            pass
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_factory_model_paths_and_unknown_backend(self):
+        cfg = {"model": "m.pt", "onnxruntime_model": "m.onnx", "onnxruntime_int8_model": "m_int8.onnx",
+               "conf": 0.2, "iou": 0.45, "device": "cpu"}
+        self.assertEqual(model_path_for(cfg, "torch"), "m.pt")
+        self.assertEqual(model_path_for(cfg, "onnxruntime"), "m.onnx")
+        self.assertEqual(model_path_for({**cfg, "int8": True}, "onnxruntime"), "m_int8.onnx")
+        self.assertEqual(model_path_for({**cfg, "int8": True}, "openvino"), "m.pt")
+        with self.assertRaises(ValueError):
+            build_detector(cfg, backend="tensorrt")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+
+import cv2
+
+from cv.detectors.detections import Detections
+from cv.detectors.stub_detector import SyntheticScene
+from cv.detectors.zone_crop import ZoneCropDetector, crop_regions
+from cv.tracking.zone_mapper import ZoneMap, assign_to_zones
+
+ZONES = [
+    {"zone_id": "A", "shape": "rect", "x1": 100, "y1": 100, "x2": 400, "y2": 300},
+    {"zone_id": "B", "shape": "polygon", "points": [[800, 400], [1100, 420], [1000, 650]]},
+]
+
+
+class BlobDetector:
+    """Finds the scene's filled boxes in whatever image it is given."""
+
+    def __init__(self):
+        self.shapes = []
+
+    def detect_batch(self, frames):
+        self.shapes.append([f.shape[:2] for f in frames])
+        out = []
+        for frame in frames:
+            mask = cv2.inRange(frame, (30, 150, 210), (50, 170, 230))
+            n, _, stats, _ = cv2.connectedComponentsWithStats(mask)
+            out.append([{"label": "book", "conf": 0.9, "bbox": [int(x), int(y), int(x + w), int(y + h)]}
+                        for x, y, w, h, _ in stats[1:n]])
+        return out
+
+
+def in_zone(dets, zone_map):
+    dets = Detections.coerce(dets)
+    return sorted((d["zone_id"], tuple(d["bbox"])) for d in assign_to_zones(dets, ZONES, zone_map).to_dicts() if d["zone_id"])
+
+
+class TestZoneCrop(unittest.TestCase):
+    def test_regions_pad_merge_and_fall_back_to_full_frame(self):
+        self.assertEqual(crop_regions(ZONES, (1280, 720), pad_px=64),
+                         [(36, 36, 464, 364), (736, 336, 1164, 714)])
+        self.assertEqual(crop_regions(ZONES, (1280, 720), pad_px=150, max_coverage=1.0),
+                         [(0, 0, 550, 450), (650, 250, 1250, 720)])
+        # padding makes the two zones overlap -> one merged crop...
+        self.assertEqual(crop_regions(ZONES, (1280, 720), pad_px=250, max_coverage=1.0), [(0, 0, 1280, 720)])
+        # ...and crops covering most of the frame are not worth it
+        self.assertEqual(crop_regions(ZONES, (1280, 720), pad_px=200, max_coverage=0.5), [(0, 0, 1280, 720)])
+        self.assertEqual(crop_regions([], (640, 480)), [(0, 0, 640, 480)])
+
+    def test_cropped_detection_matches_full_frame_inside_zones(self):
+        scene = SyntheticScene(frame_size=(1280, 720), n_objects=40, speed_px=(10, 30), seed=4)
+        zone_map = ZoneMap(ZONES, (1280, 720))
+        full = BlobDetector()
+        inner = BlobDetector()
+        cropped = ZoneCropDetector(inner, ZONES, pad_px=64)
+
+        seen = 0
+        for _ in range(30):
+            scene.advance()
+            frame = scene.render()
+            expected = in_zone(full.detect_batch([frame])[0], zone_map)
+            self.assertEqual(in_zone(cropped.detect(frame), zone_map), expected)
+            seen += len(expected)
+        self.assertGreater(seen, 0)
+        # both crops went through one batch call
+        self.assertEqual(inner.shapes[-1], [(328, 428), (378, 428)])
+
+    def test_set_zones_recomputes_regions(self):
+        cropped = ZoneCropDetector(BlobDetector(), ZONES, pad_px=0)
+        frame = SyntheticScene(frame_size=(1280, 720), n_objects=1).render()
+        self.assertEqual(len(cropped.regions_for(frame)), 2)
+        cropped.set_zones(ZONES[:1])
+        self.assertEqual(cropped.regions_for(frame), [(100, 100, 400, 300)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from backend.models.common import InventoryObjectType
+from backend.models.inventory import FilamentSpool, Printer, Zone
+from backend.services.inventory_state_engine import InventoryStateEngine
+
+
+class TestZoneIndex(unittest.TestCase):
+    def setUp(self):
+        self.engine = InventoryStateEngine()
+        for zid in ["Rack_A_Slot_1", "Rack_A_Slot_2", "Printer_P3_Mount"]:
+            self.engine.upsert_zone(Zone(zone_id=zid))
+        self.engine.upsert_spool(FilamentSpool(spool_id="S1", zone_id="Rack_A_Slot_1"))
+        self.engine.upsert_spool(FilamentSpool(spool_id="S2", zone_id="Rack_A_Slot_1"))
+        self.engine.upsert_printer(Printer(printer_id="P3", zone_id="Printer_P3_Mount"))
+
+    def _ids(self, zone_id):
+        c = self.engine.zone_contents(zone_id)
+        return sorted(s.spool_id for s in c["spools"]), sorted(p.printer_id for p in c["printers"])
+
+    def test_index_follows_commits_and_deletes(self):
+        self.assertEqual(self._ids("Rack_A_Slot_1"), (["S1", "S2"], []))
+
+        self.engine.commit_location_change(InventoryObjectType.filament_spool, "S1", to_zone="Rack_A_Slot_2")
+        self.engine.commit_mount("S2", "P3", zone_id="Printer_P3_Mount")
+        self.engine.delete_printer("P3")
+        self.engine.upsert_spool(FilamentSpool(spool_id="S3", zone_id="Rack_A_Slot_2"))
+
+        self.assertEqual(self._ids("Rack_A_Slot_1"), ([], []))
+        self.assertEqual(self._ids("Rack_A_Slot_2"), (["S1", "S3"], []))
+        self.assertEqual(self._ids("Printer_P3_Mount"), (["S2"], []))
+
+    def test_occupancy_counts(self):
+        self.engine.commit_location_change(InventoryObjectType.printer, "P9", to_zone="Unregistered_Zone")
+        occ = self.engine.occupancy()
+        self.assertEqual(occ["Rack_A_Slot_1"], {"filament_spool": 2, "printer": 0, "total": 2})
+        self.assertEqual(occ["Rack_A_Slot_2"]["total"], 0)
+        self.assertEqual(occ["Printer_P3_Mount"]["printer"], 1)
+        self.assertEqual(occ["Unregistered_Zone"]["printer"], 1)
+        self.assertNotIn(None, occ)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+from cv.tracking.zone_mapper import ZoneMap, assign_to_zones
+
+ZONES = [
+    {"zone_id": "Zone_Left", "shape": "rect", "x1": 40, "y1": 80, "x2": 620, "y2": 680},
+    {"zone_id": "Zone_Right", "shape": "rect", "x1": 660, "y1": 80, "x2": 1240, "y2": 680},
+    {"zone_id": "Slot_Tri", "shape": "polygon", "points": [[700, 100], [900, 100], [800, 300]], "priority": 5},
+]
+
+
+def det(cx, cy):
+    return {"label": "book", "conf": 0.9, "bbox": [cx - 10, cy - 10, cx + 10, cy + 10]}
+
+
+class TestZoneMap(unittest.TestCase):
+    def setUp(self):
+        self.zm = ZoneMap(ZONES, (1280, 720), max_side=640)
+
+    def test_lookup_rect_polygon_and_outside(self):
+        zids = self.zm.lookup([[300, 300], [1000, 500], [800, 150], [640, 50], [5000, 5000]])
+        self.assertEqual(zids, ["Zone_Left", "Zone_Right", "Slot_Tri", None, None])
+
+    def test_matches_loop_fallback(self):
+        dets = [det(x, y) for x in range(0, 1280, 37) for y in range(0, 720, 41)]
+        fast = [d["zone_id"] for d in assign_to_zones(dets, ZONES, zone_map=ZoneMap(ZONES, (1280, 720), max_side=1280))]
+        slow = [d["zone_id"] for d in assign_to_zones(dets, ZONES)]
+        self.assertEqual(fast, slow)
+
+    def test_priority_resolves_overlap(self):
+        zones = [
+            {"zone_id": "Big", "shape": "rect", "x1": 0, "y1": 0, "x2": 100, "y2": 100},
+            {"zone_id": "Small", "shape": "rect", "x1": 40, "y1": 40, "x2": 60, "y2": 60, "priority": 1},
+        ]
+        zm = ZoneMap(zones, (200, 200))
+        self.assertEqual(zm.lookup([[50, 50], [10, 10]]), ["Small", "Big"])
+        # without priority, the first zone in the file wins (previous behaviour)
+        zones[1].pop("priority")
+        self.assertEqual(ZoneMap(zones, (200, 200)).lookup([[50, 50]]), ["Big"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,51 @@
+import argparse
+import os
+
 from ultralytics import YOLO
 
+def quantize_onnx(onnx_path):
+    """Dynamic (weight-only) INT8 quantization of an exported ONNX model -> <name>_int8.onnx."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic  # lazy import
+
+    out = os.path.splitext(onnx_path)[0] + "_int8.onnx"
+    quantize_dynamic(onnx_path, out, weight_type=QuantType.QUInt8)
+    return out
+
 def main(
     weights="runs/inventory/yolov8s_filament_printer_v1/weights/best.pt",
-    fmt="torchscript"
+    fmt="torchscript",
+    imgsz=640,
+    int8=False,
+    dynamic=False,
+    data=None,
 ):
+    """
+    fmt: torchscript, onnx, openvino, etc.
+    int8: openvino -> post-training quantization by ultralytics (calibrated on `data`);
+          onnx     -> dynamic weight quantization with onnxruntime (no data needed).
+    dynamic: onnx with a dynamic batch dim, so detect_batch runs one session call per batch.
+    """
     model = YOLO(weights)
-    model.export(format=fmt)  # torchscript, onnx, openvino, etc.
+    kwargs = {"format": fmt, "imgsz": imgsz}
+    if fmt == "onnx":
+        kwargs["dynamic"] = dynamic
+    if fmt == "openvino" and int8:
+        kwargs["int8"] = True
+        if data:
+            kwargs["data"] = data
+    path = model.export(**kwargs)
+    print("exported:", path)
+
+    if fmt == "onnx" and int8:
+        print("quantized:", quantize_onnx(path))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    ap = argparse.ArgumentParser(description="Export YOLO weights for the CV backends (see yolo.backend in cv.yaml)")
+    ap.add_argument("--weights", default="runs/inventory/yolov8s_filament_printer_v1/weights/best.pt")
+    ap.add_argument("--format", default="torchscript", help="torchscript, onnx, openvino, ...")
+    ap.add_argument("--imgsz", type=int, default=640)
+    ap.add_argument("--int8", action="store_true")
+    ap.add_argument("--dynamic", action="store_true")
+    ap.add_argument("--data", default=None, help="dataset yaml for INT8 calibration (openvino)")
+    a = ap.parse_args()
+    main(a.weights, a.format, imgsz=a.imgsz, int8=a.int8, dynamic=a.dynamic, data=a.data)